@@ -1,37 +1,333 @@
+import asyncio
 import openai
 from bs4 import BeautifulSoup
 import json
-from typing import Any, Dict, List
+import re
+import lxml.html
+from lxml import etree
+from typing import Any, Dict, List, Optional, Union
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from answer_cache import AnswerCache
+from tokens import count_tokens
+
+INTERACTIVE_TAGS = ['input', 'button', 'select', 'textarea', 'a']
+# Placeholder option LinkedIn shows in selects that have no value yet.
+EMPTY_SELECT_VALUES = ("", "Select an option")
+
+# Tags every interactive element in the live DOM with an `agent-id` and
+# copies each field's current value into an attribute, since outerHTML only
+# reflects the value a field was rendered with. Returns the element's
+# outerHTML. Ids are kept while an element lives, and new elements get an
+# id derived from their tag and identifying attributes (plus an ordinal
+# among identical ones), so a field LinkedIn re-renders after an action
+# comes back with the same id and observations can be diffed by id.
+TAG_INTERACTIVE_ELEMENTS_JS = """
+var root = arguments[0];
+var used = {};
+document.querySelectorAll('[agent-id]').forEach(function (el) { used[el.getAttribute('agent-id')] = true; });
+function hash(text) {
+    var h = 5381;
+    for (var i = 0; i < text.length; i++) { h = ((h << 5) + h + text.charCodeAt(i)) | 0; }
+    return (h >>> 0).toString(36);
+}
+root.querySelectorAll('input, button, select, textarea, a').forEach(function (el) {
+    if (!el.hasAttribute('agent-id')) {
+        var text = (el.tagName === 'BUTTON' || el.tagName === 'A') ? el.textContent.trim() : '';
+        var base = 'agent-' + hash([el.tagName, el.type || '', el.name || '', el.id || '', el.getAttribute('aria-label') || '', text].join('|'));
+        var id = base;
+        for (var n = 2; used[id]; n++) { id = base + '-' + n; }
+        used[id] = true;
+        el.setAttribute('agent-id', id);
+    }
+    if (el.tagName !== 'BUTTON' && el.tagName !== 'A') { el.setAttribute('data-agent-value', el.value || ''); }
+    if (el.type === 'checkbox' || el.type === 'radio') { el.setAttribute('data-agent-checked', el.checked ? 'true' : 'false'); }
+});
+return root.outerHTML;
+"""
+
+def snapshot_element_html(driver: WebDriver, element: Any) -> str:
+    """
+    Returns the outerHTML of a live element after tagging its interactive
+    descendants, so that agent-ids found in the HTML can be looked up with
+    `[agent-id='...']` in the browser.
+    """
+    return driver.execute_script(TAG_INTERACTIVE_ELEMENTS_JS, element)
+
+# Subtrees that never matter to the agent. They are removed by lxml in C
+# before the Python pass over the remaining elements.
+DROPPED_TAGS = ('script', 'style', 'meta', 'link', 'header', 'footer', 'nav', 'noscript', 'template', 'svg', 'iframe', 'canvas')
+FORM_CONTROL_TAGS = ('input', 'select', 'textarea')
+# Kept even when they hold no text: they are what the agent acts on or
+# what field labels are read from.
+STRUCTURAL_TAGS = frozenset(INTERACTIVE_TAGS + ['form', 'label', 'fieldset', 'legend', 'option', 'optgroup', 'html', 'body'])
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+# Layout wrappers that can be unwrapped when they hold a single element and
+# carry nothing but presentation attributes.
+WRAPPER_TAGS = frozenset(['div', 'span'])
+PRESENTATION_ATTRIBUTES = frozenset(['class', 'style', 'dir'])
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+
+def _is_invisible(element: Any) -> bool:
+    if element.get('hidden') is not None or element.get('aria-hidden') == 'true':
+        return True
+    style = element.get('style')
+    return bool(style) and _HIDDEN_STYLE.search(style) is not None
+
+def _remove_keeping_tail(element: Any) -> None:
+    """Removes an lxml element without losing the text that follows it."""
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail and element.tail.strip():
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+    parent.remove(element)
+
+def clean_html(html_content: str, for_application: bool = False) -> str:
+    """
+    Strips a page down to what the agent needs, working directly on lxml.
+    Dropped tags and comments go first (in C). One pass over the remaining
+    elements then drops whitespace-only text, finds invisible subtrees
+    (hidden, aria-hidden or inline display:none/visibility:hidden) and, for
+    application forms, assigns agent-ids. Invisible subtrees are removed,
+    except ones holding a form control, since LinkedIn hides styled file
+    inputs. So are subtrees with neither text nor anything interactive
+    (icons, spacers, empty wrappers), and div/span wrappers around a single
+    element are unwrapped. Returns the cleaned HTML.
+    """
+    if not html_content or not html_content.strip():
+        return ""
+    try:
+        try:
+            root = lxml.html.fromstring(html_content)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration.
+            root = lxml.html.fromstring(html_content.encode('utf-8'))
+    except etree.ParserError:
+        # Nothing but comments or whitespace.
+        return ""
+    etree.strip_elements(root, *DROPPED_TAGS, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+
+    used_ids = set(root.xpath('//@agent-id')) if for_application else set()
+    next_id = 0
+    elements = []
+    invisible = []
+    for element in root.iter(etree.Element):
+        elements.append(element)
+        if element.text is not None and not element.text.strip() and element.tag not in PRESERVE_WHITESPACE_TAGS:
+            element.text = None
+        if element.tail is not None and not element.tail.strip():
+            element.tail = None
+        if _is_invisible(element) and element.tag not in FORM_CONTROL_TAGS:
+            if not any(True for _ in element.iterdescendants(*FORM_CONTROL_TAGS)):
+                invisible.append(element)
+                continue
+        if for_application and element.tag in INTERACTIVE_TAGS and element.get('agent-id') is None:
+            while f"agent-{next_id}" in used_ids:
+                next_id += 1
+            element.set('agent-id', f"agent-{next_id}")
+            next_id += 1
+
+    for element in invisible:
+        _remove_keeping_tail(element)
+
+    # fromstring() hangs the returned root under a <body> that is not
+    # serialized, so the root itself is never removed or unwrapped.
+    elements.remove(root)
+
+    # Children come before their parents in reverse document order, so one
+    # sweep tells which elements have text or interactive content below them.
+    useful = set()
+    for element in reversed(elements):
+        if element.tag in STRUCTURAL_TAGS or element.text or element.tail or element in useful:
+            parent = element.getparent()
+            if parent is not None:
+                useful.add(parent)
+            useful.add(element)
+    for element in elements:
+        parent = element.getparent()
+        if element not in useful and parent is not None and parent in useful:
+            _remove_keeping_tail(element)
+
+    # Inner wrappers are unwrapped first, so nested ones collapse in one sweep.
+    for element in reversed(elements):
+        parent = element.getparent()
+        if (parent is None or element.tag not in WRAPPER_TAGS or element.text or len(element) != 1
+                or element[0].tail or not PRESENTATION_ATTRIBUTES.issuperset(element.attrib)):
+            continue
+        child = element[0]
+        child.tail = element.tail
+        parent.replace(element, child)
+    return lxml.html.tostring(root, encoding='unicode')
+
 def simplify_html(html_content: str, for_application: bool = False) -> BeautifulSoup:
     """
     Cleans up HTML and adds agent-ids to interactive elements.
+    Elements that were already tagged in the browser keep their agent-id.
+    The heavy lifting happens in `clean_html`; only the much smaller result
+    is parsed into BeautifulSoup.
     """
-    soup = BeautifulSoup(html_content, 'lxml')
-    for tag in soup.find_all(['script', 'style', 'meta', 'link', 'header', 'footer', 'nav']):
-        tag.decompose()
-    if for_application:
-        interactive_tags = soup.find_all(['input', 'button', 'select', 'textarea', 'a'])
-        for i, tag in enumerate(interactive_tags):
-            tag['agent-id'] = f"agent-{i}"
-    return soup
+    return BeautifulSoup(clean_html(html_content, for_application), 'lxml')
 
-def get_ai_action_for_scrolling(
-    client: Any,
-    simplified_html: BeautifulSoup,
-    previous_actions: List[str],
-    job_count: int
-) -> str:
+def _clean_text(text: str) -> str:
+    return " ".join(text.split())
+
+def field_label(tag: Any, soup: BeautifulSoup) -> str:
     """
-    Asks the AI what to do next to find more jobs on a search results page.
+    Finds the human-readable label of a form element: aria-label,
+    aria-labelledby, a <label for=...>, or an enclosing <label>/<legend>.
     """
-    print("🤖 AI is thinking about how to scroll...")
-    prompt = (
+    if tag.get('aria-label'):
+        return _clean_text(tag['aria-label'])
+    if tag.get('aria-labelledby'):
+        parts = [soup.find(id=label_id) for label_id in tag['aria-labelledby'].split()]
+        text = " ".join(p.get_text(" ", strip=True) for p in parts if p)
+        if text:
+            return _clean_text(text)
+    if tag.get('id'):
+        label = soup.find('label', attrs={'for': tag['id']})
+        if label:
+            return _clean_text(label.get_text(" ", strip=True))
+    for ancestor in tag.parents:
+        if ancestor.name == 'label':
+            return _clean_text(ancestor.get_text(" ", strip=True))
+        if ancestor.name == 'fieldset':
+            legend = ancestor.find('legend')
+            if legend:
+                return _clean_text(legend.get_text(" ", strip=True))
+            break
+    if tag.name in ('button', 'a'):
+        return _clean_text(tag.get_text(" ", strip=True))
+    return _clean_text(tag.get('placeholder', '') or tag.get('name', ''))
+
+def _group_question(tag: Any) -> str:
+    """The question a radio button or checkbox answers: its fieldset legend."""
+    fieldset = tag.find_parent('fieldset')
+    legend = fieldset.find('legend') if fieldset else None
+    return _clean_text(legend.get_text(" ", strip=True)) if legend else ""
+
+def describe_element(tag: Any, soup: BeautifulSoup) -> Dict[str, Any]:
+    """
+    Summarises an interactive element from the simplified DOM: its agent-id,
+    tag, type, label, current value, options and whether it is required.
+    Radio buttons and checkboxes also carry the question their group answers.
+    """
+    field_type = tag.get('type', '').lower() if tag.name == 'input' else ''
+    options = []
+    value = tag.get('data-agent-value', tag.get('value', '') if tag.name != 'button' else '')
+    if tag.name == 'select':
+        for option in tag.find_all('option'):
+            text = _clean_text(option.get_text(" ", strip=True))
+            options.append(text)
+            if option.get('value', text) == value or (not tag.has_attr('data-agent-value') and option.has_attr('selected')):
+                value = text
+        if value in EMPTY_SELECT_VALUES:
+            value = ""
+    elif tag.name == 'textarea' and not tag.has_attr('data-agent-value'):
+        value = tag.get_text()
+    return {
+        "agent_id": tag.get('agent-id'),
+        "tag": tag.name,
+        "type": field_type,
+        "name": tag.get('name', ''),
+        "label": field_label(tag, soup),
+        "question": _group_question(tag) if field_type in ('radio', 'checkbox') else "",
+        "value": value or "",
+        "checked": tag.get('data-agent-checked') == 'true' or (not tag.has_attr('data-agent-checked') and tag.has_attr('checked')),
+        "required": tag.has_attr('required') or tag.get('aria-required') == 'true',
+        "options": options,
+        "accept": tag.get('accept', ''),
+    }
+
+# Default size of the form description sent to the LLM. Override with
+# `application_agent.form_token_budget` in profile.yml.
+FORM_TOKEN_BUDGET = 1500
+# Ever more compact renderings, tried in order until the form fits the
+# budget: (options shown per select, characters per label or value).
+_FORM_DETAIL_LEVELS = ((None, None), (20, 200), (8, 120), (3, 60))
+
+def _shorten(text: str, limit: Optional[int]) -> str:
+    if limit is None or len(text) <= limit:
+        return text
+    return text[:limit - 3].rstrip() + "..."
+
+def _form_line(field: Dict[str, Any], max_options: Optional[int], max_text: Optional[int]) -> str:
+    kind = f"{field['tag']}[{field['type']}]" if field['type'] else field['tag']
+    parts = [field['agent_id'], kind, json.dumps(_shorten(field['label'], max_text), ensure_ascii=False)]
+    if field['question'] and field['question'] != field['label']:
+        parts.append("question=" + json.dumps(_shorten(field['question'], max_text), ensure_ascii=False))
+    if field['tag'] in FORM_CONTROL_TAGS and field['type'] not in ('radio', 'checkbox', 'file'):
+        parts.append("value=" + json.dumps(_shorten(field['value'], max_text), ensure_ascii=False))
+    if field['type'] in ('radio', 'checkbox'):
+        parts.append("checked" if field['checked'] else "unchecked")
+    if field['accept']:
+        parts.append(f"accept={field['accept']}")
+    options = [o for o in field['options'] if o not in EMPTY_SELECT_VALUES]
+    if options:
+        shown = options if max_options is None else options[:max_options]
+        listed = json.dumps([_shorten(o, max_text) for o in shown], ensure_ascii=False)
+        if len(shown) < len(options):
+            listed += f" (+{len(options) - len(shown)} more)"
+        parts.append(f"options={listed}")
+    if field['required']:
+        parts.append("required")
+    return " ".join(parts)
+
+def form_fields(simplified_html: BeautifulSoup) -> List[Dict[str, Any]]:
+    """`describe_element` for every tagged interactive element except hidden inputs."""
+    return [
+        describe_element(tag, simplified_html)
+        for tag in simplified_html.find_all(INTERACTIVE_TAGS)
+        if tag.get('agent-id') and not (tag.name == 'input' and tag.get('type', '').lower() == 'hidden')
+    ]
+
+def form_header(simplified_html: BeautifulSoup) -> List[str]:
+    """The step heading and any error messages shown on the form."""
+    heading = simplified_html.find(['h1', 'h2', 'h3'])
+    header = [f"Step: {_clean_text(heading.get_text(' ', strip=True))}"] if heading else []
+    for alert in simplified_html.find_all(attrs={'role': 'alert'}):
+        text = _clean_text(alert.get_text(" ", strip=True))
+        if text:
+            header.append(f"Error: {text}")
+    return header
+
+def pack_form(header: List[str], fields: List[Dict[str, Any]], token_budget: int = FORM_TOKEN_BUDGET) -> str:
+    """
+    Renders `header` and one line per field, as compactly as needed to fit
+    `token_budget`: option lists and long labels are shortened first and
+    links dropped after that. Form controls and buttons are always listed.
+    """
+    text = ""
+    for drop_links in (False, True):
+        kept = [f for f in fields if not (drop_links and f['tag'] == 'a')]
+        for max_options, max_text in _FORM_DETAIL_LEVELS:
+            text = "\n".join(header + [_form_line(f, max_options, max_text) for f in kept])
+            if count_tokens(text) <= token_budget:
+                return text
+    # Over budget even at its most compact: still send every control, since
+    # a form the agent cannot see all of costs more cycles than a long prompt.
+    return text
+
+def serialize_form(simplified_html: BeautifulSoup, token_budget: int = FORM_TOKEN_BUDGET) -> str:
+    """
+    Describes a form step compactly for the LLM: its heading, any error
+    messages, then one line per interactive element with its agent-id,
+    tag and type, label, current value, options and whether it is required,
+    packed into `token_budget` tokens by `pack_form`.
+    """
+    return pack_form(form_header(simplified_html), form_fields(simplified_html), token_budget)
+
+def _scrolling_prompt(simplified_html: BeautifulSoup, previous_actions: List[str], job_count: int) -> str:
+    page_text = simplified_html.get_text(separator='\n', strip=True)[:4000]
+    return (
         "You are an expert web scraping agent. Your goal is to scroll a LinkedIn job search page to reveal all possible job listings.\n"
         "The current simplified text view of the page is:\n"
         "--- PAGE STATE (first 4000 chars) ---\n"
-        f"{simplified_html.get_text(separator='\\n', strip=True)[:4000]}\n"
+        f"{page_text}\n"
         f"So far, you have found {job_count} jobs.\n"
         f"The previous actions you have taken are: {', '.join(previous_actions) if previous_actions else 'None'}.\n"
         "Based on this, what is the best action to take next to find more jobs?\n"
@@ -42,9 +338,36 @@ def get_ai_action_for_scrolling(
         "Analyze the page state. If you see a \"See more jobs\" or \"Load more\" button, choose CLICK. Otherwise, SCROLL_WINDOW is the default safe action.\n"
         "Your response must be ONLY ONE of the actions listed above. For example: `SCROLL_WINDOW` or `CLICK button.jobs-search-results__load-more-button`."
     )
+
+def get_ai_action_for_scrolling(
+    client: Any,
+    simplified_html: BeautifulSoup,
+    previous_actions: List[str],
+    job_count: int
+) -> str:
+    """
+    Asks the AI what to do next to find more jobs on a search results page.
+    """
+    print("🤖 AI is thinking about how to scroll...")
     response = client.chat.completions.create(
         model="gpt-4-turbo-preview",
-        messages=[{"role": "user", "content": prompt}]
+        messages=[{"role": "user", "content": _scrolling_prompt(simplified_html, previous_actions, job_count)}]
+    )
+    action = response.choices[0].message.content.strip()
+    print(f"🤖 AI chose scroll action: {action}")
+    return action
+
+async def get_ai_action_for_scrolling_async(
+    client: Any,
+    simplified_html: BeautifulSoup,
+    previous_actions: List[str],
+    job_count: int
+) -> str:
+    """get_ai_action_for_scrolling with an async client."""
+    print("🤖 AI is thinking about how to scroll...")
+    response = await client.chat.completions.create(
+        model="gpt-4-turbo-preview",
+        messages=[{"role": "user", "content": _scrolling_prompt(simplified_html, previous_actions, job_count)}]
     )
     action = response.choices[0].message.content.strip()
     print(f"🤖 AI chose scroll action: {action}")
@@ -74,24 +397,47 @@ def get_initial_page_action(client: Any, simplified_html: BeautifulSoup) -> str:
     print("  -> Step 1 Result: Could not isolate agent-id")
     return "FAIL Could not isolate agent-id"
 
-def get_ai_action_for_application(
-    client: Any,
-    simplified_html: BeautifulSoup,
-    application_data: Dict[str, Any]
-) -> str:
+FORM_COMMANDS = ("TYPE", "SELECT", "CLICK", "UPLOAD", "ANSWER", "SUBMIT", "DONE", "FAIL")
+
+def parse_action_plan(text: str) -> List[str]:
     """
-    Asks the AI to decide the next step in filling out an application form.
+    Extracts agent commands from an LLM reply, one per line. Numbering,
+    bullets and backticks around the commands are tolerated.
     """
-    print("🤖 AI is thinking about how to fill this form...")
-    prompt = (
+    actions = []
+    for line in text.splitlines():
+        line = line.strip().strip('`').strip()
+        line = line.lstrip('-*0123456789.) ').strip('`').strip()
+        if line.split(' ', 1)[0].upper() in FORM_COMMANDS:
+            actions.append(line)
+    return actions
+
+def _application_prompt(
+    simplified_html: BeautifulSoup,
+    application_data: Dict[str, Any],
+    plan_mode: bool,
+    token_budget: int,
+    form_text: Optional[str]
+) -> str:
+    if plan_mode:
+        instructions = (
+            "Based on the form and your personal data, list every action needed to complete the current step of the form, in order: "
+            "fill each empty field, then click the button that moves to the next step (or SUBMIT on the final step).\n"
+        )
+        response_format = "Your response must be one action per line, each in the format `COMMAND agent-id value`. Do not number the lines or explain."
+    else:
+        instructions = "Based on the form and your personal data, what is the single next action you should take?\n"
+        response_format = "Your response must be a single line in the format `COMMAND agent-id value`. Do not explain."
+    return (
         "You are an expert robotic process automation (RPA) agent. Your goal is to fill out and submit this job application form.\n"
         "Here is your personal data for the application:\n"
         "--- PERSONAL DATA ---\n"
         f"{json.dumps(application_data, indent=2)}\n"
-        "Here is the current state of the application form's HTML. Interactive elements have a unique `agent-id` attribute.\n"
-        "--- FORM HTML (first 6000 chars) ---\n"
-        f"{simplified_html.prettify()[:6000]}\n"
-        "Based on the HTML and your personal data, what is the single next action you should take?\n"
+        "Here is the current state of the application form, one interactive element per line: "
+        "agent-id, tag[type], label, then its value, options and whether it is required.\n"
+        "--- FORM ---\n"
+        f"{form_text if form_text is not None else serialize_form(simplified_html, token_budget)}\n"
+        f"{instructions}"
         "Your available actions are:\n"
         "1.  `TYPE <agent-id> <text_to_type>`\n"
         "2.  `SELECT <agent-id> <option_text>`\n"
@@ -101,26 +447,58 @@ def get_ai_action_for_application(
         "6.  `SUBMIT <agent-id>`\n"
         "7.  `DONE`\n"
         "8.  `FAIL <reason>`\n"
-        "Your response must be a single line in the format `COMMAND agent-id value`. Do not explain."
+        f"{response_format}"
     )
+
+def _application_actions(response: Any, plan_mode: bool) -> Union[str, List[str]]:
+    content = response.choices[0].message.content.strip()
+    if plan_mode:
+        actions = parse_action_plan(content)
+        print(f"🤖 AI planned {len(actions)} form action(s): {actions}")
+        return actions
+    print(f"🤖 AI chose form action: {content}")
+    return content
+
+def get_ai_action_for_application(
+    client: Any,
+    simplified_html: BeautifulSoup,
+    application_data: Dict[str, Any],
+    plan_mode: bool = False,
+    token_budget: int = FORM_TOKEN_BUDGET,
+    form_text: Optional[str] = None
+) -> Union[str, List[str]]:
+    """
+    Asks the AI to decide the next step in filling out an application form.
+    In plan mode it returns an ordered list of actions that covers every
+    field on the current step instead of a single action. The form is sent
+    as `form_text` when given (e.g. only what changed, from a FormObserver),
+    otherwise as `serialize_form` packs it into `token_budget` tokens.
+    """
+    print("🤖 AI is thinking about how to fill this form...")
     response = client.chat.completions.create(
         model="gpt-4-turbo-preview",
-        messages=[{"role": "user", "content": prompt}]
+        messages=[{"role": "user", "content": _application_prompt(simplified_html, application_data, plan_mode, token_budget, form_text)}]
     )
-    action = response.choices[0].message.content.strip()
-    print(f"🤖 AI chose form action: {action}")
-    return action
+    return _application_actions(response, plan_mode)
 
-def get_ai_answer_for_question(
+async def get_ai_action_for_application_async(
     client: Any,
-    question: str,
-    story_bank: List[Dict[str, Any]]
-) -> str:
-    """
-    Uses the AI and story bank to answer a custom application question.
-    """
-    print(f"🤖 AI is thinking of an answer for: '{question}'...")
-    prompt = (
+    simplified_html: BeautifulSoup,
+    application_data: Dict[str, Any],
+    plan_mode: bool = False,
+    token_budget: int = FORM_TOKEN_BUDGET,
+    form_text: Optional[str] = None
+) -> Union[str, List[str]]:
+    """get_ai_action_for_application with an async client."""
+    print("🤖 AI is thinking about how to fill this form...")
+    response = await client.chat.completions.create(
+        model="gpt-4-turbo-preview",
+        messages=[{"role": "user", "content": _application_prompt(simplified_html, application_data, plan_mode, token_budget, form_text)}]
+    )
+    return _application_actions(response, plan_mode)
+
+def _question_prompt(question: str, story_bank: List[Dict[str, Any]]) -> str:
+    return (
         f"You are a career coach helping me answer a job application question.\n"
         f"The question is: \"{question}\"\n"
         "Here is my \"Story Bank\" with my key career experiences:\n"
@@ -128,14 +506,59 @@ def get_ai_answer_for_question(
         f"{json.dumps(story_bank, indent=2)}\n"
         "Please generate a concise, professional answer to the question. The answer should be a single block of text. Do not add any conversational filler."
     )
-    response = client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[{"role": "user", "content": prompt}]
-    )
+
+def _cached_answer(question: str, story_bank: List[Dict[str, Any]], cache: Optional[AnswerCache]) -> Optional[str]:
+    cached = cache.lookup(question, story_bank) if cache else None
+    if cached is not None:
+        print(f"✅ Reused cached answer for: '{question}'")
+    return cached
+
+def _answer_from_response(response: Any, question: str, story_bank: List[Dict[str, Any]], cache: Optional[AnswerCache]) -> str:
     answer = response.choices[0].message.content.strip()
     print(f"🤖 AI generated answer: '{(answer[:70] + '...') if len(answer) > 70 else answer}'")
+    if cache and answer:
+        cache.store(question, story_bank, answer)
     return answer
 
+def get_ai_answer_for_question(
+    client: Any,
+    question: str,
+    story_bank: List[Dict[str, Any]],
+    cache: Optional[AnswerCache] = None
+) -> str:
+    """
+    Uses the AI and story bank to answer a custom application question.
+    Questions already answered with the same story bank are served from `cache`.
+    """
+    cached = _cached_answer(question, story_bank, cache)
+    if cached is not None:
+        return cached
+
+    print(f"🤖 AI is thinking of an answer for: '{question}'...")
+    response = client.chat.completions.create(
+        model="gpt-4-turbo-preview",
+        messages=[{"role": "user", "content": _question_prompt(question, story_bank)}]
+    )
+    return _answer_from_response(response, question, story_bank, cache)
+
+async def get_ai_answer_for_question_async(
+    client: Any,
+    question: str,
+    story_bank: List[Dict[str, Any]],
+    cache: Optional[AnswerCache] = None
+) -> str:
+    """get_ai_answer_for_question with an async client, using the cache off the event loop."""
+    cached = await asyncio.to_thread(_cached_answer, question, story_bank, cache)
+    if cached is not None:
+        return cached
+
+    print(f"🤖 AI is thinking of an answer for: '{question}'...")
+    response = await client.chat.completions.create(
+        model="gpt-4-turbo-preview",
+        messages=[{"role": "user", "content": _question_prompt(question, story_bank)}]
+    )
+    return await asyncio.to_thread(_answer_from_response, response, question, story_bank, cache)
+
 def click_easy_apply_button(driver: WebDriver, timeout: int = 10) -> None:
     """
     Robustly clicks the 'Easy Apply' button on a LinkedIn job page using Selenium.
@@ -1,66 +1,150 @@
+import asyncio
+import httpx
 import openai
 import json
 import os
-from typing import Any, Dict, Optional
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from llm_cache import LLMCache
+from llm_usage import instrument
 
 MODEL_NAME = "gpt-4-turbo-preview"
+# Bump these whenever the corresponding prompt or tool schema changes, so
+# that cached results produced by the old prompt are no longer reused.
+RESUME_PROMPT_VERSION = "1"
+COVER_LETTER_PROMPT_VERSION = "1"
+
+# Client settings read from the `openai` section of profile.yml.
+CLIENT_DEFAULTS = {
+    "base_url": None,
+    "timeout": 60.0,                  # Seconds to wait for a response
+    "connect_timeout": 5.0,
+    "max_retries": 2,
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 60.0,         # Seconds an idle connection is kept open
+}
+
+def client_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """CLIENT_DEFAULTS overridden by the `openai` section of profile.yml."""
+    openai_config = (config or {}).get('openai') or {}
+    settings = dict(CLIENT_DEFAULTS)
+    settings.update({name: value for name, value in openai_config.items() if name in CLIENT_DEFAULTS and value is not None})
+    return settings
 
-def get_ai_client() -> openai.OpenAI:
-    """Initializes and returns the OpenAI client from environment variables."""
+def _api_key() -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("❌ OpenAI API key not found in .env file. Make sure OPENAI_API_KEY is set.")
-    return openai.OpenAI(api_key=api_key)
+    return api_key
 
-def tailor_resume_for_job(
-    client: openai.OpenAI,
-    resume_data: Dict[str, Any],
-    job_description: str
-) -> Optional[Dict[str, Any]]:
+def _client_kwargs(api_key: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "api_key": api_key,
+        "base_url": settings['base_url'],
+        "timeout": openai.Timeout(settings['timeout'], connect=settings['connect_timeout']),
+        "max_retries": settings['max_retries'],
+    }
+
+def _limits(settings: Dict[str, Any]) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings['max_connections'],
+        max_keepalive_connections=settings['max_keepalive_connections'],
+        keepalive_expiry=settings['keepalive_expiry'],
+    )
+
+# One client per API key and settings, so every caller shares its pool of
+# keep-alive connections. Async clients are kept per event loop, because
+# an async connection pool can only be used on the loop it was opened on.
+_shared_clients: Dict[Tuple[Any, ...], openai.OpenAI] = {}
+_shared_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], openai.AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+_shared_lock = threading.Lock()
+
+def get_ai_client(config: Optional[Dict[str, Any]] = None) -> openai.OpenAI:
     """
-    Uses OpenAI's API to tailor a resume for a specific job description.
-    Returns the tailored resume as a dictionary, or None on failure.
+    Returns the process-wide OpenAI client, reading the API key from the
+    environment. Base URL, timeouts, retries and connection pooling come
+    from the `openai` section of profile.yml, and calls are recorded in
+    the `llm_usage` log (see llm_usage.py).
     """
-    print("🧠 Contacting AI to tailor resume...")
+    api_key = _api_key()
+    settings = client_settings(config)
+    key = (api_key,) + tuple(sorted(settings.items()))
+    with _shared_lock:
+        if key not in _shared_clients:
+            _shared_clients[key] = openai.OpenAI(
+                http_client=openai.DefaultHttpxClient(limits=_limits(settings)), **_client_kwargs(api_key, settings)
+            )
+        client = _shared_clients[key]
+    return instrument(client, config)
 
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "format_tailored_resume",
-                "description": "Formats the tailored resume summary and work experience based on the job description.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "tailored_summary": {
-                            "type": "string",
-                            "description": "A new, rewritten professional summary of 2-3 sentences, tailored to the job description."
-                        },
-                        "tailored_work_experience": {
-                            "type": "array",
-                            "description": "An array of work experience objects, with responsibilities rewritten to highlight skills relevant to the job description.",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "company": {"type": "string"},
-                                    "role": {"type": "string"},
-                                    "dates": {"type": "string"},
-                                    "rewritten_responsibilities": {
-                                        "type": "array",
-                                        "description": "An array of 2-4 rewritten responsibility bullet points emphasizing skills from the job description.",
-                                        "items": {"type": "string"}
-                                    }
-                                },
-                                "required": ["company", "role", "dates", "rewritten_responsibilities"]
-                            }
-                        }
+def get_async_ai_client(config: Optional[Dict[str, Any]] = None) -> openai.AsyncOpenAI:
+    """
+    Like get_ai_client, but an AsyncOpenAI client for the running event
+    loop, so that many LLM calls can be in flight at once on one thread.
+    Must be called from inside that loop.
+    """
+    api_key = _api_key()
+    settings = client_settings(config)
+    key = (api_key,) + tuple(sorted(settings.items()))
+    loop = asyncio.get_running_loop()
+    with _shared_lock:
+        clients = _shared_async_clients.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = openai.AsyncOpenAI(
+                http_client=openai.DefaultAsyncHttpxClient(limits=_limits(settings)), **_client_kwargs(api_key, settings)
+            )
+        client = clients[key]
+    return instrument(client, config, asynchronous=True)
+
+async def close_async_ai_clients() -> None:
+    """Closes the async clients of the running event loop, before the loop itself is closed."""
+    with _shared_lock:
+        clients = _shared_async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+RESUME_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "format_tailored_resume",
+            "description": "Formats the tailored resume summary and work experience based on the job description.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "tailored_summary": {
+                        "type": "string",
+                        "description": "A new, rewritten professional summary of 2-3 sentences, tailored to the job description."
                     },
-                    "required": ["tailored_summary", "tailored_work_experience"]
-                }
+                    "tailored_work_experience": {
+                        "type": "array",
+                        "description": "An array of work experience objects, with responsibilities rewritten to highlight skills relevant to the job description.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "company": {"type": "string"},
+                                "role": {"type": "string"},
+                                "dates": {"type": "string"},
+                                "rewritten_responsibilities": {
+                                    "type": "array",
+                                    "description": "An array of 2-4 rewritten responsibility bullet points emphasizing skills from the job description.",
+                                    "items": {"type": "string"}
+                                }
+                            },
+                            "required": ["company", "role", "dates", "rewritten_responsibilities"]
+                        }
+                    }
+                },
+                "required": ["tailored_summary", "tailored_work_experience"]
             }
         }
-    ]
+    }
+]
 
+def _resume_request(resume_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
     resume_json_str = json.dumps(resume_data, indent=2)
     prompt = (
         f"Here is my resume data in JSON format:\n"
@@ -73,18 +157,108 @@ def tailor_resume_for_job(
         "Focus on creating impactful, results-oriented bullet points that mirror the language of the job description where appropriate.\n"
         "Use the `format_tailored_resume` function to return your answer."
     )
+    return {
+        "model": MODEL_NAME,
+        "messages": [{"role": "user", "content": prompt}],
+        "tools": RESUME_TOOLS,
+        "tool_choice": {"type": "function", "function": {"name": "format_tailored_resume"}},
+    }
+
+def _cover_letter_request(tailored_resume: Dict[str, Any], job_title: str, company_name: str, your_name: str) -> Dict[str, Any]:
+    resume_context = json.dumps(tailored_resume, indent=2)
+    prompt = (
+        f"My name is {your_name}. I am applying for the {job_title} role at {company_name}.\n"
+        f"Here is my resume, which has already been tailored for this specific job:\n"
+        f"--- TAILORED RESUME CONTEXT ---\n"
+        f"{resume_context}\n\n"
+        "Please write a compelling, professional, and concise cover letter. It should have three paragraphs:\n"
+        "1.  Introduction: State the position I'm applying for and my enthusiasm for the company.\n"
+        "2.  Body: Highlight 2-3 key qualifications from my tailored resume that make me a perfect fit for the role. Use some of the language from my rewritten responsibilities.\n"
+        "3.  Conclusion: Reiterate my interest and include a call to action (e.g., \"I am eager to discuss how my skills can contribute to your team's success\").\n\n"
+        "Do not use placeholders like \"[Your Name]\". Write the letter as if I am the one writing it. Be confident but not arrogant."
+    )
+    return {"model": MODEL_NAME, "messages": [{"role": "user", "content": prompt}]}
+
+def _cached_resume(cache: Optional[LLMCache], resume_data: Dict[str, Any], job_description: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """The cache key for a resume request and the cached result, if any."""
+    if not cache:
+        return None, None
+    cache_key = LLMCache.make_key("tailor_resume", MODEL_NAME, RESUME_PROMPT_VERSION, resume_data, job_description)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print("✅ Reused cached tailored resume for this job description.")
+    return cache_key, cached
+
+def _cached_cover_letter(
+    cache: Optional[LLMCache], tailored_resume: Dict[str, Any], job_title: str, company_name: str, your_name: str
+) -> Tuple[Optional[str], Optional[str]]:
+    """The cache key for a cover letter request and the cached result, if any."""
+    if not cache:
+        return None, None
+    cache_key = LLMCache.make_key(
+        "cover_letter", MODEL_NAME, COVER_LETTER_PROMPT_VERSION, tailored_resume, job_title, company_name, your_name
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print("✅ Reused cached cover letter for this job.")
+    return cache_key, cached
+
+def _resume_from_response(response: Any, cache: Optional[LLMCache], cache_key: Optional[str]) -> Dict[str, Any]:
+    tool_call = response.choices[0].message.tool_calls[0]
+    arguments = json.loads(tool_call.function.arguments)
+    print("✅ AI has successfully tailored the resume.")
+    if cache:
+        cache.set(cache_key, arguments)
+    return arguments
+
+def _cover_letter_from_response(response: Any, cache: Optional[LLMCache], cache_key: Optional[str]) -> Optional[str]:
+    cover_letter_text = response.choices[0].message.content
+    print("✅ AI has successfully generated the cover letter.")
+    if cache and cover_letter_text:
+        cache.set(cache_key, cover_letter_text)
+    return cover_letter_text
+
+def tailor_resume_for_job(
+    client: openai.OpenAI,
+    resume_data: Dict[str, Any],
+    job_description: str,
+    cache: Optional[LLMCache] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Uses OpenAI's API to tailor a resume for a specific job description.
+    Returns the tailored resume as a dictionary, or None on failure.
+    Results are read from and written to `cache` when one is given.
+    """
+    cache_key, cached = _cached_resume(cache, resume_data, job_description)
+    if cached is not None:
+        return cached
 
+    print("🧠 Contacting AI to tailor resume...")
     try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            tools=tools,
-            tool_choice={"type": "function", "function": {"name": "format_tailored_resume"}}
-        )
-        tool_call = response.choices[0].message.tool_calls[0]
-        arguments = json.loads(tool_call.function.arguments)
-        print("✅ AI has successfully tailored the resume.")
-        return arguments
+        response = client.chat.completions.create(**_resume_request(resume_data, job_description))
+        return _resume_from_response(response, cache, cache_key)
+    except Exception as e:
+        print(f"❌ Error while contacting the AI for resume tailoring: {e}")
+        return None
+
+async def tailor_resume_for_job_async(
+    client: openai.AsyncOpenAI,
+    resume_data: Dict[str, Any],
+    job_description: str,
+    cache: Optional[LLMCache] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    tailor_resume_for_job with an async client. Cache lookups and stores
+    run on a worker thread, so SQLite never blocks the event loop.
+    """
+    cache_key, cached = await asyncio.to_thread(_cached_resume, cache, resume_data, job_description)
+    if cached is not None:
+        return cached
+
+    print("🧠 Contacting AI to tailor resume...")
+    try:
+        response = await client.chat.completions.create(**_resume_request(resume_data, job_description))
+        return await asyncio.to_thread(_resume_from_response, response, cache, cache_key)
     except Exception as e:
         print(f"❌ Error while contacting the AI for resume tailoring: {e}")
         return None
@@ -94,34 +268,43 @@ def generate_cover_letter(
     tailored_resume: Dict[str, Any],
     job_title: str,
     company_name: str,
-    your_name: str
+    your_name: str,
+    cache: Optional[LLMCache] = None
 ) -> Optional[str]:
     """
     Uses the AI to generate a cover letter based on the tailored resume.
     Returns the cover letter as a string, or None on failure.
+    Results are read from and written to `cache` when one is given.
     """
+    cache_key, cached = _cached_cover_letter(cache, tailored_resume, job_title, company_name, your_name)
+    if cached is not None:
+        return cached
+
     print("🧠 Contacting AI to generate cover letter...")
-    resume_context = json.dumps(tailored_resume, indent=2)
-    prompt = (
-        f"My name is {your_name}. I am applying for the {job_title} role at {company_name}.\n"
-        f"Here is my resume, which has already been tailored for this specific job:\n"
-        f"--- TAILORED RESUME CONTEXT ---\n"
-        f"{resume_context}\n\n"
-        "Please write a compelling, professional, and concise cover letter. It should have three paragraphs:\n"
-        "1.  Introduction: State the position I'm applying for and my enthusiasm for the company.\n"
-        "2.  Body: Highlight 2-3 key qualifications from my tailored resume that make me a perfect fit for the role. Use some of the language from my rewritten responsibilities.\n"
-        "3.  Conclusion: Reiterate my interest and include a call to action (e.g., \"I am eager to discuss how my skills can contribute to your team's success\").\n\n"
-        "Do not use placeholders like \"[Your Name]\". Write the letter as if I am the one writing it. Be confident but not arrogant."
-    )
+    try:
+        response = client.chat.completions.create(**_cover_letter_request(tailored_resume, job_title, company_name, your_name))
+        return _cover_letter_from_response(response, cache, cache_key)
+    except Exception as e:
+        print(f"❌ Error while generating the cover letter: {e}")
+        return None
+
+async def generate_cover_letter_async(
+    client: openai.AsyncOpenAI,
+    tailored_resume: Dict[str, Any],
+    job_title: str,
+    company_name: str,
+    your_name: str,
+    cache: Optional[LLMCache] = None
+) -> Optional[str]:
+    """generate_cover_letter with an async client, using the cache off the event loop."""
+    cache_key, cached = await asyncio.to_thread(_cached_cover_letter, cache, tailored_resume, job_title, company_name, your_name)
+    if cached is not None:
+        return cached
 
+    print("🧠 Contacting AI to generate cover letter...")
     try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        cover_letter_text = response.choices[0].message.content
-        print("✅ AI has successfully generated the cover letter.")
-        return cover_letter_text
+        response = await client.chat.completions.create(**_cover_letter_request(tailored_resume, job_title, company_name, your_name))
+        return await asyncio.to_thread(_cover_letter_from_response, response, cache, cache_key)
     except Exception as e:
         print(f"❌ Error while generating the cover letter: {e}")
         return None
@@ -0,0 +1,148 @@
+# answer_cache.py
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Words that carry no meaning for matching application questions. Dropping
+# them lets "How many years of Python experience do you have?" match
+# "Years of experience with Python".
+STOPWORDS = frozenset("""
+a an and are as at be by can could describe do does for from have how i if in is it me of on or
+many much our please tell that the this to us we what when where which who why will with would you your
+""".split())
+
+def normalize_question(question: str) -> str:
+    """Lowercases, strips punctuation and collapses whitespace."""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+def question_tokens(question: str) -> FrozenSet[str]:
+    """Returns the set of meaningful words in a question."""
+    return frozenset(w for w in normalize_question(question).split() if w not in STOPWORDS)
+
+def story_bank_fingerprint(story_bank: List[Dict[str, Any]]) -> str:
+    """Hashes the story bank, so answers are invalidated when it changes."""
+    payload = json.dumps(story_bank, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class AnswerCache:
+    """
+    A durable cache of answers to custom application questions.
+
+    Answers are keyed by the normalized question text and a fingerprint of
+    the story bank. With `similarity_threshold` set, a question that has no
+    exact match is answered from the most similar cached question whose
+    word overlap (Jaccard) reaches the threshold.
+    """
+
+    def __init__(self, path: str = "answer_cache.db", similarity_threshold: Optional[float] = 0.85):
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, List[Tuple[FrozenSet[str], str]]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " fingerprint TEXT NOT NULL,"
+            " question_norm TEXT NOT NULL,"
+            " question TEXT NOT NULL,"
+            " answer TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " hit_count INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (fingerprint, question_norm))"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["AnswerCache"]:
+        """Builds a cache from the `answer_cache` section of profile.yml, or None if disabled."""
+        cache_config = config.get('answer_cache') or {}
+        if not cache_config.get('enabled', True):
+            return None
+        return cls(
+            path=cache_config.get('path', "answer_cache.db"),
+            similarity_threshold=cache_config.get('similarity_threshold', 0.85),
+        )
+
+    def _candidates(self, fingerprint: str) -> List[Tuple[FrozenSet[str], str]]:
+        # Token sets are computed once per story bank and kept in memory.
+        if fingerprint not in self._tokens:
+            rows = self._conn.execute("SELECT question_norm FROM answers WHERE fingerprint = ?", (fingerprint,)).fetchall()
+            self._tokens[fingerprint] = [(question_tokens(norm), norm) for (norm,) in rows]
+        return self._tokens[fingerprint]
+
+    def lookup(self, question: str, story_bank: List[Dict[str, Any]]) -> Optional[str]:
+        """Returns a cached answer for the question, or None on a miss."""
+        fingerprint = story_bank_fingerprint(story_bank)
+        norm = normalize_question(question)
+        with self._lock:
+            match = norm
+            row = self._conn.execute(
+                "SELECT answer FROM answers WHERE fingerprint = ? AND question_norm = ?", (fingerprint, norm)
+            ).fetchone()
+            if row is None and self.similarity_threshold is not None:
+                tokens = question_tokens(question)
+                best_score, best_norm = 0.0, None
+                for candidate_tokens, candidate_norm in self._candidates(fingerprint):
+                    score = jaccard(tokens, candidate_tokens)
+                    if score > best_score:
+                        best_score, best_norm = score, candidate_norm
+                if best_norm is not None and best_score >= self.similarity_threshold:
+                    match = best_norm
+                    row = self._conn.execute(
+                        "SELECT answer FROM answers WHERE fingerprint = ? AND question_norm = ?", (fingerprint, best_norm)
+                    ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE answers SET hit_count = hit_count + 1 WHERE fingerprint = ? AND question_norm = ?",
+                (fingerprint, match),
+            )
+            self._conn.commit()
+        return row[0]
+
+    def store(self, question: str, story_bank: List[Dict[str, Any]], answer: str) -> None:
+        """Saves an answer for the question."""
+        fingerprint = story_bank_fingerprint(story_bank)
+        norm = normalize_question(question)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (fingerprint, question_norm, question, answer, created_at, hit_count)"
+                " VALUES (?, ?, ?, ?, ?, 0)",
+                (fingerprint, norm, question, answer, time.time()),
+            )
+            self._conn.commit()
+            if fingerprint in self._tokens:
+                self._tokens[fingerprint].append((question_tokens(question), norm))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_shared_caches: Dict[str, AnswerCache] = {}
+_shared_lock = threading.Lock()
+
+def get_answer_cache(config: Dict[str, Any]) -> Optional[AnswerCache]:
+    """Returns the process-wide answer cache configured in profile.yml, or None if disabled."""
+    cache_config = config.get('answer_cache') or {}
+    if not cache_config.get('enabled', True):
+        return None
+    path = cache_config.get('path', "answer_cache.db")
+    with _shared_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = AnswerCache.from_config(config)
+        return _shared_caches[path]
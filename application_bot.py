@@ -1,51 +1,111 @@
 # application_bot.py (Updated for Environment Variables)
 
-import time
 import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import Select
 
 from ai_engine import get_ai_client
-from ai_agent import simplify_html, get_initial_page_action, get_ai_action_for_application, get_ai_answer_for_question
+from browser_pool import BrowserPool, is_session_healthy
+from session_store import SessionStore, ensure_logged_in, is_logged_out
+from answer_cache import get_answer_cache
+from ai_agent import simplify_html, snapshot_element_html, get_initial_page_action, get_ai_action_for_application, get_ai_answer_for_question, FORM_TOKEN_BUDGET
+from field_rules import next_rule_action
+from form_diff import FormObserver
+from waits import wait_for, wait_timeout, value_changed, network_idle
+from tracing import span
 
-def apply_to_job_agent(config, job_details, resume_file_path):
+# Outcomes of a single form action.
+ACTION_OK = "ok"              # carry on with the form
+ACTION_RETRY = "retry"        # the action failed; observe the form again
+ACTION_FINISHED = "finished"  # the application is complete (or simulated as submitted)
+ACTION_ABORT = "abort"        # give up on this job
+
+# Identifies the current Easy Apply step by its progress value and labels.
+MODAL_STEP_SIGNATURE_JS = """
+var modal = document.querySelector('div.jobs-easy-apply-modal');
+if (!modal) { return null; }
+var progress = modal.querySelector('[role=progressbar]');
+var labels = Array.prototype.map.call(modal.querySelectorAll('h3, label, legend'), function (el) { return el.textContent.trim(); });
+return (progress ? progress.getAttribute('aria-valuenow') : '') + '|' + labels.join('|');
+"""
+
+def easy_apply_modal_present(driver):
+    """Wait condition: the Easy Apply modal is open."""
+    return driver.find_elements(By.CSS_SELECTOR, "div.jobs-easy-apply-modal") or None
+
+def modal_step_signature(driver):
+    """Returns a string that changes whenever the Easy Apply modal moves to another step."""
+    return driver.execute_script(MODAL_STEP_SIGNATURE_JS)
+
+def execute_form_action(driver, ai_client, config, action_str, tolerate_errors=False):
+    """
+    Carries out one agent command on the Easy Apply modal and returns one of
+    the ACTION_* outcomes. With `tolerate_errors`, a missing element or a
+    failed interaction returns ACTION_RETRY instead of aborting the job.
+    """
+    parts = action_str.split(' ', 2)
+    command = parts[0].upper()
+    if command == "DONE":
+        print("✅ AI agent reports task is complete.")
+        return ACTION_FINISHED
+    if command == "FAIL":
+        print(f"❌ AI agent failed. Reason: {' '.join(parts[1:])}")
+        return ACTION_ABORT
+    agent_id = parts[1] if len(parts) > 1 else None
+    try:
+        target_element = driver.find_element(By.CSS_SELECTOR, f"[agent-id='{agent_id}']")
+    except Exception:
+        if tolerate_errors:
+            print(f"⚠️  Could not find element with {agent_id}. Observing the form again.")
+            return ACTION_RETRY
+        print(f"Could not find element with {agent_id}. Agent may be hallucinating. Aborting.")
+        return ACTION_ABORT
+    try:
+        if command == "TYPE": target_element.clear(); target_element.send_keys(parts[2])
+        elif command == "SELECT": Select(target_element).select_by_visible_text(parts[2])
+        elif command == "CLICK": target_element.click()
+        elif command == "UPLOAD": target_element.send_keys(parts[2])
+        elif command == "ANSWER":
+            answer = get_ai_answer_for_question(ai_client, parts[2], config['story_bank'], cache=get_answer_cache(config))
+            target_element.send_keys(answer)
+        elif command == "SUBMIT":
+            print("🤖 AI wants to submit. This is a simulated success.")
+            print("✅ APPLICATION SUBMITTED (Simulated).")
+            return ACTION_FINISHED
+    except (IndexError, NoSuchElementException, WebDriverException) as e:
+        if not tolerate_errors or isinstance(e, TimeoutException):
+            raise
+        print(f"⚠️  Action '{action_str}' failed ({e}). Observing the form again.")
+        return ACTION_RETRY
+    return ACTION_OK
+
+def apply_to_job_agent(config, job_details, resume_file_path, browser_pool=None):
     """
     Uses a reasoning AI agent to find the apply button and fill out the form.
+    If a BrowserPool is given, a logged-in session is borrowed from it and
+    handed back afterwards; otherwise a one-off browser is started and closed.
     """
     print(f"🤖 Initializing AI Application Agent for '{job_details['title']}'...")
-    
+
+    owns_pool = browser_pool is None
+    if owns_pool:
+        browser_pool = BrowserPool(size=1, session_store=SessionStore.from_config(config))
+
     driver = None
+    healthy = True
     try:
-        # --- NEW: Get credentials from environment variables ---
-        LINKEDIN_EMAIL = os.getenv("LINKEDIN_EMAIL")
-        LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD")
-        if not LINKEDIN_EMAIL or not LINKEDIN_PASSWORD:
-            raise ValueError("❌ LinkedIn email or password not found in environment variables. Check your .env file.")
-        # ----------------------------------------------------
-
         ai_client = get_ai_client(config)
-        options = webdriver.ChromeOptions()
-        driver = webdriver.Chrome(options=options)
-        driver.maximize_window()
+        driver = browser_pool.acquire()
 
-        # --- 1. Login & Navigate ---
-        print("Logging in and navigating to job page...")
-        driver.get("https://www.linkedin.com/login")
-        
-        # --- UPDATED: Use the new variables ---
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "username"))).send_keys(LINKEDIN_EMAIL)
-        driver.find_element(By.ID, "password").send_keys(LINKEDIN_PASSWORD)
-        # -------------------------------------
-
-        driver.find_element(By.ID, "password").send_keys(Keys.RETURN)
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "global-nav-search")))
-        print("✅ Login successful.")
+        # --- 1. Navigate (the pooled session is already logged in) ---
         driver.get(job_details['url'])
+        if is_logged_out(driver):
+            print("⚠️  Pooled session was logged out. Logging in again...")
+            ensure_logged_in(driver, browser_pool.session_store)
+            driver.get(job_details['url'])
         print(f"Navigated to job page: {job_details['url']}")
         
         # --- 2. OODA Loop: Wait, Observe, Decide, Act ---
@@ -53,7 +113,7 @@ def apply_to_job_agent(config, job_details, resume_file_path):
         WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.jobs-description-content")))
         print("✅ Job page appears loaded. Starting AI analysis.")
 
-        page_html = driver.find_element(By.TAG_NAME, "body").get_attribute('outerHTML')
+        page_html = snapshot_element_html(driver, driver.find_element(By.TAG_NAME, "body"))
         simplified_page_html = simplify_html(page_html, for_application=True)
         
         # This debug block can be removed if you want, but it's helpful.
@@ -103,7 +163,7 @@ def apply_to_job_agent(config, job_details, resume_file_path):
                 easy_apply_button = driver.find_element(By.CSS_SELECTOR, f"[agent-id='{agent_id}']")
                 driver.execute_script("arguments[0].click();", easy_apply_button)
                 print("✅ AI located and clicked 'Easy Apply'. Handing over to form-filling agent...")
-                time.sleep(2)
+                wait_for(driver, easy_apply_modal_present, wait_timeout(config, 'form_step'), "easy_apply_modal")
             except Exception as e:
                 print(f"❌ AI found a button, but could not click it. Error: {e}")
                 return False
@@ -112,40 +172,83 @@ def apply_to_job_agent(config, job_details, resume_file_path):
             return False
 
         # --- 3. The Form-Filling Agent Loop ---
+        application_data = {"phone": config['personal_info']['phone'], "resume_path": os.path.abspath(resume_file_path)}
+        agent_config = config.get('application_agent') or {}
+        # Common fields are filled by deterministic rules; only what no rule
+        # recognises is sent to the LLM.
+        use_rules = agent_config.get('field_rules', True)
+        # In plan mode one LLM call returns every action for the current step.
+        plan_mode = agent_config.get('plan_mode', False)
+        token_budget = agent_config.get('form_token_budget', FORM_TOKEN_BUDGET)
+        rule_context = dict(
+            application_data,
+            email=config['personal_info'].get('email'),
+            phone_country_code=config['personal_info'].get('phone_country_code'),
+        )
+        rule_attempts = set()
+        # Keeps the last observed form, so unchanged snapshots are not parsed
+        # again and the LLM is only told what changed since it last looked.
+        observer = FormObserver(token_budget) if agent_config.get('diff_observations', True) else None
         for i in range(15):
-            print(f"\n--- Agent Application Cycle {i+1}/15 ---")
-            modal_element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.jobs-easy-apply-modal")))
-            modal_html = modal_element.get_attribute('outerHTML')
-            simplified_modal_html = simplify_html(modal_html, for_application=True)
-            application_data = {"phone": config['personal_info']['phone'], "resume_path": os.path.abspath(resume_file_path)}
-            action_str = get_ai_action_for_application(ai_client, simplified_modal_html, application_data)
-            parts = action_str.split(' ', 2)
-            command = parts[0].upper()
-            if command == "DONE": print("✅ AI agent reports task is complete."); break
-            if command == "FAIL": print(f"❌ AI agent failed. Reason: {' '.join(parts[1:])}"); return False
-            try:
-                agent_id = parts[1]
-                target_element = driver.find_element(By.CSS_SELECTOR, f"[agent-id='{agent_id}']")
-            except Exception: print(f"Could not find element with {agent_id}. Agent may be hallucinating. Aborting."); return False
-            if command == "TYPE": target_element.clear(); target_element.send_keys(parts[2])
-            elif command == "SELECT": Select(target_element).select_by_visible_text(parts[2])
-            elif command == "CLICK": target_element.click()
-            elif command == "UPLOAD": target_element.send_keys(parts[2])
-            elif command == "ANSWER":
-                answer = get_ai_answer_for_question(ai_client, parts[2], config['story_bank'])
-                target_element.send_keys(answer)
-            elif command == "SUBMIT": print("🤖 AI wants to submit. This is a simulated success."); print("✅ APPLICATION SUBMITTED (Simulated)."); break
-            time.sleep(2)
+            with span("agent_cycle", cycle=i + 1):
+                print(f"\n--- Agent Application Cycle {i+1}/15 ---")
+                modal_element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.jobs-easy-apply-modal")))
+                modal_html = snapshot_element_html(driver, modal_element)
+                simplified_modal_html = observer.simplify(modal_html) if observer else simplify_html(modal_html, for_application=True)
+                rule_action = next_rule_action(simplified_modal_html, rule_context, rule_attempts) if use_rules else None
+                if rule_action:
+                    actions = [rule_action]
+                elif plan_mode:
+                    form_text = observer.describe(simplified_modal_html) if observer else None
+                    actions = get_ai_action_for_application(ai_client, simplified_modal_html, application_data, plan_mode=True, token_budget=token_budget, form_text=form_text)
+                    if not actions:
+                        print("❌ AI agent returned no usable actions for this step. Aborting.")
+                        return False
+                else:
+                    form_text = observer.describe(simplified_modal_html) if observer else None
+                    actions = [get_ai_action_for_application(ai_client, simplified_modal_html, application_data, token_budget=token_budget, form_text=form_text)]
+
+                # Execute the actions in order. A plan is cut short, and the form
+                # observed again, as soon as the step changes or an action fails.
+                in_plan = len(actions) > 1
+                step_before = modal_step_signature(driver)
+                outcome = ACTION_OK
+                clicked = False
+                for action_str in actions:
+                    outcome = execute_form_action(driver, ai_client, config, action_str, tolerate_errors=in_plan)
+                    clicked = action_str.split(' ', 1)[0].upper() == "CLICK"
+                    if outcome != ACTION_OK or clicked:
+                        break
+                    if in_plan and modal_step_signature(driver) != step_before:
+                        print("ℹ️ The form step changed. Observing the form again.")
+                        break
+                if outcome == ACTION_FINISHED:
+                    break
+                if outcome == ACTION_ABORT:
+                    return False
+
+                # Wait for the form to react instead of sleeping: a click should
+                # move to another step, other actions only need the page to settle.
+                if clicked:
+                    wait_for(driver, value_changed(modal_step_signature, step_before), wait_timeout(config, 'form_step'), "form_step")
+                else:
+                    wait_for(driver, network_idle(0.3), wait_timeout(config, 'form_settle'), "form_settle")
 
     except TimeoutException:
         print("❌ TIMEOUT: A critical element was not found in time. The page may have a different layout or failed to load. Aborting this job.")
         return False
+    except WebDriverException as e:
+        healthy = False
+        print(f"❌ The browser session failed during the agent process: {e}")
+        return False
     except Exception as e:
         print(f"❌ An unexpected error occurred in the agent process: {e}")
         return False
     finally:
-        print("Application agent finished for this job. Closing browser.")
+        print("Application agent finished for this job. Returning browser session to the pool.")
         if driver:
-            driver.quit()
+            browser_pool.release(driver, healthy=healthy and is_session_healthy(driver))
+        if owns_pool:
+            browser_pool.close()
             
     return True
\ No newline at end of file
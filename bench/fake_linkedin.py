@@ -0,0 +1,212 @@
+# bench/fake_linkedin.py
+
+import html
+import json
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+AUTH_COOKIE = "li_at"
+SESSION_TOKEN = "bench-session"
+
+TITLES = ["Backend Engineer", "Software Engineer", "Python Developer", "Platform Engineer", "Ruby on Rails Developer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne"]
+SKILLS = ["Python", "Ruby on Rails", "React", "PostgreSQL", "Redis", "Docker", "AWS", "Flask", "SQL", "Go"]
+
+def fake_jobs(count: int) -> List[Dict[str, Any]]:
+    """`count` distinct job postings, the same on every call."""
+    jobs = []
+    for i in range(count):
+        job_id = str(4100000000 + i)
+        skills = [SKILLS[(i + k) % len(SKILLS)] for k in range(4)]
+        jobs.append({
+            "job_id": job_id,
+            "title": f"{TITLES[i % len(TITLES)]} {i}",
+            "company": f"{COMPANIES[i % len(COMPANIES)]} {i // len(COMPANIES)}",
+            "location": "London, England, United Kingdom (Remote)",
+            "is_easy_apply": "Yes",
+            "description": (
+                f"Job {job_id}. We are hiring to build and run services in {', '.join(skills)}. "
+                f"You will own APIs used by {1000 * (i + 1)} customers a day, review code and mentor engineers. "
+                f"Requirements: {i % 7 + 2} years with {skills[0]}, experience with {skills[1]} and {skills[2]}, "
+                f"and testing in {skills[3]}. Benefits ticket {i * 7919 % 100003}."
+            ),
+        })
+    return jobs
+
+PAGE = """<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><header><input id="global-nav-search" placeholder="Search"></header><main>{body}</main>{script}</body></html>"""
+
+LOGIN_PAGE = """<!DOCTYPE html><html><head><title>Sign In</title></head><body>
+<form method="post" action="/login"><input id="username" name="session_key"><input id="password" name="session_password" type="password">
+<button type="submit">Sign in</button></form></body></html>"""
+
+# The Easy Apply steps: (heading, progress, fields HTML, button label).
+MODAL_STEPS = [
+    ("Contact info", 0,
+     '<label for="phone">Mobile phone number</label><input id="phone" type="text" required>'
+     '<label for="code">Phone country code</label><select id="code" required><option>Select an option</option>'
+     '<option>United Kingdom (+44)</option><option>United States (+1)</option></select>'
+     '<label for="email">Email address</label><input id="email" type="email" required>',
+     "Continue to next step"),
+    ("Resume", 33,
+     '<label for="resume">Upload resume</label><input id="resume" type="file" accept=".pdf,.doc,.docx" required>',
+     "Continue to next step"),
+    ("Additional questions", 66,
+     '<label for="years">How many years of work experience do you have with Python?</label><input id="years" type="text" required>'
+     '<fieldset><legend>Will you now or in the future require sponsorship for employment visa status?</legend>'
+     '<input id="visa-yes" type="radio" name="visa" value="Yes" required><label for="visa-yes">Yes</label>'
+     '<input id="visa-no" type="radio" name="visa" value="No" required><label for="visa-no">No</label></fieldset>',
+     "Review your application"),
+    ("Review your application", 100, '<p>Check your answers before submitting.</p>', "Submit application"),
+]
+
+# Opens the modal on "Easy Apply" and moves through MODAL_STEPS, showing
+# an error instead of advancing while a required field is empty.
+MODAL_JS = """<script>
+var STEPS = %s;
+var step = 0;
+function render() {
+  var s = STEPS[step];
+  var modal = document.querySelector('div.jobs-easy-apply-modal');
+  modal.innerHTML = '<h3>' + s[0] + '</h3><div role="progressbar" aria-valuenow="' + s[1] + '"></div>'
+    + '<form>' + s[2] + '</form><div class="errors"></div>'
+    + '<button type="button" aria-label="' + s[3] + '" class="step-button">' + (step == STEPS.length - 1 ? 'Submit application' : (step == STEPS.length - 2 ? 'Review' : 'Next')) + '</button>';
+  modal.querySelector('.step-button').onclick = advance;
+}
+function advance() {
+  var modal = document.querySelector('div.jobs-easy-apply-modal');
+  var missing = Array.prototype.filter.call(modal.querySelectorAll('[required]'), function (el) {
+    if (el.type == 'radio') { return !modal.querySelector('input[name="' + el.name + '"]:checked'); }
+    return !el.value || el.selectedIndex === 0;
+  });
+  if (missing.length) {
+    modal.querySelector('.errors').innerHTML = '<div role="alert">Please enter a valid answer</div>';
+    return;
+  }
+  if (step < STEPS.length - 1) { step += 1; render(); }
+  else { modal.innerHTML = '<h3>Your application was sent</h3>'; }
+}
+function openEasyApply() {
+  var modal = document.createElement('div');
+  modal.className = 'jobs-easy-apply-modal';
+  modal.setAttribute('role', 'dialog');
+  document.body.appendChild(modal);
+  step = 0;
+  render();
+}
+</script>"""
+
+class FakeLinkedIn:
+    """
+    A local stand-in for the parts of LinkedIn the bot drives: login, the
+    feed probe, paged job search results, job view pages and a multi-step
+    Easy Apply modal. Pages are plain static HTML with a little script,
+    served from a background thread.
+    """
+
+    def __init__(self, total_jobs: int = 50, per_page: int = 25, host: str = "127.0.0.1", port: int = 0):
+        self.jobs = fake_jobs(total_jobs)
+        self.per_page = per_page
+        self.requests = 0
+        self._by_id = {job['job_id']: job for job in self.jobs}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-linkedin", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def job_url(self, job_id: str) -> str:
+        return f"{self.base_url}/jobs/view/{job_id}/"
+
+    # --- Pages ------------------------------------------------------------
+
+    def search_page(self, start: int) -> str:
+        cards = []
+        for job in self.jobs[start:start + self.per_page]:
+            cards.append(
+                f'<li><div data-job-id="{job["job_id"]}" class="job-card-container">'
+                f'<a href="/jobs/view/{job["job_id"]}/?trk=bench"><strong>{html.escape(job["title"])}</strong></a>\n'
+                f'<div>{html.escape(job["company"])}</div>\n<div>{job["location"]}</div>\n<div>Easy Apply</div></div></li>'
+            )
+        body = f'<div class="jobs-search-results-list"><ul>{"".join(cards)}</ul></div>'
+        return PAGE.format(title="Jobs | LinkedIn", body=body, script="")
+
+    def job_page(self, job: Dict[str, Any]) -> str:
+        body = (
+            f'<h1>{html.escape(job["title"])}</h1><div>{html.escape(job["company"])}</div>'
+            f'<button class="jobs-apply-button" onclick="openEasyApply()"><span>Easy Apply</span></button>'
+            f'<div class="jobs-description-content"><div id="job-details">{html.escape(job["description"])}</div></div>'
+        )
+        return PAGE.format(title=f'{html.escape(job["title"])} | LinkedIn', body=body, script=MODAL_JS % json.dumps(MODAL_STEPS))
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: str = "", headers: Optional[Dict[str, str]] = None, content_type: str = "text/html"):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _signed_in(self) -> bool:
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                return AUTH_COOKIE in cookie and cookie[AUTH_COOKIE].value == SESSION_TOKEN
+
+            def do_GET(self):
+                with site._lock:
+                    site.requests += 1
+                url = urlparse(self.path)
+                path = url.path
+                if path == "/robots.txt":
+                    return self._send(200, "User-agent: *\n", content_type="text/plain")
+                if path == "/login":
+                    return self._send(200, LOGIN_PAGE)
+                if not self._signed_in():
+                    return self._send(302, headers={"Location": "/login"})
+                if path == "/feed/":
+                    return self._send(200, PAGE.format(title="Feed | LinkedIn", body="<h1>Feed</h1>", script=""))
+                if path == "/jobs/search/":
+                    start = int((parse_qs(url.query).get('start') or ["0"])[0])
+                    return self._send(200, site.search_page(start))
+                if path.startswith("/jobs/view/"):
+                    job = site._by_id.get(path.strip("/").split("/")[-1])
+                    if job:
+                        return self._send(200, site.job_page(job))
+                self._send(404, "Not found")
+
+            def do_POST(self):
+                with site._lock:
+                    site.requests += 1
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if urlparse(self.path).path != "/login":
+                    return self._send(404, "Not found")
+                self._send(303, headers={
+                    "Location": "/feed/",
+                    "Set-Cookie": f"{AUTH_COOKIE}={SESSION_TOKEN}; Path=/; Max-Age=86400",
+                })
+
+        return Handler
@@ -0,0 +1,251 @@
+# bench/run_bench.py
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+from ai_engine import get_ai_client
+from application_bot import apply_to_job_agent
+from bench.fake_linkedin import FakeLinkedIn
+from bench.stub_llm import StubLLM
+from browser_pool import BrowserPool
+from filter import filter_jobs
+from job_store import get_job_store, job_id_for
+from llm_usage import get_usage_log, job_context
+from materials import prepare_materials
+from ranking import rank_jobs
+from scraper import linkedin_scraper
+
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profile.yml")
+
+# Waits sized for a local site that answers in milliseconds.
+BENCH_WAITS = {
+    "search_results": 5, "scroll": 0.3, "scroll_step": 0.05, "description": 5,
+    "form_step": 1, "form_settle": 0.3, "between_jobs_seconds": 0,
+}
+# Figures compared against the baseline; higher is worse for all of them.
+COMPARED_LLM_FIGURES = ("calls_per_job", "tokens_per_job")
+# Stages this much slower or less are timer noise, whatever the tolerance.
+MIN_REGRESSION_SECONDS = 0.25
+
+def bench_config(profile: Dict[str, Any], workdir: str, site_url: str, llm_url: str) -> Dict[str, Any]:
+    """
+    profile.yml pointed at the fake site and the stub LLM, with every file
+    the run writes kept in `workdir` and the LLM result cache off, so that
+    each run does (and measures) the same work.
+    """
+    config = copy.deepcopy(profile)
+    path = lambda name: os.path.join(workdir, name)
+    config['linkedin'] = {"base_url": site_url}
+    config['openai'] = dict(config.get('openai') or {}, base_url=llm_url)
+    config['browser'] = dict(config.get('browser') or {}, headless=True, session_file=path("session.json"))
+    config['job_store'] = {"path": path("jobs.db")}
+    config['journal'] = {"path": path("run_journal.jsonl")}
+    config['filter'] = dict(config.get('filter') or {}, streaming=False, output=path("filtered_jobs.csv"), rejections_file=path("filter_rejections.jsonl"))
+    config['ranking'] = dict(config.get('ranking') or {}, index_path=path("ranking_index.db"))
+    config['llm_cache'] = {"enabled": False}
+    config['llm_usage'] = dict(config.get('llm_usage') or {}, enabled=True, path=path("llm_calls.jsonl"))
+    config['answer_cache'] = dict(config.get('answer_cache') or {}, path=path("answer_cache.db"))
+    config['tracing'] = {"enabled": False}
+    config['waits'] = dict(BENCH_WAITS)
+    config['scraper'] = dict(config.get('scraper') or {}, scroll_mode="local", incremental=True)
+    config['resume_path'] = path("resume.pdf")
+    with open(config['resume_path'], 'wb') as f:
+        f.write(b"%PDF-1.4\n% benchmark resume\n")
+    return config
+
+@contextmanager
+def _environment(values: Dict[str, str]) -> Iterator[None]:
+    saved = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+@contextmanager
+def _working_directory(path: str) -> Iterator[None]:
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+class _Stages:
+    """Wall-clock seconds and jobs handled per stage."""
+
+    def __init__(self):
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, float]]:
+        entry = {"jobs": 0}
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            seconds = time.perf_counter() - started
+            entry["seconds"] = round(seconds, 3)
+            entry["jobs_per_min"] = round(entry["jobs"] * 60 / seconds, 1) if seconds and entry["jobs"] else 0.0
+            self.results[name] = entry
+
+def run_bench(
+    jobs: int = 50,
+    llm_latency: float = 0.0,
+    browser: bool = True,
+    apply_limit: Optional[int] = 10,
+    workdir: Optional[str] = None,
+    profile_path: str = PROFILE_PATH,
+) -> Dict[str, Any]:
+    """
+    Runs scrape, filter, rank, materials and apply against a fake LinkedIn
+    with `jobs` postings and a stub LLM that takes `llm_latency` seconds
+    per call. Without `browser` (no Chrome available) the scrape is
+    replaced by seeding the job store and applications are skipped.
+    Returns seconds and jobs/min per stage and LLM calls and tokens per job.
+    """
+    with open(profile_path, 'r') as f:
+        profile = yaml.safe_load(f)
+    workdir = workdir or tempfile.mkdtemp(prefix="autoapply-bench-")
+    site = FakeLinkedIn(total_jobs=jobs)
+    llm = StubLLM(latency=llm_latency)
+    site_url, llm_url = site.start(), llm.start()
+    stages = _Stages()
+    env = {"LINKEDIN_EMAIL": "bench@example.com", "LINKEDIN_PASSWORD": "bench", "OPENAI_API_KEY": "sk-bench"}
+    try:
+        with _environment(env), _working_directory(workdir):
+            config = bench_config(profile, workdir, site_url, llm_url)
+            store = get_job_store(config)
+            if browser:
+                with stages.stage("scrape") as stage:
+                    stage["jobs"] = linkedin_scraper(config)
+            else:
+                with stages.stage("seed") as stage:
+                    store.record_jobs(dict(job, url=site.job_url(job['job_id'])) for job in site.jobs)
+                    stage["jobs"] = len(site.jobs)
+
+            with stages.stage("filter") as stage:
+                filtered = filter_jobs(config)
+                stage["jobs"] = 0 if filtered is None else len(filtered)
+            if filtered is None or filtered.empty:
+                raise RuntimeError("The filter kept no jobs from the fake site.")
+            easy_apply_jobs = filtered[filtered['is_easy_apply'].str.lower() == 'yes'].copy()
+
+            with stages.stage("rank") as stage:
+                ranked = rank_jobs(config, easy_apply_jobs)
+                stage["jobs"] = len(ranked)
+
+            with stages.stage("materials") as stage:
+                stage["jobs"] = prepare_materials(config, get_ai_client(config), ranked, store)
+
+            if browser:
+                to_apply = ranked.head(apply_limit) if apply_limit else ranked
+                applied = 0
+                with stages.stage("apply") as stage:
+                    with BrowserPool.from_config(config) as pool:
+                        for _, job in to_apply.iterrows():
+                            with job_context(job_id_for(job)):
+                                applied += bool(apply_to_job_agent(config, {"url": job['url'], "title": job['title']}, config['resume_path'], pool))
+                    stage["jobs"] = applied
+                stages.results["apply"]["attempted"] = len(to_apply)
+
+            usage = get_usage_log(config).summary()
+    finally:
+        site.stop()
+        llm.stop()
+
+    return {
+        "jobs": jobs,
+        "llm_latency_s": llm_latency,
+        "browser": browser,
+        "stages": stages.results,
+        "llm": {
+            "calls": usage['calls'],
+            "errors": usage['errors'],
+            "calls_per_job": round(usage['calls_per_job'], 2),
+            "tokens_per_job": round(usage['tokens_per_job'], 1),
+            "p50_latency_s": usage['p50_latency_s'],
+            "p95_latency_s": usage['p95_latency_s'],
+            "calls_by_site": {site_name: stats['calls'] for site_name, stats in usage['by_site'].items()},
+        },
+        "stub_llm_requests": llm.requests,
+        "site_requests": site.requests,
+        "workdir": workdir,
+    }
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    """
+    Regressions of `report` against `baseline`: stages that got more than
+    `tolerance` (and MIN_REGRESSION_SECONDS) slower, and more LLM calls
+    or tokens per job.
+    """
+    regressions = []
+    for name, stage in report['stages'].items():
+        before = (baseline.get('stages') or {}).get(name)
+        if before and stage['seconds'] > max(before['seconds'] * (1 + tolerance), before['seconds'] + MIN_REGRESSION_SECONDS):
+            regressions.append(f"{name}: {stage['seconds']:.2f}s vs {before['seconds']:.2f}s")
+    for figure in COMPARED_LLM_FIGURES:
+        now, before = report['llm'][figure], (baseline.get('llm') or {}).get(figure)
+        if before and now > before * (1 + tolerance):
+            regressions.append(f"LLM {figure}: {now} vs {before}")
+    return regressions
+
+def print_report(report: Dict[str, Any]) -> None:
+    print("\n--- Benchmark Report ---")
+    print(f"{report['jobs']} job(s), stub LLM latency {report['llm_latency_s']}s, browser stages {'on' if report['browser'] else 'off'}")
+    for name, stage in report['stages'].items():
+        print(f"  -> {name:<10} {stage['seconds']:8.2f}s  {stage['jobs']:5} job(s)  {stage['jobs_per_min']:8.1f} jobs/min")
+    llm = report['llm']
+    print(
+        f"  -> LLM: {llm['calls']} call(s), {llm['calls_per_job']} per job, {llm['tokens_per_job']:.0f} tokens per job, "
+        f"p50 {llm['p50_latency_s']:.3f}s, p95 {llm['p95_latency_s']:.3f}s"
+    )
+    for site_name, calls in llm['calls_by_site'].items():
+        print(f"  -> {site_name}: {calls} call(s)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark against a fake LinkedIn and a stub LLM")
+    parser.add_argument("--jobs", type=int, default=50, help="Job postings on the fake site")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the stub LLM takes per call")
+    parser.add_argument("--no-browser", action="store_true", help="Skip the Chrome stages (scrape and apply)")
+    parser.add_argument("--apply-limit", type=int, default=10, help="Jobs to apply to (0 = all)")
+    parser.add_argument("--workdir", help="Directory for the run's files (default: a new temporary directory)")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Fail if slower or more LLM-hungry than this earlier report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression against the baseline (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run_bench(args.jobs, args.llm_latency, browser=not args.no_browser, apply_limit=args.apply_limit, workdir=args.workdir)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.output}")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  -> {regression}")
+            return 1
+        print("✅ No regressions against the baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
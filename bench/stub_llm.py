@@ -0,0 +1,195 @@
+# bench/stub_llm.py
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from tokens import count_tokens
+
+# One line of the form as serialize_form/pack_form renders it:
+# `agent-id tag[type] "label" ...`.
+FORM_LINE = re.compile(r'^(?P<agent_id>\S+) (?P<tag>\w+)(?:\[(?P<type>\w+)\])? (?P<label>"(?:[^"\\]|\\.)*")(?P<rest>.*)$')
+QUESTION = re.compile(r'question=("(?:[^"\\]|\\.)*")')
+VALUE = re.compile(r'value=("(?:[^"\\]|\\.)*")')
+OPTIONS = re.compile(r'options=(\[.*?\])(?: \(\+\d+ more\))?(?: required)?$')
+
+COVER_LETTER = (
+    "Dear Hiring Manager,\n\nI am excited to apply for this role. For the last five years I have built and "
+    "run web services in Ruby on Rails and React, serving over a million requests a day.\n\n"
+    "I would welcome the chance to discuss how my experience can help your team.\n\nSincerely,\nJohn Doe"
+)
+ANSWER = "In my last role I broke a two-week payment integration into small tasks and shipped it on time with no incidents."
+
+def _form_fields(form_text: str) -> List[Dict[str, Any]]:
+    fields = []
+    for line in form_text.splitlines():
+        match = FORM_LINE.match(line.strip())
+        if not match:
+            continue
+        rest = match.group('rest')
+        question, value, options = QUESTION.search(rest), VALUE.search(rest), OPTIONS.search(rest)
+        fields.append({
+            "agent_id": match.group('agent_id'),
+            "tag": match.group('tag'),
+            "type": match.group('type') or "",
+            "label": json.loads(match.group('label')),
+            "question": json.loads(question.group(1)) if question else "",
+            "value": json.loads(value.group(1)) if value else "",
+            "checked": " checked" in rest,
+            "options": json.loads(options.group(1)) if options else [],
+        })
+    return fields
+
+def form_actions(prompt: str) -> List[str]:
+    """
+    What a sensible agent would do with the form in an application prompt:
+    fill every empty field, then move to the next step or submit.
+    """
+    personal_data = {}
+    data = re.search(r"--- PERSONAL DATA ---\n(.*?)\nHere is the current state", prompt, re.S)
+    if data:
+        personal_data = json.loads(data.group(1))
+    form = prompt.split("--- FORM ---\n", 1)[1]
+    fields = _form_fields(form)
+
+    actions, answered = [], set()
+    for field in fields:
+        if field['tag'] == 'button' or field['tag'] == 'a':
+            continue
+        if field['type'] == 'radio':
+            group = field['question'] or field['label']
+            if group in answered or any(f['checked'] for f in fields if f['type'] == 'radio' and (f['question'] or f['label']) == group):
+                continue
+            answered.add(group)
+            actions.append(f"CLICK {field['agent_id']}")
+        elif field['type'] == 'file' and not field['value']:
+            actions.append(f"UPLOAD {field['agent_id']} {personal_data.get('resume_path', 'resume.pdf')}")
+        elif field['tag'] == 'select' and not field['value'] and field['options']:
+            actions.append(f"SELECT {field['agent_id']} {field['options'][-1]}")
+        elif field['tag'] in ('input', 'textarea') and field['type'] not in ('checkbox', 'file') and not field['value']:
+            text = field['label'].lower()
+            value = "5" if "year" in text else personal_data.get('phone', "") if "phone" in text else "Yes"
+            actions.append(f"TYPE {field['agent_id']} {value}")
+    # Clicks end a plan, so radio buttons go last among the fields.
+    actions.sort(key=lambda action: action.startswith("CLICK"))
+    buttons = [f for f in fields if f['tag'] == 'button']
+    submit = next((f for f in buttons if "submit" in f['label'].lower()), None)
+    if submit:
+        actions.append(f"SUBMIT {submit['agent_id']}")
+    elif buttons:
+        actions.append(f"CLICK {buttons[-1]['agent_id']}")
+    else:
+        actions.append("FAIL No button on the form")
+    return actions
+
+def reply_for(request: Dict[str, Any]) -> Dict[str, Any]:
+    """The assistant message the stub answers a chat completion request with."""
+    prompt = "".join(str(m.get('content') or "") for m in request.get('messages') or [])
+    if request.get('tools'):
+        function = request['tools'][0]['function']['name']
+        arguments = {
+            "tailored_summary": "Software Engineer with 5 years of building scalable web services for the requirements in this role.",
+            "tailored_work_experience": [{
+                "company": "Innovate Inc.", "role": "Software Engineer", "dates": "Jan 2021 - Present",
+                "rewritten_responsibilities": ["Built RESTful APIs serving over 1 million daily requests.", "Raised test coverage of critical services to 95%."],
+            }],
+        }
+        return {
+            "role": "assistant", "content": None,
+            "tool_calls": [{"id": "call_bench", "type": "function", "function": {"name": function, "arguments": json.dumps(arguments)}}],
+        }
+    if "--- FORM ---" in prompt:
+        actions = form_actions(prompt)
+        return {"role": "assistant", "content": "\n".join(actions if "one action per line" in prompt else actions[:1])}
+    if "career coach" in prompt:
+        return {"role": "assistant", "content": ANSWER}
+    if "scroll a LinkedIn job search page" in prompt:
+        return {"role": "assistant", "content": "STOP"}
+    return {"role": "assistant", "content": COVER_LETTER}
+
+class _Server(ThreadingHTTPServer):
+    # Room for a burst of concurrent connections from an async client.
+    request_queue_size = 256
+    daemon_threads = True
+
+class StubLLM:
+    """
+    A local OpenAI-compatible chat completions server for benchmarks and
+    tests. Every request waits `latency` seconds, like a real API call,
+    and is answered with canned but well-formed content and a usage block.
+    `peak_in_flight` is the most requests it was answering at once.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real API.
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not self.path.rstrip('/').endswith("/chat/completions"):
+                    return self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                request = json.loads(body)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                message = reply_for(request)
+                prompt_tokens = count_tokens("".join(str(m.get('content') or "") for m in request.get('messages') or []))
+                completion = message['content'] or "".join(c['function']['arguments'] for c in message.get('tool_calls', []))
+                completion_tokens = count_tokens(completion)
+                self._send_json(200, {
+                    "id": f"chatcmpl-bench-{stub.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get('model', "stub"),
+                    "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if message.get('tool_calls') else "stop"}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+                })
+
+        return Handler
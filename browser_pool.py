@@ -0,0 +1,200 @@
+# browser_pool.py
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common.exceptions import WebDriverException
+
+from session_store import SessionStore, ensure_logged_in
+from tracing import trace_driver
+
+def create_driver(headless: bool = False) -> WebDriver:
+    """Starts a new Chrome instance."""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    driver = trace_driver(webdriver.Chrome(options=options))
+    if not headless:
+        driver.maximize_window()
+    return driver
+
+def is_session_healthy(driver: WebDriver) -> bool:
+    """
+    Cheap liveness probe: one script round-trip and at least one open window.
+    A crashed or disconnected Chrome raises here instead of mid-job.
+    """
+    try:
+        driver.execute_script("return 1;")
+        return len(driver.window_handles) > 0
+    except WebDriverException:
+        return False
+
+def reset_session(driver: WebDriver) -> None:
+    """Closes every extra tab and leaves the driver on a blank main tab."""
+    handles = driver.window_handles
+    main_handle = handles[0]
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(main_handle)
+    driver.get("about:blank")
+
+class BrowserPool:
+    """
+    A fixed-size pool of logged-in Chrome sessions.
+
+    Sessions are created lazily, handed out with `session()` and reset to a
+    clean tab when they come back. Sessions that fail the health check or
+    have served `max_jobs_per_session` jobs are quit and replaced.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        headless: bool = False,
+        max_jobs_per_session: int = 25,
+        session_store: Optional[SessionStore] = None
+    ):
+        self.size = max(1, size)
+        self.headless = headless
+        self.max_jobs_per_session = max_jobs_per_session
+        self.session_store = session_store
+        # Idle drivers, plus a None whenever a slot frees up, so that a caller
+        # blocked in acquire() wakes up and starts a replacement session.
+        self._idle: "queue.Queue[Optional[WebDriver]]" = queue.Queue()
+        self._uses: Dict[int, int] = {}
+        self._drivers: List[WebDriver] = []
+        self._lock = threading.Lock()
+        self._starting = 0
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "BrowserPool":
+        """Builds a pool from the optional `browser` section of profile.yml."""
+        browser_config = config.get('browser') or {}
+        return cls(
+            size=browser_config.get('pool_size', 1),
+            headless=browser_config.get('headless', False),
+            max_jobs_per_session=browser_config.get('max_jobs_per_session', 25),
+            session_store=SessionStore.from_config(config),
+        )
+
+    def _start_session(self) -> WebDriver:
+        print("🌐 Starting a new browser session for the pool...")
+        driver = create_driver(self.headless)
+        try:
+            ensure_logged_in(driver, self.session_store)
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    def _discard(self, driver: WebDriver) -> None:
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._uses.pop(id(driver), None)
+        self._idle.put(None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Returns a healthy, logged-in driver. Blocks until one is free when
+        the pool is at capacity.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed.")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_grow = len(self._drivers) + self._starting < self.size
+                    if can_grow:
+                        # Reserve the slot before the slow start-up so that
+                        # concurrent callers don't overshoot the pool size.
+                        self._starting += 1
+                if can_grow:
+                    try:
+                        driver = self._start_session()
+                    except Exception:
+                        self._idle.put(None)
+                        raise
+                    finally:
+                        with self._lock:
+                            self._starting -= 1
+                    with self._lock:
+                        self._drivers.append(driver)
+                        self._uses[id(driver)] = 0
+                    return driver
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                driver = self._idle.get(timeout=remaining)
+
+            if driver is None:
+                # A slot was freed; go round and start a session in it.
+                continue
+            if is_session_healthy(driver):
+                return driver
+            print("♻️  Browser session is stale. Recycling it...")
+            self._discard(driver)
+
+    def release(self, driver: WebDriver, healthy: bool = True) -> None:
+        """Resets the driver and puts it back, or recycles it if it is worn out."""
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            worn_out = self._uses[id(driver)] >= self.max_jobs_per_session
+        if self._closed or not healthy or worn_out:
+            self._discard(driver)
+            return
+        try:
+            reset_session(driver)
+        except WebDriverException:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Context manager around acquire/release."""
+        driver = self.acquire(timeout=timeout)
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy=healthy and is_session_healthy(driver))
+
+    def close(self) -> None:
+        """Quits every browser owned by the pool."""
+        self._closed = True
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers = []
+            self._uses.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        if drivers:
+            print(f"Closed {len(drivers)} pooled browser session(s).")
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,188 @@
+# dedupe.py
+
+import re
+import sqlite3
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Mersenne prime for the universal hash family (a * x + b) mod p. With
+# a, b < p and x < 2^32, a * x fits comfortably in 64 bits.
+_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r"\w+")
+# Scraped descriptions start with LinkedIn page chrome (poster, applicant
+# counts, buttons) that differs between reposts; the posting itself follows.
+_BODY_MARKER = "about the job"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    parent TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    band_key BLOB NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (band, band_key);
+"""
+
+def shingles(text: str, size: int = 5) -> List[int]:
+    """
+    Hashes the overlapping `size`-word shingles of the job body to 32-bit
+    ints. A body shorter than `size` words has none.
+    """
+    text = str(text or "").lower()
+    marker = text.find(_BODY_MARKER)
+    if marker != -1:
+        text = text[marker + len(_BODY_MARKER):]
+    words = _WORD_RE.findall(text)
+    return list({zlib.crc32(" ".join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)})
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Picks (bands, rows) with bands * rows == num_perm whose LSH threshold,
+    (1 / bands) ** (1 / rows), is the highest one not above `threshold`, so
+    true duplicates are rarely missed and candidates are then verified.
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold]
+    return max(below or options[-1:], key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+class NearDuplicateIndex:
+    """
+    Finds near-duplicate job postings with MinHash signatures and an LSH
+    index.
+
+    Each description is reduced to a `num_perm`-value MinHash signature of
+    its word shingles. Signatures are split into bands and bucketed, so a
+    new posting is only compared with postings sharing a bucket, never with
+    the whole archive. Candidates whose estimated Jaccard similarity reaches
+    `threshold` are merged into one cluster (union-find), whose
+    representative is the first posting added.
+
+    Signatures, buckets and clusters live in SQLite: in memory by default,
+    or in the file at `path`, so indexing a large archive does not hold
+    them all in the process.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5, seed: int = 1, path: str = ":memory:"):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.path = path
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+        self._conn = sqlite3.connect(path)
+        # A scratch index: nothing in it needs to survive a crash.
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.executescript(SCHEMA)
+        self._size = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], path: str = ":memory:") -> Optional["NearDuplicateIndex"]:
+        """Builds an index from the `dedupe` section of profile.yml, or None if disabled."""
+        dedupe_config = config.get('dedupe') or {}
+        if not dedupe_config.get('enabled', True):
+            return None
+        return cls(
+            threshold=dedupe_config.get('threshold', 0.8),
+            num_perm=dedupe_config.get('num_perm', 128),
+            shingle_size=dedupe_config.get('shingle_size', 5),
+            path=path,
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        return self._minhash(shingles(text, self.shingle_size))
+
+    def _minhash(self, shingle_hashes: List[int]) -> np.ndarray:
+        hashes = np.array(shingle_hashes, dtype=np.uint64) % _PRIME
+        if hashes.size == 0:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _parent(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT parent FROM postings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _position(self, key: str) -> int:
+        return self._conn.execute("SELECT position FROM postings WHERE key = ?", (key,)).fetchone()[0]
+
+    def _root(self, key: str) -> str:
+        path = []
+        parent = self._parent(key)
+        while parent != key:
+            path.append(key)
+            key, parent = parent, self._parent(parent)
+        self._conn.executemany("UPDATE postings SET parent = ? WHERE key = ?", [(key, member) for member in path[:-1]])
+        return key
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Indexes a posting. Returns the representative of the cluster it
+        joined if it is a near-duplicate of an earlier posting, else None.
+        Postings with fewer than `shingle_size` words are too short to
+        compare, so they are never indexed or reported as duplicates.
+        """
+        if self._parent(key) is not None:
+            root = self._root(key)
+            return root if root != key else None
+        shingle_hashes = shingles(text, self.shingle_size)
+        if not shingle_hashes:
+            return None
+        signature = self._minhash(shingle_hashes)
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        candidates = {
+            other
+            for band, band_key in enumerate(band_keys)
+            for (other,) in self._conn.execute("SELECT key FROM buckets WHERE band = ? AND band_key = ?", (band, band_key))
+        }
+
+        representative = None
+        for other in candidates:
+            (blob,) = self._conn.execute("SELECT signature FROM postings WHERE key = ?", (other,)).fetchone()
+            if float(np.mean(np.frombuffer(blob, dtype=np.uint64) == signature)) >= self.threshold:
+                root = self._root(other)
+                if representative is None:
+                    representative = root
+                elif root != representative:
+                    # The new posting bridges two clusters: keep the older representative.
+                    older, newer = sorted((representative, root), key=self._position)
+                    self._conn.execute("UPDATE postings SET parent = ? WHERE key = ?", (older, newer))
+                    representative = older
+
+        self._conn.execute(
+            "INSERT INTO postings (key, position, parent, signature) VALUES (?, ?, ?, ?)",
+            (key, self._size, representative or key, signature.tobytes()),
+        )
+        self._size += 1
+        self._conn.executemany(
+            "INSERT INTO buckets (band, band_key, key) VALUES (?, ?, ?)",
+            [(band, band_key, key) for band, band_key in enumerate(band_keys)],
+        )
+        self._conn.commit()
+        return representative
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Returns {representative: [members, representative first]} for clusters with more than one posting."""
+        groups: Dict[str, List[str]] = {}
+        for (key,) in self._conn.execute("SELECT key FROM postings ORDER BY position").fetchall():
+            groups.setdefault(self._root(key), []).append(key)
+        return {root: members for root, members in groups.items() if len(members) > 1}
+
+    def close(self) -> None:
+        self._conn.close()
+
+def find_near_duplicates(jobs: Iterable[Tuple[str, str]], index: NearDuplicateIndex) -> Dict[str, str]:
+    """Adds (key, description) pairs in order and returns {duplicate key: representative key}."""
+    duplicates = {}
+    for key, text in jobs:
+        representative = index.add(key, text)
+        if representative is not None:
+            duplicates[key] = representative
+    return duplicates
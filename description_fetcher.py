@@ -0,0 +1,91 @@
+# description_fetcher.py
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from browser_pool import BrowserPool, is_session_healthy
+from session_store import SessionStore, LINKEDIN_BASE_URL, linkedin_base_url, is_logged_out, ensure_logged_in
+from waits import wait_for, wait_timeout, job_view_description
+
+def job_view_url(job_id: str, base_url: str = LINKEDIN_BASE_URL) -> str:
+    return f"{base_url}/jobs/view/{job_id}/"
+
+def fetch_description(driver: Any, config: Dict[str, Any], job_id: str, retries: int = 2,
+                      session_store: Optional[SessionStore] = None) -> Optional[str]:
+    """
+    Loads a job's /jobs/view/<id>/ page and returns its description text,
+    retrying up to `retries` more times. Returns None if it never loads.
+    Pass the pool's `session_store` so that workers landing on a logged-out
+    page share one session restore or login.
+    """
+    session_store = session_store or SessionStore.from_config(config)
+    url = job_view_url(job_id, linkedin_base_url(config))
+    for attempt in range(retries + 1):
+        try:
+            driver.get(url)
+            if is_logged_out(driver):
+                ensure_logged_in(driver, session_store)
+                driver.get(url)
+            pane = wait_for(driver, job_view_description, wait_timeout(config, 'description'), "description")
+            if pane is not None:
+                return pane.text.strip()
+        except WebDriverException as e:
+            print(f"  -> Attempt {attempt + 1} to load job {job_id} failed: {e}")
+        if attempt < retries:
+            time.sleep(0.5 * (attempt + 1))
+    return None
+
+def fetch_descriptions(jobs: List[Dict[str, Any]], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Fills in the description of each job (which must have a `job_id`) by
+    loading the job pages in parallel on a pool of headless browsers that
+    share the saved LinkedIn session. Returns the jobs whose description
+    could be loaded, in their original order.
+    """
+    if not jobs:
+        return []
+    scraper_config = config.get('scraper') or {}
+    workers = max(1, min(scraper_config.get('description_workers', 3), len(jobs)))
+    retries = scraper_config.get('description_retries', 2)
+    print(f"\n📄 Fetching {len(jobs)} job descriptions with {workers} parallel browser(s)...")
+
+    pool = BrowserPool(size=workers, headless=True, session_store=SessionStore.from_config(config))
+    pending: "queue.Queue" = queue.Queue()
+    for index, job in enumerate(jobs):
+        pending.put((index, job))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
+    def worker():
+        # Each worker keeps one browser for as long as it stays healthy,
+        # instead of resetting it between jobs.
+        while not pending.empty():
+            try:
+                with pool.session() as driver:
+                    while is_session_healthy(driver):
+                        try:
+                            index, job = pending.get_nowait()
+                        except queue.Empty:
+                            return
+                        description = fetch_description(driver, config, job['job_id'], retries, session_store=pool.session_store)
+                        if description is None:
+                            print(f"  -> Could not load description for: {job['title']}")
+                            continue
+                        print(f"  -> Scraped: {job['title']} (Easy Apply: {job['is_easy_apply']})")
+                        results[index] = dict(job, description=description)
+            except Exception as e:
+                print(f"❌ Description worker lost its browser: {e}")
+                return
+
+    try:
+        threads = [threading.Thread(target=worker, name=f"description-{n + 1}", daemon=True) for n in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        pool.close()
+    return [job for job in results if job is not None]
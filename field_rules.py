@@ -0,0 +1,179 @@
+# field_rules.py
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Set
+
+from bs4 import BeautifulSoup
+
+from ai_agent import INTERACTIVE_TAGS, describe_element
+
+# Inputs that never need to be filled in.
+IGNORED_INPUT_TYPES = ("hidden", "submit", "button", "reset", "image")
+
+class FieldRule(ABC):
+    """
+    A deterministic handler for a common Easy Apply form element.
+
+    Subclasses implement `action`, which returns an agent command such as
+    `TYPE agent-3 555-123-4567` for a field it recognises, or None. Field
+    rules only see fields that are still empty; button rules (with
+    `is_button = True`) only run once no required field is left empty.
+    """
+
+    name = "rule"
+    is_button = False
+
+    def __init__(self):
+        self.llm_calls_avoided = 0
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def action(self, field: Dict[str, Any], context: Dict[str, Any]) -> Optional[str]:
+        """The agent command for `field`, or None if this rule doesn't handle it."""
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.llm_calls_avoided += 1
+
+def _text(field: Dict[str, Any]) -> str:
+    return f"{field['label']} {field['name']}".lower()
+
+class PhoneRule(FieldRule):
+    name = "phone"
+
+    def action(self, field, context):
+        if field['tag'] != 'input' or not context.get('phone'):
+            return None
+        text = _text(field)
+        if field['type'] == 'tel' or (field['type'] in ('', 'text') and ('phone' in text or 'mobile' in text) and 'code' not in text):
+            return f"TYPE {field['agent_id']} {context['phone']}"
+        return None
+
+class EmailRule(FieldRule):
+    name = "email"
+
+    def action(self, field, context):
+        email = context.get('email')
+        if not email or 'email' not in _text(field):
+            return None
+        if field['tag'] == 'select':
+            option = next((o for o in field['options'] if o.lower() == email.lower()), None)
+            return f"SELECT {field['agent_id']} {option}" if option else None
+        if field['tag'] == 'input' and field['type'] in ('', 'text', 'email'):
+            return f"TYPE {field['agent_id']} {email}"
+        return None
+
+class CountryCodeRule(FieldRule):
+    name = "phone_country_code"
+
+    def action(self, field, context):
+        country = context.get('phone_country_code')
+        if field['tag'] != 'select' or not country or 'country code' not in _text(field):
+            return None
+        option = next((o for o in field['options'] if country.lower() in o.lower()), None)
+        return f"SELECT {field['agent_id']} {option}" if option else None
+
+class ResumeUploadRule(FieldRule):
+    name = "resume_upload"
+
+    def action(self, field, context):
+        if field['tag'] != 'input' or field['type'] != 'file' or not context.get('resume_path'):
+            return None
+        text = _text(field)
+        if 'cover' in text:
+            return None
+        if 'resume' in text or ' cv' in f" {text}" or 'pdf' in field['accept'].lower():
+            return f"UPLOAD {field['agent_id']} {context['resume_path']}"
+        return None
+
+class NextStepButtonRule(FieldRule):
+    name = "next_step_button"
+    is_button = True
+    LABELS = ("continue to next step", "next", "review your application", "review")
+
+    def action(self, field, context):
+        if field['tag'] == 'button' and field['label'].lower() in self.LABELS:
+            return f"CLICK {field['agent_id']}"
+        return None
+
+class SubmitButtonRule(FieldRule):
+    name = "submit_button"
+    is_button = True
+
+    def action(self, field, context):
+        if field['tag'] == 'button' and field['label'].lower() in ("submit application", "submit"):
+            return f"SUBMIT {field['agent_id']}"
+        return None
+
+_RULES: List[FieldRule] = [
+    PhoneRule(), EmailRule(), CountryCodeRule(), ResumeUploadRule(), NextStepButtonRule(), SubmitButtonRule()
+]
+
+def register_rule(rule: FieldRule) -> FieldRule:
+    """Adds a custom rule. Field rules registered later are tried last."""
+    _RULES.append(rule)
+    return rule
+
+def get_rules() -> List[FieldRule]:
+    return list(_RULES)
+
+def is_unfilled(field: Dict[str, Any], fields: List[Dict[str, Any]]) -> bool:
+    """True for a fillable form field that has no value yet."""
+    if field['tag'] not in ('input', 'select', 'textarea') or field['type'] in IGNORED_INPUT_TYPES:
+        return False
+    if field['type'] == 'checkbox':
+        return False
+    if field['type'] == 'radio':
+        group = [f for f in fields if f['type'] == 'radio' and f['name'] == field['name']]
+        return not any(f['checked'] for f in group)
+    return not field['value']
+
+def next_rule_action(simplified_html: BeautifulSoup, context: Dict[str, Any], attempted: Set[Any]) -> Optional[str]:
+    """
+    Returns the next action a rule can take on the current form step, or
+    None when the step needs the LLM.
+
+    `attempted` is owned by the caller and persists across cycles. An action
+    proposed again for an unchanged form had no effect the first time, so
+    it is skipped and the field is left to the LLM.
+    """
+    fields = [describe_element(tag, simplified_html) for tag in simplified_html.find_all(INTERACTIVE_TAGS) if tag.get('agent-id')]
+    form_state = tuple((f['agent_id'], f['value'], f['checked']) for f in fields)
+    unfilled = [f for f in fields if is_unfilled(f, fields)]
+
+    def propose(rule, field):
+        action = rule.action(field, context)
+        if action is None or (action, form_state) in attempted:
+            return None
+        attempted.add((action, form_state))
+        rule.record_hit()
+        print(f"⚡ Rule '{rule.name}' handled '{field['label'] or field['agent_id']}' without the LLM: {action}")
+        return action
+
+    for field in unfilled:
+        for rule in _RULES:
+            if not rule.is_button:
+                action = propose(rule, field)
+                if action:
+                    return action
+
+    if any(f['required'] for f in unfilled):
+        return None
+    for field in fields:
+        for rule in _RULES:
+            if rule.is_button:
+                action = propose(rule, field)
+                if action:
+                    return action
+    return None
+
+def print_rule_report() -> None:
+    """Prints how many LLM calls each rule has avoided in this run."""
+    hits = [(rule.name, rule.llm_calls_avoided) for rule in _RULES if rule.llm_calls_avoided]
+    if not hits:
+        return
+    print("\n--- Form Rule Report ---")
+    for name, count in hits:
+        print(f"  -> {name}: {count} LLM call(s) avoided")
+    print(f"  -> Total: {sum(count for _, count in hits)} LLM call(s) avoided")
@@ -1,14 +1,19 @@
 # file_generator.py
 
-def save_job_materials(job_title, company_name, tailored_resume_json, cover_letter_text):
+def save_job_materials(job_title, company_name, tailored_resume_json, cover_letter_text, job_id=None):
     """
-    Saves the tailored resume and cover letter to text files.
+    Saves the tailored resume and cover letter to text files. With a
+    `job_id` it goes into the filenames, so that two jobs at one company
+    whose titles start with the same word don't overwrite each other.
     """
     # Sanitize company name for use in filenames
     safe_company_name = "".join(x for x in company_name if x.isalnum())
+    stem = f"{safe_company_name}_{job_title.split(' ')[0]}"
+    if job_id:
+        stem += "_" + "".join(x for x in str(job_id) if x.isalnum())
     
-    resume_filename = f"output/{safe_company_name}_{job_title.split(' ')[0]}_Resume.txt"
-    cover_letter_filename = f"output/{safe_company_name}_{job_title.split(' ')[0]}_Cover_Letter.txt"
+    resume_filename = f"output/{stem}_Resume.txt"
+    cover_letter_filename = f"output/{stem}_Cover_Letter.txt"
 
     print(f"\n💾 Saving materials...")
     try:
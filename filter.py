@@ -1,53 +1,178 @@
 # filter.py
 
+import argparse
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, Optional
+
 import pandas as pd
+import yaml
+
+from dedupe import NearDuplicateIndex
+from filter_engine import FilterEngine
+from job_store import JOB_FIELDS, JobStore, get_job_store, job_id_for
+
+FILTERED_FILE = "filtered_jobs.csv"
+REJECTIONS_FILE = "filter_rejections.jsonl"
+# Kept jobs a streaming filter run loads for ranking and applying.
+MAX_KEPT = 10000
 
 def filter_jobs(config):
     """
-    Reads the scraped jobs, filters them based on exclusion keywords,
-    and returns a clean DataFrame of jobs to apply for.
+    Reads the active jobs from the job store, filters them based on
+    exclusion keywords, records each decision in the store and returns a
+    clean DataFrame of jobs to apply for.
+
+    With `filter.streaming` enabled in profile.yml the jobs are filtered in
+    chunks instead (see `stream_filter`), and only the `filter.max_kept`
+    most recently seen kept jobs are loaded into the returned DataFrame.
+    All of them are in the output CSV and the store.
     """
-    try:
-        df = pd.read_csv('scraped_jobs.csv')
-        print(f"📄 Found {len(df)} jobs in scraped_jobs.csv")
-    except FileNotFoundError:
-        print("❌ scraped_jobs.csv not found. Please run the scraper first.")
+    store = get_job_store(config)
+    if store.count_jobs() == 0 and store.import_csv('scraped_jobs.csv'):
+        print("📥 Imported jobs from scraped_jobs.csv into the job store.")
+    if store.count_active_jobs() == 0:
+        print("❌ No jobs in the job store. Please run the scraper first.")
         return None
+    filter_config = config.get('filter') or {}
+    if filter_config.get('streaming'):
+        stats = stream_filter(config, store=store)
+        max_kept = filter_config.get('max_kept', MAX_KEPT)
+        if stats['kept'] > max_kept:
+            print(f"⚠️  Loading the {max_kept} most recently seen of {stats['kept']} kept jobs (filter.max_kept).")
+        return pd.DataFrame(store.kept_jobs(limit=max_kept), columns=list(JOB_FIELDS))
+    df = pd.DataFrame(store.active_jobs(), columns=list(JOB_FIELDS))
+    print(f"📄 Found {len(df)} jobs in {store.path}")
+
+    # Compile the exclusion/inclusion keywords once and evaluate them over
+    # whole columns, rather than row by row
+    engine = FilterEngine.from_config(config)
+    keywords = [rule.keyword for rule in engine.rules]
+    print(f"Filtering based on {len(keywords)} keywords: {', '.join(keywords)}")
 
-    # Get exclusion keywords from config, convert to lowercase for case-insensitive matching
-    exclusion_keywords = [k.lower() for k in config['job_search_criteria']['exclusion_keywords']]
-    
-    print(f"Filtering based on {len(exclusion_keywords)} exclusion keywords: {', '.join(exclusion_keywords)}")
-
-    # Keep track of jobs that are filtered out and why
-    filtered_out_jobs = []
-
-    def is_excluded(row):
-        # Combine title and description for a comprehensive check
-        text_to_check = (str(row['title']) + ' ' + str(row['description'])).lower()
-        for keyword in exclusion_keywords:
-            if keyword in text_to_check:
-                filtered_out_jobs.append({
-                    "title": row['title'],
-                    "reason": f"Contains excluded keyword: '{keyword}'"
-                })
-                return True # Exclude this row
-        return False # Do not exclude this row
-
-    # Apply the filter function
-    # The ~ operator inverts the boolean mask, so we keep rows where is_excluded is False.
     original_count = len(df)
-    df_filtered = df[~df.apply(is_excluded, axis=1)]
+    decisions = engine.evaluate(df)
+    dedupe_index = NearDuplicateIndex.from_config(config)
+    if dedupe_index is not None:
+        duplicates = drop_near_duplicates(df, decisions, dedupe_index)
+        print(f"Found {duplicates} near-duplicate repost(s).")
+    df = df.assign(matched_keywords=decisions['matched_keywords'])
+    df_filtered = df[decisions['kept']]
     
     print("\n--- Filtering Report ---")
-    for job in filtered_out_jobs:
-        print(f"  -> Rejected: '{job['title']}' (Reason: {job['reason']})")
+    for title, reason in zip(df['title'][~decisions['kept']], decisions['reason'][~decisions['kept']]):
+        print(f"  -> Rejected: '{title}' (Reason: {reason})")
     
     print(f"\n✅ Filtering complete. Kept {len(df_filtered)} out of {original_count} jobs.")
 
-    # Save the good jobs to a new CSV
-    if not df_filtered.empty:
-        df_filtered.to_csv('filtered_jobs.csv', index=False)
-        print("✅ Filtered jobs saved to filtered_jobs.csv")
+    # Record every decision in the job store
+    store.record_filter_decisions(zip(df['job_id'], decisions['kept'].tolist(), decisions['reason'].tolist()))
+    print(f"✅ Filter decisions saved to {store.path}")
     
-    return df_filtered
\ No newline at end of file
+    return df_filtered
+
+def drop_near_duplicates(df: pd.DataFrame, decisions: pd.DataFrame, index: NearDuplicateIndex) -> int:
+    """
+    Rejects kept jobs whose description nearly matches an earlier kept job
+    (e.g. an agency repost), updating `decisions` in place. Earlier jobs,
+    including those from previous chunks added to the same `index`, stay
+    as the representative. Returns the number of duplicates rejected.
+    """
+    kept = decisions['kept']
+    duplicates = 0
+    for label, job_id, description in zip(df.index[kept], df['job_id'][kept], df['description'][kept]):
+        representative = index.add(str(job_id), description)
+        if representative is not None:
+            decisions.loc[label, 'kept'] = False
+            decisions.loc[label, 'reason'] = f"Near-duplicate of job {representative}"
+            duplicates += 1
+    return duplicates
+
+def iter_csv_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Reads a scraped jobs CSV (e.g. an archive of old scrapes) a chunk at a time."""
+    for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        if 'job_id' not in chunk:
+            chunk.insert(0, 'job_id', [job_id_for({"url": url}) for url in chunk['url']])
+        yield chunk
+
+def stream_filter(
+    config: Dict[str, Any],
+    input_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    rejections_path: Optional[str] = None,
+    store: Optional[JobStore] = None
+) -> Dict[str, int]:
+    """
+    Filters jobs a chunk at a time, so memory stays flat however large the
+    input is. Jobs are read from the job store, or from the CSV at
+    `input_path`. Kept rows are appended to the output CSV as each chunk is
+    done, and every rejection is written as one JSON line (job_id, title,
+    company, url, matched_keywords, reason) to the rejections file. When
+    reading from the store, decisions are recorded there as well.
+    Near-duplicate reposts are rejected across chunks (see dedupe.py).
+    Returns row counts.
+    """
+    filter_config = config.get('filter') or {}
+    chunk_size = filter_config.get('chunk_size', 5000)
+    output_path = output_path or filter_config.get('output', FILTERED_FILE)
+    rejections_path = rejections_path or filter_config.get('rejections_file', REJECTIONS_FILE)
+    engine = FilterEngine.from_config(config)
+    # Every kept job's signature stays in the dedupe index, so it lives in
+    # a scratch SQLite file rather than in memory.
+    scratch = tempfile.TemporaryDirectory(prefix="dedupe-")
+    dedupe_index = NearDuplicateIndex.from_config(config, path=os.path.join(scratch.name, "dedupe.db"))
+
+    if input_path:
+        chunks = iter_csv_chunks(input_path, chunk_size)
+        store = None
+        print(f"📄 Streaming jobs from {input_path} in chunks of {chunk_size}...")
+    else:
+        store = store or get_job_store(config)
+        chunks = (pd.DataFrame(chunk, columns=list(JOB_FIELDS)) for chunk in store.iter_active_jobs(chunk_size))
+        print(f"📄 Streaming jobs from {store.path} in chunks of {chunk_size}...")
+
+    stats = {"chunks": 0, "rows": 0, "kept": 0, "rejected": 0, "duplicates": 0}
+    try:
+        with open(output_path, 'w', newline='', encoding='utf-8') as output, open(rejections_path, 'w', encoding='utf-8') as rejections:
+            for chunk in chunks:
+                decisions = engine.evaluate(chunk)
+                if dedupe_index is not None:
+                    stats['duplicates'] += drop_near_duplicates(chunk, decisions, dedupe_index)
+                kept = decisions['kept']
+                chunk[kept].to_csv(output, header=stats['chunks'] == 0, index=False)
+                rejected = chunk[~kept]
+                for job_id, title, company, url, matched, reason in zip(
+                    rejected['job_id'], rejected['title'], rejected['company'], rejected['url'],
+                    decisions['matched_keywords'][~kept], decisions['reason'][~kept]
+                ):
+                    rejections.write(json.dumps({
+                        "job_id": job_id, "title": title, "company": company, "url": url,
+                        "matched_keywords": matched.split(", ") if matched else [], "reason": reason,
+                    }, ensure_ascii=False) + "\n")
+                if store is not None:
+                    store.record_filter_decisions(zip(chunk['job_id'], kept.tolist(), decisions['reason'].tolist()))
+
+                stats['chunks'] += 1
+                stats['rows'] += len(chunk)
+                stats['kept'] += int(kept.sum())
+                stats['rejected'] += len(rejected)
+                print(f"  -> Chunk {stats['chunks']}: {stats['rows']} rows read, {stats['kept']} kept so far")
+    finally:
+        if dedupe_index is not None:
+            dedupe_index.close()
+        scratch.cleanup()
+
+    print(f"\n✅ Filtering complete. Kept {stats['kept']} out of {stats['rows']} jobs ({stats['duplicates']} near-duplicates).")
+    print(f"✅ Kept jobs written to {output_path}, rejection reasons to {rejections_path}")
+    return stats
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Filter scraped jobs in bounded memory")
+    parser.add_argument("--input", help="Scraped jobs CSV to filter (defaults to the job store)")
+    parser.add_argument("--output", help=f"CSV for kept jobs (default: {FILTERED_FILE})")
+    parser.add_argument("--rejections", help=f"JSON Lines file for rejection reasons (default: {REJECTIONS_FILE})")
+    args = parser.parse_args()
+    with open('profile.yml', 'r') as file:
+        profile = yaml.safe_load(file)
+    stream_filter(profile, args.input, args.output, args.rejections)
@@ -0,0 +1,151 @@
+# filter_engine.py
+
+import re
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("title", "description")
+EXCLUDE = "exclude"
+INCLUDE = "include"
+
+class KeywordRule:
+    """
+    One keyword to look for, case-insensitively, in some fields of a job.
+
+    `fields` limits the rule to the title or the description (both by
+    default). With `word_boundary`, "lead" matches "Tech Lead" but not
+    "leading".
+    """
+
+    def __init__(self, keyword: str, kind: str = EXCLUDE, fields: Sequence[str] = FIELDS, word_boundary: bool = False):
+        if kind not in (EXCLUDE, INCLUDE):
+            raise ValueError(f"Unknown rule kind: {kind}")
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown field(s) for keyword '{keyword}': {', '.join(sorted(unknown))}")
+        if not keyword.strip():
+            raise ValueError("Empty filter keyword")
+        self.keyword = keyword.lower().replace("\n", " ")
+        self.kind = kind
+        self.fields = tuple(fields)
+        self.word_boundary = word_boundary
+
+    @classmethod
+    def from_config(cls, entry: Any, kind: str = EXCLUDE) -> "KeywordRule":
+        """
+        Builds a rule from a profile.yml entry: either a plain keyword or a
+        mapping with `keyword`, optional `field` (title, description or any)
+        and optional `word_boundary`.
+        """
+        if isinstance(entry, str):
+            return cls(entry, kind)
+        field = entry.get('field', 'any')
+        return cls(
+            str(entry['keyword']),
+            kind,
+            fields=FIELDS if field == 'any' else (field,),
+            word_boundary=bool(entry.get('word_boundary', False)),
+        )
+
+_WORD_CHAR = re.compile(r"\w")
+
+def find_rows(text: str, starts: List[int], keyword: str, word_boundary: bool = False) -> List[int]:
+    """
+    Returns the positions of the rows containing `keyword`, given the rows
+    joined by newlines into `text` and the offset at which each row starts.
+
+    `str.find` runs at C speed over the whole column. After a hit the scan
+    jumps to the next row, so every row is reported at most once.
+    """
+    rows: List[int] = []
+    check_start = word_boundary and _WORD_CHAR.match(keyword) is not None
+    check_end = word_boundary and _WORD_CHAR.match(keyword[-1]) is not None
+    size = len(keyword)
+    pos = text.find(keyword)
+    while pos != -1:
+        if (check_start and pos > 0 and _WORD_CHAR.match(text, pos - 1)) or (check_end and _WORD_CHAR.match(text, pos + size)):
+            pos = text.find(keyword, pos + 1)
+            continue
+        row = bisect_right(starts, pos) - 1
+        rows.append(row)
+        if row + 1 >= len(starts):
+            break
+        pos = text.find(keyword, starts[row + 1])
+    return rows
+
+class FilterEngine:
+    """
+    Evaluates every keyword rule over whole DataFrame columns at once.
+
+    Each field is lowercased and joined into a single string once. Every
+    keyword is then located in it with a C-level substring search, and hits
+    are mapped back to rows through the row offsets. A job is rejected if it
+    matches any exclusion rule, or if inclusion rules exist and it matches
+    none of them.
+    """
+
+    def __init__(self, rules: Iterable[KeywordRule]):
+        self.rules = list(rules)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "FilterEngine":
+        """Builds an engine from `exclusion_keywords` and `inclusion_keywords` in job_search_criteria."""
+        criteria = config.get('job_search_criteria') or {}
+        rules = [KeywordRule.from_config(entry, EXCLUDE) for entry in criteria.get('exclusion_keywords') or []]
+        rules += [KeywordRule.from_config(entry, INCLUDE) for entry in criteria.get('inclusion_keywords') or []]
+        return cls(rules)
+
+    @property
+    def has_inclusion_rules(self) -> bool:
+        return any(rule.kind == INCLUDE for rule in self.rules)
+
+    def _matches(self, columns: Dict[str, Tuple[str, List[int]]], kind: str) -> List[Tuple[str, np.ndarray]]:
+        """Returns (keyword, positions of the rows it was found in) for each rule of `kind`, in rule order."""
+        matches = []
+        for rule in self.rules:
+            if rule.kind != kind:
+                continue
+            rows = [find_rows(*columns[field], rule.keyword, rule.word_boundary) for field in rule.fields]
+            matches.append((rule.keyword, np.unique(np.concatenate(rows)).astype(np.int64)))
+        return matches
+
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns a DataFrame aligned with `df` with columns `kept` (bool),
+        `matched_keywords` (the exclusion keywords found, comma-separated in
+        config order) and `reason` (None for kept jobs).
+        """
+        columns = {}
+        for field in FIELDS:
+            values = df[field].fillna("").astype(str).str.lower() if field in df else pd.Series("", index=df.index)
+            # Keywords never contain a newline, so once rows are joined by
+            # newlines no match can span two of them.
+            starts = np.concatenate(([0], np.cumsum(values.str.len().to_numpy() + 1)[:-1]))
+            columns[field] = ("\n".join(values.tolist()), starts.tolist())
+        n = len(df)
+        kept = np.ones(n, dtype=bool)
+        matched = np.full(n, "", dtype=object)
+        reason = np.full(n, None, dtype=object)
+
+        for keyword, rows in self._matches(columns, EXCLUDE):
+            first = rows[kept[rows]]
+            reason[first] = f"Contains excluded keyword: '{keyword}'"
+            kept[rows] = False
+            matched[rows] = matched[rows] + f", {keyword}"
+        matched[~kept] = [value[2:] for value in matched[~kept]]
+
+        if self.has_inclusion_rules:
+            included = np.zeros(n, dtype=bool)
+            for _, rows in self._matches(columns, INCLUDE):
+                included[rows] = True
+            missing = kept & ~included
+            reason[missing] = "Contains none of the inclusion keywords"
+            kept &= ~missing
+        return pd.DataFrame({
+            "kept": kept,
+            "matched_keywords": pd.Series(matched, index=df.index, dtype=object),
+            "reason": pd.Series(reason, index=df.index, dtype=object),
+        })
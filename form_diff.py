@@ -0,0 +1,86 @@
+# form_diff.py
+
+import json
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from ai_agent import FORM_TOKEN_BUDGET, form_fields, form_header, pack_form, simplify_html
+from field_rules import is_unfilled
+
+# A step is treated as new (and sent in full) when no more than this share
+# of its fields were on the form the LLM saw last.
+NEW_STEP_OVERLAP = 0.5
+
+def _names(fields: List[Dict[str, Any]], limit: int = 5) -> str:
+    names = [f'"{f["label"] or f["agent_id"]}"' for f in fields[:limit]]
+    if len(fields) > limit:
+        names.append(f"and {len(fields) - limit} more")
+    return ", ".join(names)
+
+def _value(field: Dict[str, Any]) -> str:
+    if field['type'] in ('radio', 'checkbox'):
+        state = "checked" if field['checked'] else "unchecked"
+    else:
+        state = json.dumps(field['value'][:60], ensure_ascii=False)
+    return f'"{(field["label"] or field["agent_id"])[:60]}" = {state}'
+
+class FormObserver:
+    """
+    Remembers the Easy Apply form between agent cycles.
+
+    `simplify` only re-parses the modal when its HTML actually changed, and
+    `describe` gives the LLM, after its first look at a step, full lines
+    only for new fields, fields that still need input and the buttons, and
+    one summary line with the new values of changed fields and the names
+    of fields that are unchanged and already filled. Fields are matched by agent-id,
+    which the browser keeps stable across re-renders.
+    """
+
+    def __init__(self, token_budget: int = FORM_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self._html: Optional[str] = None
+        self._soup: Optional[BeautifulSoup] = None
+        self._shown: Dict[str, Dict[str, Any]] = {}
+        self.parses = 0
+        self.parses_skipped = 0
+
+    def simplify(self, modal_html: str) -> BeautifulSoup:
+        """simplify_html for the modal, reusing the last tree when nothing changed."""
+        if modal_html == self._html and self._soup is not None:
+            self.parses_skipped += 1
+            return self._soup
+        self._html = modal_html
+        self._soup = simplify_html(modal_html, for_application=True)
+        self.parses += 1
+        return self._soup
+
+    def describe(self, simplified_html: BeautifulSoup) -> str:
+        """
+        The form as the LLM should see it this cycle: in full on a new step,
+        otherwise only what changed or still needs doing.
+        """
+        fields = form_fields(simplified_html)
+        header = form_header(simplified_html)
+        previous, self._shown = self._shown, {f['agent_id']: f for f in fields}
+        if not previous or sum(f['agent_id'] in previous for f in fields) <= NEW_STEP_OVERLAP * len(fields):
+            return pack_form(header, fields, self.token_budget)
+
+        new = {f['agent_id'] for f in fields if f['agent_id'] not in previous}
+        gone = [f for agent_id, f in previous.items() if agent_id not in self._shown]
+        listed, changed, unchanged = [], [], []
+        for f in fields:
+            if f['agent_id'] in new or f['tag'] == 'button' or is_unfilled(f, fields):
+                listed.append(f)
+            elif previous[f['agent_id']] != f:
+                changed.append(f)
+            else:
+                unchanged.append(f)
+        summary = [f"Since your last action: {len(changed)} field(s) changed, {len(new)} new, {len(gone)} gone."]
+        if changed:
+            summary.append("Changed: " + ", ".join(_value(f) for f in changed) + ".")
+        if gone:
+            summary.append(f"Gone: {_names(gone)}.")
+        if unchanged:
+            summary.append(f"Already filled, not shown: {_names(unchanged)}.")
+        return pack_form(header + [" ".join(summary)], listed, self.token_budget)
@@ -0,0 +1,334 @@
+# job_store.py
+
+import csv
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CARD_FIELDS = ("title", "company", "location", "url", "is_easy_apply")
+JOB_FIELDS = ("job_id",) + CARD_FIELDS + ("description",)
+
+# Application statuses that mean there is nothing left to do for a job.
+FINAL_STATUSES = ("APPLIED_SUCCESSFULLY", "APPLIED")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT, company TEXT, location TEXT, is_easy_apply TEXT,
+    description TEXT,
+    card_hash TEXT,
+    description_hash TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    fetched_at REAL,
+    stale INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company);
+CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (url);
+CREATE INDEX IF NOT EXISTS idx_jobs_stale ON jobs (stale);
+CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs (first_seen, job_id);
+
+CREATE TABLE IF NOT EXISTS filter_decisions (
+    job_id TEXT PRIMARY KEY REFERENCES jobs (job_id),
+    kept INTEGER NOT NULL,
+    reason TEXT,
+    decided_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_filter_decisions_kept ON filter_decisions (kept);
+
+CREATE TABLE IF NOT EXISTS materials (
+    job_id TEXT PRIMARY KEY REFERENCES jobs (job_id),
+    resume_file TEXT NOT NULL,
+    cover_letter_file TEXT NOT NULL,
+    prepared_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    title TEXT, company TEXT,
+    status TEXT NOT NULL,
+    attempted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications (job_id);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status);
+"""
+
+def content_hash(*parts: Any) -> str:
+    """Hashes the given values, so a change in any of them changes the hash."""
+    payload = "\x1f".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def card_hash(card: Dict[str, Any]) -> str:
+    return content_hash(*(card.get(field) for field in CARD_FIELDS))
+
+def job_id_for(job: Dict[str, Any]) -> str:
+    """Returns a job's LinkedIn ID, falling back to the ID in its /jobs/view/<id>/ URL."""
+    if job.get('job_id'):
+        return str(job['job_id'])
+    match = re.search(r"/jobs/view/(\d+)", str(job.get('url', '')))
+    return match.group(1) if match else str(job['url'])
+
+class JobStore:
+    """
+    The embedded SQLite store every stage reads from and writes to.
+
+    It holds the scraped jobs (keyed by LinkedIn job ID, with first/last
+    seen times, card and description hashes and a `stale` flag), the
+    filter's decision for each job, the materials generated for it and
+    every application attempt. Lookups such as "already applied?" or
+    "materials ready?" are indexed queries.
+    """
+
+    def __init__(self, path: str = "jobs.db", refresh_days: Optional[float] = None):
+        self.path = path
+        self.refresh_days = refresh_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "JobStore":
+        """Builds a store from the `job_store` section of profile.yml."""
+        store_config = config.get('job_store') or {}
+        scraper_config = config.get('scraper') or {}
+        return cls(path=store_config.get('path', "jobs.db"), refresh_days=scraper_config.get('refresh_days'))
+
+    def _rows(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(sql, tuple(params))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # --- Jobs -----------------------------------------------------------
+
+    def plan_fetch(self, cards: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Splits freshly scraped cards into (to_fetch, unchanged). A card needs
+        its description fetched if the job is new, its card changed, it has
+        no description yet or the description is older than `refresh_days`.
+        Unchanged jobs come back with their stored description filled in.
+        """
+        now = time.time()
+        to_fetch, unchanged = [], []
+        with self._lock:
+            for card in cards:
+                row = self._conn.execute(
+                    "SELECT card_hash, description, fetched_at FROM jobs WHERE job_id = ?", (job_id_for(card),)
+                ).fetchone()
+                expired = (
+                    row is not None and self.refresh_days is not None
+                    and now - (row[2] or 0) > self.refresh_days * 86400
+                )
+                if row is None or row[0] != card_hash(card) or not row[1] or expired:
+                    to_fetch.append(card)
+                else:
+                    unchanged.append(dict(card, description=row[1]))
+        return to_fetch, unchanged
+
+    def record_jobs(self, jobs: Iterable[Dict[str, Any]], fetched: bool = True) -> int:
+        """
+        Upserts jobs seen in a scrape. With `fetched`, their descriptions are
+        stored too. Returns how many stored descriptions actually changed.
+        """
+        now = time.time()
+        changed = 0
+        with self._lock:
+            for job in jobs:
+                job_id = job_id_for(job)
+                row = self._conn.execute("SELECT description_hash FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                values = [job.get(field) for field in CARD_FIELDS] + [card_hash(job)]
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO jobs (job_id, title, company, location, url, is_easy_apply, card_hash, first_seen, last_seen)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [job_id] + values + [now, now],
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE jobs SET title = ?, company = ?, location = ?, url = ?, is_easy_apply = ?, card_hash = ?,"
+                        " last_seen = ?, stale = 0 WHERE job_id = ?",
+                        values + [now, job_id],
+                    )
+                if fetched and job.get('description'):
+                    description_hash = content_hash(job['description'])
+                    if row is not None and row[0] and row[0] != description_hash:
+                        changed += 1
+                    self._conn.execute(
+                        "UPDATE jobs SET description = ?, description_hash = ?, fetched_at = ? WHERE job_id = ?",
+                        (job['description'], description_hash, now, job_id),
+                    )
+            self._conn.commit()
+        return changed
+
+    def mark_stale(self, seen_ids: Iterable[str]) -> int:
+        """Marks every job not in `seen_ids` as stale. Returns how many newly went stale."""
+        seen = set(seen_ids)
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id FROM jobs WHERE stale = 0").fetchall()
+            gone = [(job_id,) for (job_id,) in rows if job_id not in seen]
+            self._conn.executemany("UPDATE jobs SET stale = 1 WHERE job_id = ?", gone)
+            self._conn.commit()
+        return len(gone)
+
+    def active_jobs(self) -> List[Dict[str, Any]]:
+        """Returns every non-stale job that has a description, oldest first."""
+        return self._rows(
+            f"SELECT {', '.join(JOB_FIELDS)} FROM jobs"
+            " WHERE stale = 0 AND description IS NOT NULL ORDER BY first_seen, job_id"
+        )
+
+    def iter_active_jobs(self, chunk_size: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the same jobs as `active_jobs` in chunks of at most
+        `chunk_size`, so callers never hold every description at once.
+        Chunks are read by key, so writes between chunks are safe.
+        """
+        last = (float('-inf'), "")
+        while True:
+            chunk = self._rows(
+                f"SELECT {', '.join(JOB_FIELDS)}, first_seen FROM jobs"
+                " WHERE stale = 0 AND description IS NOT NULL AND (first_seen, job_id) > (?, ?)"
+                " ORDER BY first_seen, job_id LIMIT ?",
+                (last[0], last[1], chunk_size),
+            )
+            if not chunk:
+                return
+            last = (chunk[-1]['first_seen'], chunk[-1]['job_id'])
+            yield [{field: job[field] for field in JOB_FIELDS} for job in chunk]
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._rows("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def jobs_at_company(self, company: str) -> List[Dict[str, Any]]:
+        return self._rows(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE company = ?", (company,))
+
+    def count_jobs(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def count_active_jobs(self) -> int:
+        """Counts the jobs `active_jobs` would return."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE stale = 0 AND description IS NOT NULL").fetchone()[0]
+
+    def import_csv(self, path: str) -> int:
+        """Loads jobs from a scraped_jobs.csv written by older versions. Returns how many were read."""
+        if not os.path.isfile(path):
+            return 0
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            jobs = [row for row in csv.DictReader(f) if row.get('url')]
+        self.record_jobs(jobs)
+        return len(jobs)
+
+    # --- Filter decisions -----------------------------------------------
+
+    def record_filter_decisions(self, decisions: Iterable[Tuple[str, bool, Optional[str]]]) -> None:
+        """Saves (job_id, kept, reason) for each filtered job, replacing earlier decisions."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO filter_decisions (job_id, kept, reason, decided_at) VALUES (?, ?, ?, ?)",
+                [(job_id, int(kept), reason, now) for job_id, kept, reason in decisions],
+            )
+            self._conn.commit()
+
+    def kept_jobs(self, easy_apply_only: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the active jobs the filter kept, oldest first. With `limit`,
+        only the `limit` most recently seen of them.
+        """
+        sql = (
+            f"SELECT {', '.join('j.' + f for f in JOB_FIELDS)} FROM jobs j"
+            " JOIN filter_decisions d ON d.job_id = j.job_id"
+            " WHERE d.kept = 1 AND j.stale = 0"
+        )
+        if easy_apply_only:
+            sql += " AND lower(j.is_easy_apply) = 'yes'"
+        if limit is None:
+            return self._rows(sql + " ORDER BY j.first_seen, j.job_id")
+        return self._rows(sql + " ORDER BY j.first_seen DESC, j.job_id DESC LIMIT ?", (limit,))[::-1]
+
+    def filter_decision(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._rows("SELECT kept, reason, decided_at FROM filter_decisions WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    # --- Materials ------------------------------------------------------
+
+    def record_materials(self, job_id: str, resume_file: str, cover_letter_file: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO materials (job_id, resume_file, cover_letter_file, prepared_at) VALUES (?, ?, ?, ?)",
+                (job_id, resume_file, cover_letter_file, time.time()),
+            )
+            self._conn.commit()
+
+    def get_materials(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the materials prepared for a job, or None if there are none or their files were deleted."""
+        rows = self._rows("SELECT resume_file, cover_letter_file, prepared_at FROM materials WHERE job_id = ?", (job_id,))
+        if not rows or not (os.path.isfile(rows[0]['resume_file']) and os.path.isfile(rows[0]['cover_letter_file'])):
+            return None
+        return rows[0]
+
+    def has_materials(self, job_id: str) -> bool:
+        return self.get_materials(job_id) is not None
+
+    # --- Applications ---------------------------------------------------
+
+    def record_application(self, job: Dict[str, Any], status: str) -> None:
+        """Logs one application attempt (or skip/failure) for a job."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO applications (job_id, title, company, status, attempted_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id_for(job), job.get('title'), job.get('company'), status, time.time()),
+            )
+            self._conn.commit()
+
+    def has_applied(self, job_id: str) -> bool:
+        placeholders = ", ".join("?" for _ in FINAL_STATUSES)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM applications WHERE job_id = ? AND status IN ({placeholders}) LIMIT 1",
+                (job_id,) + FINAL_STATUSES,
+            ).fetchone()
+        return row is not None
+
+    def applications(self, job_id: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns application attempts, optionally for one job or with one status, newest first."""
+        clauses, params = [], []
+        if job_id is not None:
+            clauses.append("job_id = ?")
+            params.append(job_id)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._rows(f"SELECT * FROM applications{where} ORDER BY attempted_at DESC, id DESC", params)
+
+    def status_counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM applications GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_shared_stores: Dict[str, JobStore] = {}
+_shared_lock = threading.Lock()
+
+def get_job_store(config: Dict[str, Any]) -> JobStore:
+    """Returns the process-wide job store configured in profile.yml."""
+    path = (config.get('job_store') or {}).get('path', "jobs.db")
+    with _shared_lock:
+        if path not in _shared_stores:
+            _shared_stores[path] = JobStore.from_config(config)
+        return _shared_stores[path]
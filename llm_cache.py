@@ -0,0 +1,120 @@
+# llm_cache.py
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+class LLMCache:
+    """
+    A persistent, content-addressed cache for LLM results.
+
+    Entries are keyed by a hash of everything that determines the output
+    (call name, model, prompt template version and inputs) and stored in a
+    local SQLite file. When the cache grows past `max_entries`, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = "llm_cache.db", max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " hit_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["LLMCache"]:
+        """Builds a cache from the `llm_cache` section of profile.yml, or None if disabled."""
+        cache_config = config.get('llm_cache') or {}
+        if not cache_config.get('enabled', True):
+            return None
+        return cls(path=cache_config.get('path', "llm_cache.db"), max_entries=cache_config.get('max_entries', 5000))
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hashes the given JSON-serialisable parts into a cache key."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for `key`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores `value` under `key` and evicts the oldest entries if needed."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_used, hit_count) VALUES (?, ?, ?, ?, 0)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns this run's hit/miss counters and the current entry count."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_shared_caches: Dict[str, LLMCache] = {}
+_shared_lock = threading.Lock()
+
+def get_llm_cache(config: Dict[str, Any]) -> Optional[LLMCache]:
+    """Returns the process-wide cache configured in profile.yml, or None if disabled."""
+    cache_config = config.get('llm_cache') or {}
+    if not cache_config.get('enabled', True):
+        return None
+    path = cache_config.get('path', "llm_cache.db")
+    with _shared_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = LLMCache.from_config(config)
+        return _shared_caches[path]
+
+def print_cache_report(config: Dict[str, Any]) -> None:
+    """Prints hit/miss counters for the shared cache, if it was used this run."""
+    cache_config = config.get('llm_cache') or {}
+    cache = _shared_caches.get(cache_config.get('path', "llm_cache.db"))
+    if cache is None:
+        return
+    stats = cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    if not lookups:
+        return
+    print(
+        f"🗄️  LLM cache: {stats['hits']} hit(s), {stats['misses']} miss(es) "
+        f"({stats['hits'] / lookups:.0%} hit rate), {stats['entries']} entries stored."
+    )
@@ -0,0 +1,232 @@
+# llm_usage.py
+
+import asyncio
+import contextvars
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from tokens import count_tokens
+from tracing import span
+
+# USD per 1K prompt and completion tokens. Override or extend with
+# `llm_usage.prices` in profile.yml.
+DEFAULT_PRICES = {
+    "gpt-4-turbo-preview": (0.01, 0.03),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+}
+
+# The job the current thread is working on. The pipeline runs each job on
+# a worker thread, so setting it per call keeps concurrent jobs apart.
+_current_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_job_id", default=None)
+
+@contextmanager
+def job_context(job_id: Optional[str]) -> Iterator[None]:
+    """Attributes the LLM calls made inside the block to `job_id`."""
+    token = _current_job.set(job_id)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+def _estimate_prompt_tokens(request: Dict[str, Any]) -> int:
+    text = "".join(str(m.get('content') or "") for m in request.get('messages') or [])
+    if request.get('tools'):
+        text += json.dumps(request['tools'])
+    return count_tokens(text)
+
+def _estimate_completion_tokens(response: Any) -> int:
+    message = response.choices[0].message
+    text = message.content if isinstance(message.content, str) else ""
+    for tool_call in getattr(message, 'tool_calls', None) or []:
+        arguments = tool_call.function.arguments
+        text += arguments if isinstance(arguments, str) else ""
+    return count_tokens(text)
+
+def _call_site() -> str:
+    """module.function of the code that called `chat.completions.create`."""
+    frame = sys._getframe(2)
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+class UsageLog:
+    """
+    Records every LLM call: call site, job, model, prompt and completion
+    tokens, latency and estimated cost. Each call is appended to a JSONL
+    file as it happens; the in-memory copy feeds the end-of-run report.
+    """
+
+    def __init__(self, path: str = "llm_calls.jsonl", prices: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.prices = dict(DEFAULT_PRICES, **(prices or {}))
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["UsageLog"]:
+        """Builds a log from the `llm_usage` section of profile.yml, or None if disabled."""
+        usage_config = config.get('llm_usage') or {}
+        if not usage_config.get('enabled', True):
+            return None
+        return cls(path=usage_config.get('path', "llm_calls.jsonl"), prices=usage_config.get('prices'))
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        price = self.prices.get(model)
+        if price is None:
+            return None
+        return round((prompt_tokens * price[0] + completion_tokens * price[1]) / 1000, 6)
+
+    def record(self, **call: Any) -> None:
+        call['cost_usd'] = self.cost(call['model'], call['prompt_tokens'], call['completion_tokens'])
+        with self._lock:
+            self.calls.append(call)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(call, ensure_ascii=False) + "\n")
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals, latency percentiles and per-job figures for this run, overall and per call site."""
+        with self._lock:
+            calls = list(self.calls)
+
+        def totals(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+            latencies = [c['latency_s'] for c in group]
+            return {
+                "calls": len(group),
+                "errors": sum(1 for c in group if c['error']),
+                "prompt_tokens": sum(c['prompt_tokens'] for c in group),
+                "completion_tokens": sum(c['completion_tokens'] for c in group),
+                "cost_usd": round(sum(c['cost_usd'] or 0 for c in group), 4),
+                "p50_latency_s": percentile(latencies, 0.5),
+                "p95_latency_s": percentile(latencies, 0.95),
+            }
+
+        jobs = {c['job_id'] for c in calls if c['job_id']}
+        job_calls = [c for c in calls if c['job_id']]
+        report = totals(calls)
+        report["jobs"] = len(jobs)
+        report["calls_per_job"] = len(job_calls) / len(jobs) if jobs else 0.0
+        report["tokens_per_job"] = sum(c['prompt_tokens'] + c['completion_tokens'] for c in job_calls) / len(jobs) if jobs else 0.0
+        report["by_site"] = {site: totals([c for c in calls if c['site'] == site]) for site in sorted({c['site'] for c in calls})}
+        return report
+
+class _InstrumentedCompletions:
+    def __init__(self, completions: Any, log: UsageLog):
+        self._completions = completions
+        self._log = log
+
+    def create(self, **request: Any) -> Any:
+        site = _call_site()
+        started = time.perf_counter()
+        response, error = None, None
+        try:
+            with span(site, "llm", model=request.get('model', ""), job_id=_current_job.get()):
+                response = self._completions.create(**request)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record(site, request, response, error, time.perf_counter() - started)
+
+    def _record(self, site: str, request: Dict[str, Any], response: Any, error: Optional[str], latency: float) -> None:
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = getattr(usage, 'prompt_tokens', None)
+        completion_tokens = getattr(usage, 'completion_tokens', None)
+        estimated = not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int)
+        if estimated:
+            prompt_tokens = _estimate_prompt_tokens(request)
+            completion_tokens = _estimate_completion_tokens(response) if response is not None else 0
+        self._log.record(
+            ts=time.time(),
+            site=site,
+            job_id=_current_job.get(),
+            model=request.get('model', ""),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            estimated=estimated,
+            latency_s=round(latency, 4),
+            error=error,
+        )
+
+class _InstrumentedAsyncCompletions(_InstrumentedCompletions):
+    async def create(self, **request: Any) -> Any:
+        site = _call_site()
+        started = time.perf_counter()
+        response, error = None, None
+        try:
+            with span(site, "llm", model=request.get('model', ""), job_id=_current_job.get()):
+                response = await self._completions.create(**request)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            # Token counting and the log file write stay off the event loop.
+            await asyncio.to_thread(self._record, site, request, response, error, time.perf_counter() - started)
+
+class InstrumentedClient:
+    """
+    Wraps an OpenAI client (an AsyncOpenAI one with `asynchronous`) so that
+    every `chat.completions.create` call is recorded in a UsageLog.
+    Everything else is passed through unchanged.
+    """
+
+    def __init__(self, client: Any, log: UsageLog, asynchronous: bool = False):
+        self._client = client
+        self.log = log
+        completions = _InstrumentedAsyncCompletions if asynchronous else _InstrumentedCompletions
+        self.chat = SimpleNamespace(completions=completions(client.chat.completions, log))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+_shared_logs: Dict[str, UsageLog] = {}
+_shared_lock = threading.Lock()
+
+def get_usage_log(config: Dict[str, Any]) -> Optional[UsageLog]:
+    """Returns the process-wide usage log configured in profile.yml, or None if disabled."""
+    usage_config = config.get('llm_usage') or {}
+    if not usage_config.get('enabled', True):
+        return None
+    path = usage_config.get('path', "llm_calls.jsonl")
+    with _shared_lock:
+        if path not in _shared_logs:
+            _shared_logs[path] = UsageLog.from_config(config)
+        return _shared_logs[path]
+
+def instrument(client: Any, config: Optional[Dict[str, Any]], asynchronous: bool = False) -> Any:
+    """Wraps `client` with the shared usage log, unless accounting is disabled."""
+    log = get_usage_log(config) if config is not None else None
+    return InstrumentedClient(client, log, asynchronous) if log else client
+
+def print_usage_report(config: Dict[str, Any]) -> None:
+    """Prints the LLM calls, tokens, cost and latency recorded this run, if any."""
+    usage_config = config.get('llm_usage') or {}
+    log = _shared_logs.get(usage_config.get('path', "llm_calls.jsonl"))
+    if log is None or not log.calls:
+        return
+    report = log.summary()
+    print(
+        f"\n📈 LLM usage: {report['calls']} call(s), {report['prompt_tokens']} prompt + {report['completion_tokens']} completion tokens, "
+        f"~${report['cost_usd']:.2f}; latency p50 {report['p50_latency_s']:.2f}s, p95 {report['p95_latency_s']:.2f}s."
+    )
+    if report['jobs']:
+        print(f"  -> {report['calls_per_job']:.1f} call(s) and {report['tokens_per_job']:.0f} tokens per job over {report['jobs']} job(s).")
+    for site, stats in report['by_site'].items():
+        print(
+            f"  -> {site}: {stats['calls']} call(s), {stats['prompt_tokens'] + stats['completion_tokens']} tokens, "
+            f"~${stats['cost_usd']:.2f}, p50 {stats['p50_latency_s']:.2f}s, p95 {stats['p95_latency_s']:.2f}s"
+        )
+    print(f"  -> Every call is logged in {log.path}")
@@ -1,16 +1,25 @@
+import argparse
 import yaml
 import pandas as pd
 import json
-import os
-import datetime
-import time
 from dotenv import load_dotenv
 
 from scraper import linkedin_scraper
 from filter import filter_jobs
-from ai_engine import get_ai_client, tailor_resume_for_job, generate_cover_letter
+from ai_engine import get_ai_client
 from file_generator import save_job_materials
+from materials import generate_materials, prepare_materials
+from job_store import get_job_store, job_id_for
+from llm_cache import print_cache_report
+from llm_usage import job_context, print_usage_report
+from field_rules import print_rule_report
+from waits import pause, print_wait_report
 from application_bot import apply_to_job_agent
+from browser_pool import BrowserPool
+from pipeline import Pipeline, Stage, print_pipeline_report
+from ranking import rank_jobs
+from tracing import start_tracing, finish_tracing, span
+from run_journal import RunJournal, QUEUED, MATERIALS_READY, APPLYING, APPLIED, FAILED, SKIPPED
 
 def load_config():
     """Loads the profile.yml configuration file."""
@@ -23,33 +32,277 @@ def load_config():
         print("❌ Error: profile.yml not found.")
         return None
 
-def main():
+def between_jobs_seconds(config):
+    """Optional pacing between applications, configured in the `waits` section."""
+    return (config.get('waits') or {}).get('between_jobs_seconds', 0)
+
+def process_jobs_interactively(config, ai_client, browser_pool, jobs, store, journal):
+    """Processes jobs one at a time, asking for confirmation before each one."""
+    for index, job in jobs.iterrows():
+        job_id = job_id_for(job)
+        print("\n" + "="*50)
+        print(f"Processing job {index + 1}/{len(jobs)}: '{job['title']}' at '{job['company']}'")
+        print(f"URL: {job['url']}")
+        if store.has_applied(job_id):
+            print("✅ Already applied to this job. Skipping.")
+            journal.record(job_id, APPLIED)
+            continue
+    
+        user_input = input("Proceed with this job? (y/n/skip): ")
+        if user_input.lower() == 'n':
+            print("Exiting bot.")
+            break
+        if user_input.lower() == 'skip':
+            print("Skipping job.")
+            store.record_application(job, "SKIPPED")
+            journal.record(job_id, SKIPPED)
+            continue
+
+        # AI Processing
+        print("\n--- AI & File Generation ---")
+        if store.has_materials(job_id):
+            print("✅ Materials were already prepared for this job. Skipping AI generation.")
+        else:
+            tailored_resume, cover_letter, failure = generate_materials(ai_client, config, job)
+            if failure:
+                store.record_application(job, failure)
+                journal.record(job_id, FAILED, reason=failure)
+                continue
+            resume_file, cover_letter_file = save_job_materials(job['title'], job['company'], tailored_resume, cover_letter, job_id=job_id)
+            if not resume_file:
+                store.record_application(job, "MATERIALS_SAVE_FAILED")
+                journal.record(job_id, FAILED, reason="MATERIALS_SAVE_FAILED")
+                continue
+            store.record_materials(job_id, resume_file, cover_letter_file)
+        journal.record(job_id, MATERIALS_READY)
+    
+        # Application Phase with Error Handling
+        print("\n--- Automated Application (AGENT MODE) ---")
+        job_details_for_bot = {"url": job['url'], "title": job['title']}
+        resume_to_upload = config['resume_path']
+        journal.record(job_id, APPLYING)
+    
+        try:
+            with job_context(job_id), span("apply", "job", job_id=job_id, title=job['title']):
+                success = apply_to_job_agent(config, job_details_for_bot, resume_to_upload, browser_pool)
+        
+            if success:
+                print(f"✅ Successfully processed application for: {job['title']}")
+                store.record_application(job, "APPLIED_SUCCESSFULLY")
+                journal.record(job_id, APPLIED)
+            else:
+                print(f"⚠️  Application process for '{job['title']}' did not complete successfully.")
+                store.record_application(job, "APPLICATION_FAILED")
+                journal.record(job_id, FAILED, reason="APPLICATION_FAILED")
+
+        except Exception as e:
+            print(f"🚨 A critical error occurred while trying to apply to '{job['title']}': {e}")
+            store.record_application(job, "CRITICAL_FAILURE")
+            journal.record(job_id, FAILED, reason="CRITICAL_FAILURE")
+    
+        pause(between_jobs_seconds(config), "between_jobs")
+
+def process_jobs_pipelined(config, ai_client, browser_pool, jobs, store, journal):
+    """
+    Processes jobs through a generate -> save -> apply pipeline. Materials for
+    the next jobs are generated while the browser is applying to the current
+    one, and file writes run on their own worker.
+    """
+    pipeline_config = config.get('pipeline') or {}
+    jobs = jobs[[not store.has_applied(job_id_for(job)) for _, job in jobs.iterrows()]]
+    print(f"\nPipelined mode will process all {len(jobs)} jobs not yet applied to without asking per job.")
+    if input("Proceed? (y/n): ").lower() != 'y':
+        print("Exiting bot.")
+        return
+
+    def log_status(job, status):
+        store.record_application(job, status)
+        journal.record(job_id_for(job), APPLIED if status == "APPLIED_SUCCESSFULLY" else FAILED, reason=status)
+
+    def generate(job):
+        if store.has_materials(job_id_for(job)):
+            journal.record(job_id_for(job), MATERIALS_READY)
+            return {"job": job, "prepared": True}
+        tailored_resume, cover_letter, failure = generate_materials(ai_client, config, job)
+        if failure:
+            log_status(job, failure)
+            return None
+        return {"job": job, "tailored_resume": tailored_resume, "cover_letter": cover_letter}
+
+    def save(item):
+        if item.get('prepared'):
+            return item
+        job = item['job']
+        resume_file, cover_letter_file = save_job_materials(job['title'], job['company'], item['tailored_resume'], item['cover_letter'], job_id=job_id_for(job))
+        if not resume_file:
+            log_status(job, "MATERIALS_SAVE_FAILED")
+            return None
+        store.record_materials(job_id_for(job), resume_file, cover_letter_file)
+        journal.record(job_id_for(job), MATERIALS_READY)
+        return item
+
+    def apply(item):
+        job = item['job']
+        job_details_for_bot = {"url": job['url'], "title": job['title']}
+        journal.record(job_id_for(job), APPLYING)
+        try:
+            with job_context(job_id_for(job)), span("apply", "job", job_id=job_id_for(job), title=job['title']):
+                success = apply_to_job_agent(config, job_details_for_bot, config['resume_path'], browser_pool)
+            if success:
+                print(f"✅ Successfully processed application for: {job['title']}")
+                log_status(job, "APPLIED_SUCCESSFULLY")
+            else:
+                print(f"⚠️  Application process for '{job['title']}' did not complete successfully.")
+                log_status(job, "APPLICATION_FAILED")
+        except Exception as e:
+            print(f"🚨 A critical error occurred while trying to apply to '{job['title']}': {e}")
+            log_status(job, "CRITICAL_FAILURE")
+        pause(between_jobs_seconds(config), "between_jobs")
+        return item
+
+    pipeline = Pipeline(
+        [
+            Stage("generate", generate, workers=pipeline_config.get('generate_workers', 3)),
+            Stage("save", save, workers=pipeline_config.get('save_workers', 1)),
+            Stage("apply", apply, workers=pipeline_config.get('apply_workers', browser_pool.size)),
+        ],
+        queue_size=pipeline_config.get('queue_size', 4),
+    )
+    stats = pipeline.run(job for _, job in jobs.iterrows())
+    print_pipeline_report(stats)
+
+def run_prepare_materials(config):
+    """
+    Generates tailored resumes and cover letters for every Easy Apply job the
+    filter kept, up front, so the application loop only has to apply.
+    """
+    print("\n--- Preparing Materials ---")
+    store = get_job_store(config)
+    easy_apply_jobs = pd.DataFrame(store.kept_jobs(easy_apply_only=True))
+    print(f"Found {len(easy_apply_jobs)} 'Easy Apply' jobs kept by the last filter run.")
+    if easy_apply_jobs.empty:
+        print("❌ Please run the filter step first.")
+        return
+    easy_apply_jobs = rank_jobs(config, easy_apply_jobs)
+    try:
+        ai_client = get_ai_client(config)
+    except ValueError as e:
+        print(e)
+        return
+    prepare_materials(config, ai_client, easy_apply_jobs, store)
+    print_cache_report(config)
+    print_usage_report(config)
+
+def run_applications(config, jobs, store, journal):
+    """Generates materials for and applies to each job, journaling every step."""
+    try:
+        ai_client = get_ai_client(config)
+    except ValueError as e:
+        print(e)
+        journal.close()
+        return
+
+    # One pool of logged-in browsers is shared by every application below,
+    # so Chrome start-up and the login flow are paid once, not once per job.
+    browser_pool = BrowserPool.from_config(config)
+    try:
+        with span("applications", jobs=len(jobs)):
+            if (config.get('pipeline') or {}).get('enabled'):
+                process_jobs_pipelined(config, ai_client, browser_pool, jobs, store, journal)
+            else:
+                process_jobs_interactively(config, ai_client, browser_pool, jobs, store, journal)
+    except KeyboardInterrupt:
+        print(f"\n🛑 Interrupted. Progress is saved in {journal.path}; run `python main.py --resume` to pick up where you left off.")
+    finally:
+        browser_pool.close()
+        journal.close()
+    print_cache_report(config)
+    print_usage_report(config)
+    print_rule_report()
+    print_wait_report()
+
+    # --- Summary ---
+    counts = store.status_counts()
+    if counts:
+        print("\n--- Application Summary ---")
+        for status, count in sorted(counts.items()):
+            print(f"  -> {status}: {count}")
+        print(f"✅ Application attempts are recorded in {store.path}")
+
+def resume_last_run(config):
+    """
+    Continues the last run recorded in the journal. Jobs that were applied
+    to, failed or skipped are left alone; jobs that were in flight restart
+    from their last finished stage (materials already on disk are reused).
+    """
+    journal = RunJournal.from_config(config)
+    states = journal.start(resume=True)
+    store = get_job_store(config)
+    # Keep the order the jobs were queued in (best match first).
+    queue_order = {job_id: n for n, job_id in enumerate(states)}
+    pending = [job for job in store.kept_jobs(easy_apply_only=True) if job['job_id'] in states and not journal.is_done(job['job_id'])]
+    pending.sort(key=lambda job: queue_order[job['job_id']])
+    done = sum(journal.is_done(job_id) for job_id in states)
+    print(f"\n🔁 Resuming run {journal.run_id}: {done} job(s) finished, {len(pending)} to go.")
+    for job in pending:
+        if journal.state_of(job['job_id']) != QUEUED:
+            print(f"  -> '{job['title']}' was interrupted at '{journal.state_of(job['job_id'])}'.")
+    if not pending:
+        journal.close()
+        return
+    run_applications(config, pd.DataFrame(pending), store, journal)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Job Application Bot")
+    parser.add_argument("--resume", action="store_true", help="Continue the last interrupted run from the run journal")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to run the job bot workflow."""
+    args = parse_args(argv)
     load_dotenv()
     config = load_config()
     if not config: return
+    start_tracing(config)
+    try:
+        with span("run", "run", resume=args.resume):
+            if args.resume:
+                resume_last_run(config)
+            else:
+                run_menu(config)
+    finally:
+        finish_tracing()
 
+def run_menu(config):
+    """Asks which steps to run, then scrapes, filters, ranks and applies."""
     # --- Main Menu ---
     print("\n" + "="*25)
     print("--- Job Application Bot ---")
     print("="*25)
     print("1. Run full process (Scrape, Filter, Apply)")
-    print("2. Run from filter step (uses existing scraped_jobs.csv)")
-    print("3. Exit")
-    choice = input("Choose an option (1/2/3): ")
+    print("2. Run from filter step (uses jobs already in the job store)")
+    print("3. Prepare materials only (uses the last filter results)")
+    print("4. Exit")
+    choice = input("Choose an option (1/2/3/4): ")
 
+    if choice == '3':
+        with span("prepare_materials"):
+            run_prepare_materials(config)
+        return
     if choice == '1':
         print("\n--- Phase 1: Scraping Jobs ---")
-        linkedin_scraper(config)
+        with span("scrape"):
+            linkedin_scraper(config)
     elif choice == '2':
-        print("\nSkipping scraping. Using existing scraped_jobs.csv.")
+        print("\nSkipping scraping. Using jobs already in the job store.")
     else:
         print("Exiting.")
         return
 
     # --- Phase 2: Filter ---
     print("\n--- Phase 2: Filtering Jobs ---")
-    filtered_df = filter_jobs(config)
+    with span("filter"):
+        filtered_df = filter_jobs(config)
     if filtered_df is None or filtered_df.empty:
         print("\nNo jobs to proceed with after filtering. Exiting.")
         return
@@ -62,77 +315,16 @@ def main():
         print("No 'Easy Apply' jobs found in the filtered list. Exiting.")
         return
 
-    # --- Phase 3 & 4 Loop ---
-    try:
-        ai_client = get_ai_client(config)
-    except ValueError as e:
-        print(e)
-        return
-        
-    application_log = []
-    your_name = f"{config['personal_info']['first_name']} {config['personal_info']['last_name']}"
+    # --- Rank by relevance, so the best matches get the LLM and browser time first ---
+    with span("rank"):
+        easy_apply_jobs = rank_jobs(config, easy_apply_jobs)
 
-    for index, job in easy_apply_jobs.iterrows():
-        print("\n" + "="*50)
-        print(f"Processing job {index + 1}/{len(easy_apply_jobs)}: '{job['title']}' at '{job['company']}'")
-        print(f"URL: {job['url']}")
-        
-        user_input = input("Proceed with this job? (y/n/skip): ")
-        if user_input.lower() == 'n':
-            print("Exiting bot.")
-            break
-        if user_input.lower() == 'skip':
-            print("Skipping job.")
-            application_log.append(f"{datetime.datetime.now()},{job['title']},{job['company']},SKIPPED")
-            continue
-
-        # AI Processing
-        print("\n--- AI & File Generation ---")
-        tailored_resume = tailor_resume_for_job(ai_client, config['resume_data'], job['description'])
-        if not tailored_resume:
-            application_log.append(f"{datetime.datetime.now()},{job['title']},{job['company']},AI_RESUME_FAILED")
-            continue
-        
-        cover_letter = generate_cover_letter(ai_client, tailored_resume, job['title'], job['company'], your_name)
-        if not cover_letter:
-            application_log.append(f"{datetime.datetime.now()},{job['title']},{job['company']},AI_COVER_LETTER_FAILED")
-            continue
-
-        save_job_materials(job['title'], job['company'], tailored_resume, cover_letter)
-        
-        # Application Phase with Error Handling
-        print("\n--- Automated Application (AGENT MODE) ---")
-        job_details_for_bot = {"url": job['url'], "title": job['title']}
-        resume_to_upload = config['resume_path']
-        
-        try:
-            success = apply_to_job_agent(config, job_details_for_bot, resume_to_upload)
-            
-            if success:
-                print(f"✅ Successfully processed application for: {job['title']}")
-                application_log.append(f"{datetime.datetime.now()},{job['title']},{job['company']},APPLIED_SUCCESSFULLY")
-            else:
-                print(f"⚠️  Application process for '{job['title']}' did not complete successfully.")
-                application_log.append(f"{datetime.datetime.now()},{job['title']},{job['company']},APPLICATION_FAILED")
-
-        except Exception as e:
-            print(f"🚨 A critical error occurred while trying to apply to '{job['title']}': {e}")
-            application_log.append(f"{datetime.datetime.now()},{job['title']},{job['company']},CRITICAL_FAILURE")
-        
-        print("\nWaiting 10 seconds before next job...")
-        time.sleep(10)
-
-    # --- Save Log ---
-    if application_log:
-        log_file = "application_log.csv"
-        # Check if file exists to write header
-        file_exists = os.path.isfile(log_file)
-        with open(log_file, "a", newline='') as f:
-            if not file_exists:
-                f.write("Timestamp,JobTitle,Company,Status\n") # Write header
-            for log_entry in application_log:
-                f.write(log_entry + "\n")
-        print("\n✅ Application log updated.")
+    # --- Phase 3 & 4 Loop ---
+    journal = RunJournal.from_config(config)
+    journal.start()
+    for _, job in easy_apply_jobs.iterrows():
+        journal.record(job_id_for(job), QUEUED, title=job['title'], company=job['company'])
+    run_applications(config, easy_apply_jobs, get_job_store(config), journal)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,147 @@
+# materials.py
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai_engine import (
+    close_async_ai_clients, generate_cover_letter, generate_cover_letter_async, get_async_ai_client,
+    tailor_resume_for_job, tailor_resume_for_job_async,
+)
+from file_generator import save_job_materials
+from job_store import JobStore, get_job_store, job_id_for
+from llm_cache import get_llm_cache
+from llm_usage import job_context
+from tracing import span
+from pipeline import Pipeline, Stage, print_pipeline_report
+
+def generate_materials(
+    ai_client: Any,
+    config: Dict[str, Any],
+    job: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Runs resume tailoring and cover letter generation for one job, going
+    through the shared LLM cache unless it is disabled in profile.yml.
+    Returns (tailored_resume, cover_letter, failure_status); the status is
+    None on success, otherwise the application log status to record.
+    """
+    your_name = f"{config['personal_info']['first_name']} {config['personal_info']['last_name']}"
+    cache = get_llm_cache(config)
+    with job_context(job_id_for(job)), span("materials", "job", job_id=job_id_for(job), title=job['title']):
+        tailored_resume = tailor_resume_for_job(ai_client, config['resume_data'], job['description'], cache=cache)
+        if not tailored_resume:
+            return None, None, "AI_RESUME_FAILED"
+        cover_letter = generate_cover_letter(ai_client, tailored_resume, job['title'], job['company'], your_name, cache=cache)
+    if not cover_letter:
+        return tailored_resume, None, "AI_COVER_LETTER_FAILED"
+    return tailored_resume, cover_letter, None
+
+async def generate_materials_async(
+    ai_client: Any,
+    config: Dict[str, Any],
+    job: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+    """generate_materials with an async client."""
+    your_name = f"{config['personal_info']['first_name']} {config['personal_info']['last_name']}"
+    cache = get_llm_cache(config)
+    with job_context(job_id_for(job)), span("materials", "job", job_id=job_id_for(job), title=job['title']):
+        tailored_resume = await tailor_resume_for_job_async(ai_client, config['resume_data'], job['description'], cache=cache)
+        if not tailored_resume:
+            return None, None, "AI_RESUME_FAILED"
+        cover_letter = await generate_cover_letter_async(ai_client, tailored_resume, job['title'], job['company'], your_name, cache=cache)
+    if not cover_letter:
+        return tailored_resume, None, "AI_COVER_LETTER_FAILED"
+    return tailored_resume, cover_letter, None
+
+def prepare_materials(config: Dict[str, Any], ai_client: Any, jobs: Any, store: Optional[JobStore] = None) -> int:
+    """
+    Generates and saves a tailored resume and cover letter for every job in
+    the `jobs` DataFrame, with bounded parallelism. Jobs that already have
+    materials in the job store are skipped. Returns the number of newly
+    prepared jobs.
+
+    With `pipeline.async_prepare` the LLM calls run on one event loop
+    through the shared async client (see prepare_materials_async) and
+    `ai_client` is not used.
+    """
+    store = store or get_job_store(config)
+    pending = [job for _, job in jobs.iterrows() if not store.has_materials(job_id_for(job))]
+    print(f"📦 {len(jobs) - len(pending)} job(s) already prepared, {len(pending)} to go.")
+    if not pending:
+        return 0
+
+    pipeline_config = config.get('pipeline') or {}
+    if pipeline_config.get('async_prepare', False):
+        return asyncio.run(prepare_materials_async(config, pending, store))
+
+    def generate(job):
+        tailored_resume, cover_letter, failure = generate_materials(ai_client, config, job)
+        if failure:
+            print(f"⚠️  Could not prepare materials for '{job['title']}' ({failure}).")
+            return None
+        return {"job": job, "tailored_resume": tailored_resume, "cover_letter": cover_letter}
+
+    def save(item):
+        job = item['job']
+        resume_file, cover_letter_file = save_job_materials(job['title'], job['company'], item['tailored_resume'], item['cover_letter'], job_id=job_id_for(job))
+        if not resume_file:
+            return None
+        store.record_materials(job_id_for(job), resume_file, cover_letter_file)
+        return item
+
+    pipeline = Pipeline(
+        [
+            Stage("generate", generate, workers=pipeline_config.get('prepare_workers', 8)),
+            Stage("save", save, workers=pipeline_config.get('save_workers', 1)),
+        ],
+        queue_size=pipeline_config.get('queue_size', 4),
+    )
+    stats = pipeline.run(pending)
+    print_pipeline_report(stats)
+    prepared = stats['stages']['save']['processed']
+    print(f"✅ Prepared materials for {prepared} job(s). Ready jobs are recorded in {store.path}")
+    return prepared
+
+async def prepare_materials_async(config: Dict[str, Any], jobs: List[Dict[str, Any]], store: JobStore) -> int:
+    """
+    Generates and saves materials for `jobs` with up to
+    `pipeline.async_concurrency` jobs in flight on this event loop, sharing
+    one pool of keep-alive connections. Returns the number of prepared jobs.
+    """
+    concurrency = (config.get('pipeline') or {}).get('async_concurrency', 32)
+    semaphore = asyncio.Semaphore(concurrency)
+    ai_client = get_async_ai_client(config)
+    started = time.perf_counter()
+
+    async def prepare(job):
+        async with semaphore:
+            tailored_resume, cover_letter, failure = await generate_materials_async(ai_client, config, job)
+        if failure:
+            print(f"⚠️  Could not prepare materials for '{job['title']}' ({failure}).")
+            return False
+        # File writes and the store's SQLite calls block, so they run on
+        # worker threads and never stall the other jobs' LLM calls.
+        resume_file, cover_letter_file = await asyncio.to_thread(
+            save_job_materials, job['title'], job['company'], tailored_resume, cover_letter, job_id=job_id_for(job)
+        )
+        if not resume_file:
+            return False
+        await asyncio.to_thread(store.record_materials, job_id_for(job), resume_file, cover_letter_file)
+        return True
+
+    async def prepare_or_report(job):
+        # One job's error must not cancel the others.
+        try:
+            return await prepare(job)
+        except Exception as e:
+            print(f"🚨 Unhandled error preparing materials for '{job['title']}': {e}")
+            return False
+
+    try:
+        prepared = sum(await asyncio.gather(*(prepare_or_report(job) for job in jobs)))
+    finally:
+        await close_async_ai_clients()
+    print(f"✅ Prepared materials for {prepared} of {len(jobs)} job(s) in {time.perf_counter() - started:.1f}s, {concurrency} at a time.")
+    print(f"   Ready jobs are recorded in {store.path}")
+    return prepared
@@ -0,0 +1,123 @@
+# pipeline.py
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_STOP = object()
+
+class Stage:
+    """
+    One step of a pipeline. `handler` takes an item and returns the item to
+    pass downstream, or None to drop it (e.g. after a failure it has logged).
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Optional[Any]], workers: int = 1):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.processed = 0
+        self.dropped = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, elapsed: float, dropped: bool) -> None:
+        with self._lock:
+            self.busy_seconds += elapsed
+            if dropped:
+                self.dropped += 1
+            else:
+                self.processed += 1
+
+class Pipeline:
+    """
+    Runs items through a chain of stages, each with its own worker threads.
+
+    Stages are connected by bounded queues, so a slow stage applies
+    back-pressure instead of letting work pile up in memory, and every stage
+    is busy at the same time. Throughput tends towards that of the slowest
+    stage rather than the sum of all of them.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def _worker(self, index: int, inbox: "queue.Queue", outbox: Optional["queue.Queue"], remaining: List[int], lock: threading.Lock) -> None:
+        stage = self.stages[index]
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                break
+            start = time.perf_counter()
+            try:
+                result = stage.handler(item)
+            except Exception as e:
+                print(f"🚨 Unhandled error in pipeline stage '{stage.name}': {e}")
+                result = None
+            stage._record(time.perf_counter() - start, dropped=result is None)
+            if result is not None and outbox is not None:
+                outbox.put(result)
+
+        # The last worker of a stage to finish tells the next stage to stop.
+        with lock:
+            remaining[index] -= 1
+            last_out = remaining[index] == 0
+        if last_out and outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                outbox.put(_STOP)
+
+    def run(self, items: Iterable[Any]) -> Dict[str, Any]:
+        """Feeds `items` through every stage and blocks until all are done."""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(self.stages) else None
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, queues[index], outbox, remaining, lock),
+                    name=f"{stage.name}-{n + 1}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        start = time.perf_counter()
+        fed = 0
+        for item in items:
+            queues[0].put(item)
+            fed += 1
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_STOP)
+        for thread in threads:
+            thread.join()
+
+        return {
+            "items": fed,
+            "wall_seconds": time.perf_counter() - start,
+            "stages": {
+                stage.name: {
+                    "workers": stage.workers,
+                    "processed": stage.processed,
+                    "dropped": stage.dropped,
+                    "busy_seconds": stage.busy_seconds,
+                }
+                for stage in self.stages
+            },
+        }
+
+def print_pipeline_report(stats: Dict[str, Any]) -> None:
+    """Prints per-stage counts and busy time for a finished pipeline run."""
+    print("\n--- Pipeline Report ---")
+    print(f"Processed {stats['items']} job(s) in {stats['wall_seconds']:.1f}s")
+    for name, stage in stats['stages'].items():
+        print(
+            f"  -> {name}: {stage['processed']} passed, {stage['dropped']} dropped, "
+            f"{stage['busy_seconds']:.1f}s busy across {stage['workers']} worker(s)"
+        )
@@ -0,0 +1,161 @@
+# ranking.py
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from answer_cache import STOPWORDS
+from job_store import content_hash, job_id_for
+
+# Keeps tech terms such as "c++", "c#" and "node.js" in one piece.
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercases and splits text into terms, dropping stopwords."""
+    tokens = (token.rstrip('.') for token in TOKEN_RE.findall(str(text or "").lower()))
+    return [token for token in tokens if token and token not in STOPWORDS]
+
+def _strings(value: Any) -> Iterable[str]:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+    elif value is not None:
+        yield str(value)
+
+def build_query(resume_data: Dict[str, Any], keywords: str = "", emphasis: int = 2) -> Counter:
+    """
+    Turns resume_data and the search keywords into weighted query terms.
+    Skills and search keywords count `emphasis` times as much as the rest
+    of the resume.
+    """
+    query = Counter()
+    for key, value in (resume_data or {}).items():
+        weight = emphasis if key == 'skills' else 1
+        for text in _strings(value):
+            for term in tokenize(text):
+                query[term] += weight
+    for term in tokenize(keywords):
+        query[term] += emphasis
+    return query
+
+class RankingIndex:
+    """
+    A persistent BM25 index of job descriptions.
+
+    Term frequencies are stored per job in SQLite along with a hash of the
+    description, so later runs only tokenize jobs that are new or whose
+    description changed. Document frequencies are computed at query time
+    over the jobs being ranked.
+    """
+
+    def __init__(self, path: str = "ranking_index.db", k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " job_id TEXT PRIMARY KEY,"
+            " description_hash TEXT NOT NULL,"
+            " length INTEGER NOT NULL,"
+            " terms TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def index(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """Adds or refreshes the given jobs. Returns how many had to be tokenized."""
+        added = 0
+        with self._lock:
+            for job in jobs:
+                job_id, text = job_id_for(job), f"{job.get('title', '')}\n{job.get('description', '')}"
+                description_hash = content_hash(text)
+                row = self._conn.execute("SELECT description_hash FROM documents WHERE job_id = ?", (job_id,)).fetchone()
+                if row is not None and row[0] == description_hash:
+                    continue
+                terms = tokenize(text)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents (job_id, description_hash, length, terms) VALUES (?, ?, ?, ?)",
+                    (job_id, description_hash, len(terms), json.dumps(Counter(terms))),
+                )
+                added += 1
+            self._conn.commit()
+        return added
+
+    def score(self, job_ids: List[str], query: Counter) -> List[float]:
+        """Returns the BM25 score of each job against the weighted query terms."""
+        with self._lock:
+            documents = {}
+            for job_id in job_ids:
+                row = self._conn.execute("SELECT length, terms FROM documents WHERE job_id = ?", (job_id,)).fetchone()
+                if row is not None:
+                    documents[job_id] = (row[0], json.loads(row[1]))
+        if not documents:
+            return [0.0] * len(job_ids)
+
+        n = len(documents)
+        average_length = sum(length for length, _ in documents.values()) / n or 1.0
+        document_frequency = Counter(term for _, terms in documents.values() for term in terms if term in query)
+        idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+        scores = []
+        for job_id in job_ids:
+            if job_id not in documents:
+                scores.append(0.0)
+                continue
+            length, terms = documents[job_id]
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            scores.append(sum(
+                weight * idf[term] * terms[term] * (self.k1 + 1) / (terms[term] + norm)
+                for term, weight in query.items() if term in terms
+            ))
+        return scores
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def rank_jobs(config: Dict[str, Any], jobs: pd.DataFrame, index: Optional[RankingIndex] = None) -> pd.DataFrame:
+    """
+    Scores every job against resume_data and the search keywords, without
+    any API calls, and returns the jobs best match first with a
+    `relevance_score` column. `ranking.top_k` and `ranking.min_relative_score`
+    (a fraction of the best job's score) cut off the weakest matches.
+    """
+    ranking_config = config.get('ranking') or {}
+    if not ranking_config.get('enabled', True) or jobs.empty:
+        return jobs
+    own_index = index is None
+    index = index or RankingIndex(ranking_config.get('index_path', "ranking_index.db"))
+    try:
+        records = jobs.to_dict('records')
+        tokenized = index.index(records)
+        query = build_query(config.get('resume_data'), (config.get('job_search_criteria') or {}).get('keywords', ""))
+        scores = index.score([job_id_for(job) for job in records], query)
+    finally:
+        if own_index:
+            index.close()
+
+    ranked = jobs.assign(relevance_score=scores).sort_values('relevance_score', ascending=False, kind='stable')
+    min_relative_score = ranking_config.get('min_relative_score') or 0
+    if min_relative_score and len(ranked):
+        ranked = ranked[ranked['relevance_score'] >= ranked['relevance_score'].iloc[0] * min_relative_score]
+    top_k = ranking_config.get('top_k')
+    if top_k:
+        ranked = ranked.head(top_k)
+    ranked = ranked.reset_index(drop=True)
+
+    print(f"\n--- Relevance Ranking ({tokenized} newly indexed) ---")
+    for _, job in ranked.head(10).iterrows():
+        print(f"  -> {job['relevance_score']:6.2f}  '{job['title']}' at '{job['company']}'")
+    print(f"✅ Kept the top {len(ranked)} of {len(jobs)} jobs by relevance.")
+    return ranked
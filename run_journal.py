@@ -0,0 +1,112 @@
+# run_journal.py
+
+import datetime
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+# Job states, in the order a job moves through them.
+QUEUED = "queued"
+MATERIALS_READY = "materials_ready"
+APPLYING = "applying"
+APPLIED = "applied"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+TERMINAL_STATES = (APPLIED, FAILED, SKIPPED)
+
+class RunJournal:
+    """
+    A write-ahead journal of the application loop.
+
+    Every state transition of every job is appended to a JSON Lines file
+    and fsynced before the bot moves on, so a crash, Ctrl-C or a dead
+    browser loses at most the step in progress. Each run starts with a
+    `run_started` record; resuming reads the latest state of every job in
+    the last run.
+    """
+
+    def __init__(self, path: str = "run_journal.jsonl"):
+        self.path = path
+        self.run_id: Optional[str] = None
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RunJournal":
+        """Builds a journal from the `journal` section of profile.yml."""
+        return cls(path=(config.get('journal') or {}).get('path', "run_journal.jsonl"))
+
+    def load_last_run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads the latest state of each job in the last run recorded in the
+        journal. A partially written final line (from a crash mid-write) is
+        ignored.
+        """
+        run_id, states = None, {}
+        if os.path.isfile(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get('event') == 'run_started':
+                        run_id, states = entry['run_id'], {}
+                    elif entry.get('run_id') == run_id and 'job_id' in entry:
+                        states[entry['job_id']] = entry
+        self.run_id, self.states = run_id, states
+        return states
+
+    def start(self, resume: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Opens the journal for writing. With `resume`, the last run is
+        continued and its job states are returned; otherwise a new run is
+        started.
+        """
+        if resume:
+            self.load_last_run()
+        # Terminate a line left half-written by a crash, so the next record
+        # starts on a line of its own.
+        torn = False
+        if os.path.isfile(self.path) and os.path.getsize(self.path):
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if torn:
+            self._file.write("\n")
+        if not resume or self.run_id is None:
+            self.run_id, self.states = uuid.uuid4().hex, {}
+            self._write({"event": "run_started", "run_id": self.run_id})
+        return dict(self.states)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        entry["at"] = datetime.datetime.now().isoformat()
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, job_id: str, state: str, **details: Any) -> None:
+        """Durably records that a job reached `state`."""
+        entry = {"run_id": self.run_id, "job_id": job_id, "state": state}
+        entry.update(details)
+        with self._lock:
+            self._write(entry)
+            self.states[job_id] = entry
+
+    def state_of(self, job_id: str) -> Optional[str]:
+        entry = self.states.get(job_id)
+        return entry['state'] if entry else None
+
+    def is_done(self, job_id: str) -> bool:
+        return self.state_of(job_id) in TERMINAL_STATES
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
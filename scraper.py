@@ -1,19 +1,18 @@
 # scraper.py
 
-import time
-import csv
 import re
 import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # --- NEW IMPORTS FOR THE AI AGENT ---
 from ai_agent import simplify_html, get_ai_action_for_scrolling
 from ai_engine import get_ai_client
+from session_store import SessionStore, ensure_logged_in, is_logged_out, linkedin_base_url
+from waits import wait_for, wait_timeout, card_count, cards_present, card_count_changed
+from description_fetcher import fetch_descriptions
+from job_store import get_job_store
+from browser_pool import create_driver
+from tracing import span
 
 def parse_card_text(card_text):
     """
@@ -39,11 +38,125 @@ def parse_card_text(card_text):
     return {"title": title, "company": company, "location": location}
 
 
+# Scrolls the search results list (falling back to the window) by one
+# viewport and reports whether the bottom has been reached.
+SCROLL_RESULTS_JS = """
+var list = document.querySelector('.jobs-search-results-list, .scaffold-layout__list > div, .scaffold-layout__list');
+var target = list && list.scrollHeight > list.clientHeight ? list : document.scrollingElement;
+target.scrollTop = target.scrollTop + target.clientHeight;
+return target.scrollTop + target.clientHeight >= target.scrollHeight - 2;
+"""
+RESULTS_PER_PAGE = 25
+
+def scroll_until_converged(driver, config, stable_attempts=2, max_scrolls=200):
+    """
+    Scrolls the results list until the number of job cards stops growing
+    for `stable_attempts` consecutive scrolls at the bottom of the list.
+    Returns the final card count. Needs no LLM calls.
+    """
+    count = card_count(driver)
+    stable = 0
+    for _ in range(max_scrolls):
+        at_bottom = driver.execute_script(SCROLL_RESULTS_JS)
+        # Mid-list only give lazy-loaded cards a moment; at the bottom wait
+        # the full bound for the next batch before counting it as stable.
+        timeout = wait_timeout(config, 'scroll') if at_bottom else wait_timeout(config, 'scroll_step')
+        new_count = wait_for(driver, card_count_changed(count), timeout, "scroll")
+        if new_count is not None:
+            count = new_count
+            stable = 0
+        elif at_bottom:
+            stable += 1
+            if stable >= stable_attempts:
+                break
+    return count
+
+def ai_scroll(driver, config):
+    """
+    Lets the AI agent decide how to scroll the current results page. This is
+    the original scrolling strategy, kept as an opt-in fallback
+    (`scraper.scroll_mode: ai`).
+    """
+    print("\n--- Initializing AI Scrolling Agent ---")
+    ai_client = get_ai_client(config)
+    previous_actions = []
+    
+    for i in range(10): # Limit to 10 agent actions to prevent infinite loops/runaway costs
+        print(f"\n--- Agent Action Cycle {i+1}/10 ---")
+        
+        # 1. Observe
+        page_html = driver.page_source
+        simplified_page = simplify_html(page_html)
+        current_job_count = len(driver.find_elements(By.CSS_SELECTOR, "div[data-job-id]"))
+        
+        # 2. Think
+        action_str = get_ai_action_for_scrolling(ai_client, simplified_page, previous_actions, current_job_count)
+        
+        # 3. Act
+        if "STOP" in action_str.upper():
+            print("✅ AI decided to stop scrolling.")
+            break
+        elif "SCROLL_WINDOW" in action_str.upper():
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            previous_actions.append("SCROLL_WINDOW")
+            # Wait for new cards rather than a fixed delay
+            wait_for(driver, card_count_changed(current_job_count), wait_timeout(config, 'scroll'), "scroll")
+        elif "CLICK" in action_str.upper():
+            try:
+                selector = action_str.split(' ', 1)[1]
+                print(f"Attempting to click '{selector}'...")
+                driver.find_element(By.CSS_SELECTOR, selector).click()
+                previous_actions.append(f"CLICK {selector}")
+                wait_for(driver, card_count_changed(current_job_count), wait_timeout(config, 'scroll'), "scroll")
+            except Exception as e:
+                print(f"AI tried to click, but failed: {e}. Stopping agent.")
+                break
+        else:
+            print(f"AI returned an unknown command: '{action_str}'. Stopping agent.")
+            break
+
+def collect_cards_from_page(driver, seen_ids):
+    """
+    Reads the title, company, location, URL and Easy Apply flag of every job
+    card on the current results page that hasn't been seen yet. Descriptions
+    are fetched separately.
+    """
+    job_cards = driver.find_elements(By.CSS_SELECTOR, "div[data-job-id]")
+    print(f"Found {len(job_cards)} job cards on this page. Now reading them...")
+    
+    jobs = []
+    for card in job_cards:
+        try:
+            job_id = card.get_attribute("data-job-id")
+            if not job_id or job_id in seen_ids:
+                continue
+            card_text = card.text
+            parsed_data = parse_card_text(card_text)
+            if not parsed_data: continue
+            seen_ids.add(job_id)
+            parsed_data['job_id'] = job_id
+            parsed_data['url'] = card.find_element(By.TAG_NAME, "a").get_attribute("href").split('?')[0]
+            parsed_data['is_easy_apply'] = "Yes" if "easy apply" in card_text.lower() else "No"
+            jobs.append(parsed_data)
+        except Exception:
+            continue
+    return jobs
+
+def results_page_loaded(driver):
+    """True if the driver is signed in and the current page finished loading."""
+    return not is_logged_out(driver) and driver.execute_script("return document.readyState") == "complete"
+
 def linkedin_scraper(config):
     """
-    Scrapes LinkedIn jobs using an AI agent for dynamic scrolling and interaction.
+    Scrapes LinkedIn jobs. Each results page is scrolled until no new cards
+    appear, and further pages are followed through the `start=` offset.
+
+    Jobs are saved to the job store. In incremental mode (the default)
+    descriptions are only fetched for jobs the store hasn't seen before or
+    whose card changed. When the search ran to the end of the results,
+    jobs that dropped out of them are marked stale. Returns the number of active jobs in the store.
     """
-    print("🚀 Starting LinkedIn Scraper (AI Agent Method)...")
+    print("🚀 Starting LinkedIn Scraper...")
     
     # Get credentials from environment variables
     LINKEDIN_EMAIL = os.getenv("LINKEDIN_EMAIL")
@@ -55,111 +168,86 @@ def linkedin_scraper(config):
     # Get search criteria from the config object (this is not secret)
     SEARCH_KEYWORDS = config['job_search_criteria']['keywords']
     SEARCH_LOCATION = config['job_search_criteria']['location']
+    scraper_config = config.get('scraper') or {}
+    scroll_mode = scraper_config.get('scroll_mode', 'local')
+    max_pages = scraper_config.get('max_pages', 40)
+    stable_attempts = scraper_config.get('stable_scroll_attempts', 2)
 
     
-    options = webdriver.ChromeOptions()
-    driver = webdriver.Chrome(options=options)
-    driver.maximize_window()
+    driver = create_driver(headless=(config.get('browser') or {}).get('headless', False))
     
+    incremental = scraper_config.get('incremental', True)
+    store = get_job_store(config)
+    cards = []
+    jobs = []
     try:
-        # --- 1. Login ---
-        print("Logging in...")
-        driver.get("https://www.linkedin.com/login")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "username"))).send_keys(LINKEDIN_EMAIL)
-        driver.find_element(By.ID, "password").send_keys(LINKEDIN_PASSWORD)
-        driver.find_element(By.ID, "password").send_keys(Keys.RETURN)
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "global-nav-search")))
-        print("✅ Login successful.")
-
-        # --- 2. Search ---
-        search_url = f"https://www.linkedin.com/jobs/search/?f_WT=2&keywords={SEARCH_KEYWORDS}&location={SEARCH_LOCATION}&refresh=true"
-        driver.get(search_url)
-        print(f"✅ Searching at: {search_url}")
-        time.sleep(5)
-
-        # --- 3. AI-Driven Scrolling ---
-        print("\n--- Initializing AI Scrolling Agent ---")
-        ai_client = get_ai_client(config)
-        previous_actions = []
-        
-        for i in range(10): # Limit to 10 agent actions to prevent infinite loops/runaway costs
-            print(f"\n--- Agent Action Cycle {i+1}/10 ---")
-            
-            # 1. Observe
-            page_html = driver.page_source
-            simplified_page = simplify_html(page_html)
-            current_job_count = len(driver.find_elements(By.CSS_SELECTOR, "div[data-job-id]"))
-            
-            # 2. Think
-            action_str = get_ai_action_for_scrolling(ai_client, simplified_page, previous_actions, current_job_count)
-            
-            # 3. Act
-            if "STOP" in action_str.upper():
-                print("✅ AI decided to stop scrolling.")
+        # --- 1. Login (reuses the saved session when it is still valid) ---
+        ensure_logged_in(driver, SessionStore.from_config(config))
+
+        # --- 2. Search, page by page ---
+        seen_ids = set()
+        # Only a search that ran off the end of the results (an empty page
+        # after at least one page of cards) shows which jobs are gone. A
+        # first page that never loads, a failed page or the max_pages cap
+        # leave the rest of the store alone.
+        complete = False
+        for page in range(max_pages):
+            search_url = f"{linkedin_base_url(config)}/jobs/search/?f_WT=2&keywords={SEARCH_KEYWORDS}&location={SEARCH_LOCATION}&refresh=true"
+            if page:
+                search_url += f"&start={page * RESULTS_PER_PAGE}"
+            driver.get(search_url)
+            print(f"\n✅ Searching at: {search_url}")
+            if not wait_for(driver, cards_present, wait_timeout(config, 'search_results'), "search_results"):
+                if page and results_page_loaded(driver):
+                    print("No job cards on this page. Reached the end of the results.")
+                    complete = True
+                else:
+                    print("⚠️  No job cards appeared on this page. Stopping the search here.")
                 break
-            elif "SCROLL_WINDOW" in action_str.upper():
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                previous_actions.append("SCROLL_WINDOW")
-            elif "CLICK" in action_str.upper():
-                try:
-                    selector = action_str.split(' ', 1)[1]
-                    print(f"Attempting to click '{selector}'...")
-                    driver.find_element(By.CSS_SELECTOR, selector).click()
-                    previous_actions.append(f"CLICK {selector}")
-                except Exception as e:
-                    print(f"AI tried to click, but failed: {e}. Stopping agent.")
-                    break
+
+            # --- 3. Scrolling ---
+            if scroll_mode == 'ai':
+                ai_scroll(driver, config)
             else:
-                print(f"AI returned an unknown command: '{action_str}'. Stopping agent.")
+                total = scroll_until_converged(driver, config, stable_attempts)
+                print(f"✅ Results list converged at {total} cards.")
+
+            # --- 4. Card Extraction ---
+            page_cards = collect_cards_from_page(driver, seen_ids)
+            cards.extend(page_cards)
+            if not page_cards:
+                print("No new jobs on this page. Reached the end of the results.")
+                complete = page > 0
                 break
-            
-            time.sleep(3) # Wait for page to react
-        
-        # --- 4. Final Data Extraction ---
-        print("\nAI-driven scrolling complete. Collecting all found jobs...")
-        job_cards = driver.find_elements(By.CSS_SELECTOR, "div[data-job-id]")
-        print(f"Found a total of {len(job_cards)} job cards. Now extracting details...")
-        
-        jobs = []
-        for card in job_cards:
-            parsed_data = parse_card_text(card.text)
-            if not parsed_data: continue
-            
-            parsed_data['url'] = "N/A"
-            parsed_data['is_easy_apply'] = "No"
-            parsed_data['description'] = "Description could not be loaded."
-            
-            try:
-                parsed_data['url'] = card.find_element(By.TAG_NAME, "a").get_attribute("href").split('?')[0]
-                if "easy apply" in card.text.lower():
-                    parsed_data["is_easy_apply"] = "Yes"
-                
-                driver.execute_script("arguments[0].click();", card)
-                time.sleep(1.5)
-                description_pane = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-details__main-content")))
-                parsed_data['description'] = description_pane.text.strip()
-                
-                jobs.append(parsed_data)
-                print(f"  -> Scraped: {parsed_data['title']} (Easy Apply: {parsed_data['is_easy_apply']})")
-            except Exception:
-                continue
+        else:
+            print(f"⚠️  Stopped after max_pages ({max_pages}) result pages.")
+
+        # --- 5. Descriptions, fetched in parallel from the job pages ---
+        if incremental:
+            to_fetch, unchanged = store.plan_fetch(cards)
+            print(f"\n🗂️  {len(to_fetch)} new or changed job(s), {len(unchanged)} unchanged since the last scrape.")
+        else:
+            to_fetch = cards
+        with span("fetch_descriptions", jobs=len(to_fetch)):
+            fetched = fetch_descriptions(to_fetch, config)
+
+        # --- 6. Save ---
+        store.record_jobs(cards, fetched=False)
+        changed = store.record_jobs(fetched)
+        stale = store.mark_stale(seen_ids) if complete else 0
+        if not complete:
+            print("⚠️  The search did not reach the end of the results; no jobs marked stale.")
+        jobs = store.active_jobs()
+        print(f"🗂️  Fetched {len(fetched)} description(s) ({changed} changed), {stale} job(s) no longer listed.")
+        print(f"✅ {len(jobs)} active job(s) saved to {store.path}")
                 
     except Exception as e:
         print(f"❌ An unexpected error occurred in the main process: {e}")
     finally:
-        # --- 5. Save and Quit ---
-        if 'jobs' in locals() and jobs:
-            filename = 'scraped_jobs.csv'
-            print(f"\nSaving {len(jobs)} jobs to {filename}...")
-            unique_jobs = list({job['url']: job for job in jobs if job['url'] != "N/A"}.values())
-            print(f"Found {len(unique_jobs)} unique jobs.")
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=["title", "company", "location", "url", "is_easy_apply", "description"])
-                writer.writeheader()
-                writer.writerows(unique_jobs)
-            print(f"✅ Scraped data saved to {filename}")
-        else:
+        # --- 7. Quit ---
+        if not jobs:
             print("\nNo jobs were successfully scraped.")
         print("Scraper finished. Closing browser.")
         if 'driver' in locals() and driver:
-            driver.quit()
\ No newline at end of file
+            driver.quit()
+    return len(jobs)
\ No newline at end of file
@@ -5,9 +5,8 @@ import os
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from session_store import SessionStore, ensure_logged_in
 
 # --- LOAD ENVIRONMENT VARIABLES ---
 # This line reads the .env file and loads the variables into the environment
@@ -33,15 +32,8 @@ def debug_scraper():
     driver.maximize_window()
 
     try:
-        # --- 1. Login ---
-        print("Navigating to login page...")
-        driver.get("https://www.linkedin.com/login")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "username"))).send_keys(LINKEDIN_EMAIL)
-        driver.find_element(By.ID, "password").send_keys(LINKEDIN_PASSWORD)
-        driver.find_element(By.ID, "password").send_keys(Keys.RETURN)
-        print("Waiting for login verification...")
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "global-nav-search")))
-        print("✅ Login successful.")
+        # --- 1. Login (reuses the saved session when it is still valid) ---
+        ensure_logged_in(driver, SessionStore())
 
         # --- 2. Search ---
         print("Navigating to jobs page and searching...")
@@ -0,0 +1,179 @@
+# session_store.py
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+# A tiny same-origin document. Cookies and localStorage can only be set for
+# the origin the driver is currently on, and this avoids loading a full page.
+ORIGIN_PAGE_PATH = "/robots.txt"
+PROBE_PATH = "/feed/"
+AUTH_COOKIE_NAME = "li_at"
+
+def linkedin_base_url(config: Optional[Dict[str, Any]]) -> str:
+    """
+    The site to drive: LinkedIn itself unless `linkedin.base_url` in
+    profile.yml points somewhere else (e.g. the offline benchmark site).
+    """
+    return (((config or {}).get('linkedin') or {}).get('base_url') or LINKEDIN_BASE_URL).rstrip('/')
+
+def linkedin_login(driver: WebDriver, base_url: str = LINKEDIN_BASE_URL) -> None:
+    """
+    Runs the LinkedIn username/password login flow on the given driver.
+    Credentials are read from the environment.
+    """
+    linkedin_email = os.getenv("LINKEDIN_EMAIL")
+    linkedin_password = os.getenv("LINKEDIN_PASSWORD")
+    if not linkedin_email or not linkedin_password:
+        raise ValueError("❌ LinkedIn email or password not found in environment variables. Check your .env file.")
+
+    print("Logging in...")
+    driver.get(base_url + "/login")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "username"))).send_keys(linkedin_email)
+    driver.find_element(By.ID, "password").send_keys(linkedin_password)
+    driver.find_element(By.ID, "password").send_keys(Keys.RETURN)
+    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "global-nav-search")))
+    print("✅ Login successful.")
+
+def is_logged_out(driver: WebDriver) -> bool:
+    """Returns True if LinkedIn bounced the driver to a login or authwall page."""
+    url = driver.current_url
+    return "/login" in url or "/authwall" in url or "/checkpoint" in url
+
+def probe_session(driver: WebDriver, timeout: float = 5, base_url: str = LINKEDIN_BASE_URL) -> bool:
+    """
+    Loads the feed and checks for the global nav search bar, which only
+    renders for a signed-in member. Much cheaper than a full login.
+    """
+    try:
+        driver.get(base_url + PROBE_PATH)
+        if is_logged_out(driver):
+            return False
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.ID, "global-nav-search")))
+        return True
+    except (TimeoutException, WebDriverException):
+        return False
+
+class SessionStore:
+    """
+    Persists LinkedIn cookies and localStorage to disk after a successful
+    login so that later drivers, in this run or the next, can skip the
+    login flow. The state is tied to the account it was captured for.
+    """
+
+    def __init__(self, path: str = ".linkedin_session.json", account: Optional[str] = None, base_url: str = LINKEDIN_BASE_URL):
+        self.path = path
+        self.account = account if account is not None else os.getenv("LINKEDIN_EMAIL", "")
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        # Held while a driver signs in, so drivers sharing this store wait
+        # for one login and then reuse its session instead of each logging in.
+        self.login_lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SessionStore":
+        """Builds a store from the optional `browser` section of profile.yml."""
+        browser_config = config.get('browser') or {}
+        return cls(path=browser_config.get('session_file', ".linkedin_session.json"), base_url=linkedin_base_url(config))
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Returns the saved state, or None if there is no usable state on disk."""
+        with self._lock:
+            if self._state is None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._state = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    return None
+            state = self._state
+
+        if state.get('account') != self.account:
+            return None
+        auth_cookie = next((c for c in state.get('cookies', []) if c.get('name') == AUTH_COOKIE_NAME), None)
+        if not auth_cookie:
+            return None
+        # Don't spend a page load on a session we already know has expired.
+        if auth_cookie.get('expiry') and auth_cookie['expiry'] < time.time():
+            return None
+        return state
+
+    def save(self, driver: WebDriver) -> None:
+        """Captures the driver's LinkedIn cookies and localStorage."""
+        state = {
+            "account": self.account,
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "var items = {};"
+                "for (var i = 0; i < window.localStorage.length; i++) {"
+                "  var key = window.localStorage.key(i);"
+                "  items[key] = window.localStorage.getItem(key);"
+                "}"
+                "return items;"
+            ) or {},
+        }
+        with self._lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+            self._state = state
+        print(f"💾 Saved LinkedIn session to {self.path}")
+
+    def restore(self, driver: WebDriver) -> bool:
+        """Loads the saved cookies and localStorage into the driver."""
+        state = self.load()
+        if not state:
+            return False
+        driver.get(self.base_url + ORIGIN_PAGE_PATH)
+        for cookie in state['cookies']:
+            cookie = {k: v for k, v in cookie.items() if k != 'sameSite' or v in ('Strict', 'Lax', 'None')}
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                continue
+        if state.get('local_storage'):
+            driver.execute_script(
+                "var items = arguments[0];"
+                "for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+                state['local_storage'],
+            )
+        return True
+
+    def clear(self) -> None:
+        """Forgets the saved state, e.g. after LinkedIn invalidated it."""
+        with self._lock:
+            self._state = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+def ensure_logged_in(driver: WebDriver, store: Optional[SessionStore] = None) -> bool:
+    """
+    Signs the driver in, reusing the stored session when it is still valid.
+    Returns True if the stored session was reused, False if a full login ran.
+    """
+    if store is None:
+        linkedin_login(driver, base_url=LINKEDIN_BASE_URL)
+        return False
+    with store.login_lock:
+        if store.restore(driver):
+            if probe_session(driver, base_url=store.base_url):
+                print("✅ Reused saved LinkedIn session.")
+                return True
+            print("⚠️  Saved LinkedIn session has expired. Logging in again...")
+            store.clear()
+
+        linkedin_login(driver, base_url=store.base_url)
+        store.save(driver)
+        return False
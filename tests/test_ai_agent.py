@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+from ai_agent import simplify_html, parse_action_plan, get_ai_action_for_application, serialize_form
+from tokens import count_tokens
+
+FORM = '<form><input agent-id="agent-1"><button agent-id="agent-2">Next</button></form>'
+
+def mock_client(content):
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [MagicMock(message=MagicMock(content=content))]
+    return client
+
+def test_parse_action_plan_tolerates_formatting():
+    text = "Here is the plan:\n1. `TYPE agent-1 555-123-4567`\n- SELECT agent-2 Yes\n\nCLICK agent-3\n"
+    assert parse_action_plan(text) == ["TYPE agent-1 555-123-4567", "SELECT agent-2 Yes", "CLICK agent-3"]
+
+def test_get_ai_action_for_application_single_action():
+    client = mock_client(" CLICK agent-2 \n")
+    action = get_ai_action_for_application(client, simplify_html(FORM, for_application=True), {"phone": "1"})
+    assert action == "CLICK agent-2"
+
+def test_get_ai_action_for_application_plan_mode():
+    client = mock_client("TYPE agent-1 555-123-4567\nCLICK agent-2")
+    actions = get_ai_action_for_application(client, simplify_html(FORM, for_application=True), {"phone": "1"}, plan_mode=True)
+    assert actions == ["TYPE agent-1 555-123-4567", "CLICK agent-2"]
+    prompt = client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+    assert "one action per line" in prompt
+
+STEP = (
+    '<div><h3>Contact info</h3><form>'
+    '<label for="phone">Mobile phone number</label><input id="phone" type="text" data-agent-value="" required>'
+    '<label for="country">Country</label><select id="country"><option>Select an option</option>'
+    + "".join(f"<option>Country {i}</option>" for i in range(200)) +
+    '</select>'
+    '<fieldset><legend>Will you require sponsorship?</legend>'
+    '<input type="radio" id="yes" name="s"><label for="yes">Yes</label>'
+    '<input type="radio" id="no" name="s" checked><label for="no">No</label></fieldset>'
+    '<a href="/help">Help</a><button>Next</button></form></div>'
+)
+
+def test_serialize_form_lists_one_line_per_element():
+    text = serialize_form(simplify_html(STEP, for_application=True), token_budget=5000)
+    lines = text.splitlines()
+    assert lines[0] == "Step: Contact info"
+    assert lines[1] == 'agent-0 input[text] "Mobile phone number" value="" required'
+    assert '"Country 199"' in lines[2]
+    assert lines[4] == 'agent-3 input[radio] "No" question="Will you require sponsorship?" checked'
+    assert lines[-1] == 'agent-5 button "Next"'
+
+def test_serialize_form_fits_budget_without_dropping_fields():
+    text = serialize_form(simplify_html(STEP, for_application=True), token_budget=120)
+    assert count_tokens(text) <= 120
+    assert "(+197 more)" in text and "Help" not in text
+    assert all(f"agent-{i} " in text for i in (0, 1, 2, 3, 5))
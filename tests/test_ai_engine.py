@@ -1,7 +1,14 @@
+import asyncio
 import os
+import threading
 import pytest
-from unittest.mock import patch, MagicMock
-from ai_engine import get_ai_client, tailor_resume_for_job, generate_cover_letter
+from unittest.mock import AsyncMock, MagicMock, patch
+from ai_engine import (
+    close_async_ai_clients, generate_cover_letter, get_ai_client, get_async_ai_client,
+    tailor_resume_for_job, tailor_resume_for_job_async,
+)
+from bench.stub_llm import StubLLM
+from llm_usage import get_usage_log
 
 def test_get_ai_client_success(monkeypatch):
     monkeypatch.setenv("OPENAI_API_KEY", "fakekey")
@@ -56,4 +63,76 @@ def test_generate_cover_letter_failure(mock_openai):
     mock_client.chat.completions.create.side_effect = Exception("API error")
     tailored_resume = {"tailored_summary": "summary", "tailored_work_experience": []}
     result = generate_cover_letter(mock_client, tailored_resume, "Python Developer", "Acme Corp", "Jane Doe")
-    assert result is None
\ No newline at end of file
+    assert result is None
+def test_tailor_resume_for_job_uses_cache(tmp_path):
+    from llm_cache import LLMCache
+    cache = LLMCache(path=str(tmp_path / "cache.db"))
+    mock_client = MagicMock()
+    mock_tool_call = MagicMock()
+    mock_tool_call.function.arguments = '{"tailored_summary": "summary", "tailored_work_experience": []}'
+    mock_client.chat.completions.create.return_value.choices = [MagicMock(message=MagicMock(tool_calls=[mock_tool_call]))]
+
+    resume_data = {"summary": "old", "work_experience": []}
+    first = tailor_resume_for_job(mock_client, resume_data, "Python developer", cache=cache)
+    second = tailor_resume_for_job(mock_client, resume_data, "Python developer", cache=cache)
+    assert first == second
+    assert mock_client.chat.completions.create.call_count == 1
+
+def test_generate_cover_letter_failure_is_not_cached(tmp_path):
+    from llm_cache import LLMCache
+    cache = LLMCache(path=str(tmp_path / "cache.db"))
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = Exception("API error")
+    tailored_resume = {"tailored_summary": "summary", "tailored_work_experience": []}
+    assert generate_cover_letter(mock_client, tailored_resume, "Dev", "Acme", "Jane Doe", cache=cache) is None
+    assert cache.stats()["entries"] == 0
+
+def test_get_ai_client_is_shared_and_configured_from_profile(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "fakekey")
+    config = {"openai": {"base_url": "http://127.0.0.1:9/v1", "timeout": 12, "connect_timeout": 3, "max_retries": 0}, "llm_usage": {"enabled": False}}
+    client = get_ai_client(config)
+    assert get_ai_client(config) is client
+    assert get_ai_client() is not client
+    assert str(client.base_url).startswith("http://127.0.0.1:9/v1")
+    assert (client.timeout.read, client.timeout.connect, client.max_retries) == (12, 3, 0)
+
+def test_async_variants_share_one_loop_and_are_logged(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "fakekey")
+    llm = StubLLM(latency=0.3)
+    config = {"openai": {"base_url": llm.start()}, "llm_usage": {"path": str(tmp_path / "calls.jsonl")}}
+
+    async def tailor_many():
+        client = get_async_ai_client(config)
+        assert get_async_ai_client(config)._client is client._client
+        try:
+            return await asyncio.gather(*(tailor_resume_for_job_async(client, {"summary": "old"}, f"Job {i}") for i in range(8)))
+        finally:
+            await close_async_ai_clients()
+
+    try:
+        results = asyncio.run(tailor_many())
+    finally:
+        llm.stop()
+    assert all(result['tailored_summary'] for result in results)
+    # The calls overlapped rather than running one after another.
+    assert llm.peak_in_flight > 1
+    calls = get_usage_log(config).calls
+    assert [call['site'] for call in calls] == ["ai_engine.tailor_resume_for_job_async"] * 8
+    assert all(not call['estimated'] and call['latency_s'] >= 0.3 for call in calls)
+
+def test_async_variants_use_the_cache_off_the_event_loop_thread():
+    cache = MagicMock()
+    cache.get.side_effect = lambda key: threads.append(threading.get_ident())
+    cache.set.side_effect = lambda key, value: threads.append(threading.get_ident())
+    mock_tool_call = MagicMock()
+    mock_tool_call.function.arguments = '{"tailored_summary": "summary", "tailored_work_experience": []}'
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=MagicMock(choices=[MagicMock(message=MagicMock(tool_calls=[mock_tool_call]))]))
+    threads = []
+
+    async def tailor():
+        return threading.get_ident(), await tailor_resume_for_job_async(client, {"summary": "old"}, "Python developer", cache=cache)
+
+    loop_thread, result = asyncio.run(tailor())
+    assert result['tailored_summary'] == "summary"
+    assert len(threads) == 2 and loop_thread not in threads
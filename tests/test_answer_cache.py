@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock
+from answer_cache import AnswerCache, normalize_question
+from ai_agent import get_ai_answer_for_question
+
+STORY_BANK = [{"title": "Tight deadline", "result": "Shipped on time"}]
+
+def test_normalize_question():
+    assert normalize_question("  Why do you want to work HERE?! ") == "why do you want to work here"
+
+def test_exact_and_reworded_questions_hit(tmp_path):
+    cache = AnswerCache(path=str(tmp_path / "answers.db"))
+    cache.store("How many years of Python experience do you have?", STORY_BANK, "5")
+    assert cache.lookup("how many years of python experience do you have", STORY_BANK) == "5"
+    assert cache.lookup("Years of experience with Python", STORY_BANK) == "5"
+    assert cache.lookup("Years of experience with Java", STORY_BANK) is None
+
+def test_exact_only_when_similarity_disabled(tmp_path):
+    cache = AnswerCache(path=str(tmp_path / "answers.db"), similarity_threshold=None)
+    cache.store("How many years of Python experience do you have?", STORY_BANK, "5")
+    assert cache.lookup("Years of experience with Python", STORY_BANK) is None
+
+def test_changed_story_bank_invalidates_answers(tmp_path):
+    path = str(tmp_path / "answers.db")
+    AnswerCache(path=path).store("What is your notice period?", STORY_BANK, "One month")
+    assert AnswerCache(path=path).lookup("What is your notice period?", STORY_BANK) == "One month"
+    assert AnswerCache(path=path).lookup("What is your notice period?", STORY_BANK + [{"title": "New"}]) is None
+
+def test_get_ai_answer_for_question_uses_cache(tmp_path):
+    cache = AnswerCache(path=str(tmp_path / "answers.db"))
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [MagicMock(message=MagicMock(content=" One month "))]
+    assert get_ai_answer_for_question(client, "Notice period?", STORY_BANK, cache=cache) == "One month"
+    assert get_ai_answer_for_question(client, "What is your notice period?", STORY_BANK, cache=cache) == "One month"
+    assert client.chat.completions.create.call_count == 1
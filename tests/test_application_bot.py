@@ -0,0 +1,22 @@
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchElementException
+from application_bot import execute_form_action, ACTION_OK, ACTION_RETRY, ACTION_FINISHED, ACTION_ABORT
+
+CONFIG = {"story_bank": [], "answer_cache": {"enabled": False}}
+
+def test_type_action_fills_the_element():
+    driver = MagicMock()
+    assert execute_form_action(driver, None, CONFIG, "TYPE agent-1 555 123 4567") == ACTION_OK
+    driver.find_element.return_value.send_keys.assert_called_once_with("555 123 4567")
+
+def test_done_submit_and_fail():
+    driver = MagicMock()
+    assert execute_form_action(driver, None, CONFIG, "DONE") == ACTION_FINISHED
+    assert execute_form_action(driver, None, CONFIG, "SUBMIT agent-9") == ACTION_FINISHED
+    assert execute_form_action(driver, None, CONFIG, "FAIL cannot continue") == ACTION_ABORT
+
+def test_missing_element_aborts_single_action_but_retries_in_plan():
+    driver = MagicMock()
+    driver.find_element.side_effect = NoSuchElementException("gone")
+    assert execute_form_action(driver, None, CONFIG, "CLICK agent-1") == ACTION_ABORT
+    assert execute_form_action(driver, None, CONFIG, "CLICK agent-1", tolerate_errors=True) == ACTION_RETRY
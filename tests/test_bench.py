@@ -0,0 +1,64 @@
+import copy
+import urllib.request
+from http.cookiejar import CookieJar
+
+from bs4 import BeautifulSoup
+
+from ai_agent import get_ai_action_for_application, simplify_html
+from ai_engine import get_ai_client, tailor_resume_for_job
+from bench.fake_linkedin import FakeLinkedIn, MODAL_STEPS
+from bench.run_bench import compare, run_bench
+from bench.stub_llm import StubLLM
+from scraper import parse_card_text
+
+def test_fake_site_logs_in_and_serves_paged_search_results():
+    site = FakeLinkedIn(total_jobs=30, per_page=25)
+    base_url = site.start()
+    try:
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        assert opener.open(base_url + "/jobs/search/").geturl().endswith("/login")
+        feed = opener.open(base_url + "/login", data=b"session_key=a&session_password=b")
+        assert feed.geturl().endswith("/feed/") and 'id="global-nav-search"' in feed.read().decode()
+
+        pages = [BeautifulSoup(opener.open(f"{base_url}/jobs/search/?keywords=x&start={start}").read(), "lxml") for start in (0, 25)]
+        cards = [card for page in pages for card in page.select("div[data-job-id]")]
+        assert len(cards) == 30
+        parsed = parse_card_text(cards[0].get_text("\n"))
+        assert parsed == {"title": site.jobs[0]['title'], "company": site.jobs[0]['company'], "location": site.jobs[0]['location']}
+        assert "jobs-description-content" in opener.open(base_url + cards[0].a['href']).read().decode()
+    finally:
+        site.stop()
+
+def test_stub_llm_serves_the_client_from_config(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    llm = StubLLM()
+    base_url = llm.start()
+    try:
+        client = get_ai_client({"openai": {"base_url": base_url}, "llm_usage": {"enabled": False}})
+        tailored = tailor_resume_for_job(client, {"summary": "Engineer"}, "Python job")
+        assert tailored['tailored_summary']
+
+        # The "Additional questions" step, as the agent would see it.
+        heading, _, fields, button = MODAL_STEPS[2]
+        modal = f'<div class="jobs-easy-apply-modal"><h3>{heading}</h3><form>{fields}</form><button aria-label="{button}">Review</button></div>'
+        soup = simplify_html(modal, for_application=True)
+        actions = get_ai_action_for_application(client, soup, {"phone": "555", "resume_path": "/tmp/cv.pdf"}, plan_mode=True)
+        radio = soup.find('input', id='visa-yes')['agent-id']
+        assert actions == [f"TYPE {soup.find('input', id='years')['agent-id']} 5", f"CLICK {radio}", f"CLICK {soup.find('button')['agent-id']}"]
+        assert llm.requests == 2
+    finally:
+        llm.stop()
+
+def test_bench_without_browser_reports_stages_and_llm_calls(tmp_path):
+    report = run_bench(jobs=20, browser=False, workdir=str(tmp_path))
+
+    assert list(report['stages']) == ["seed", "filter", "rank", "materials"]
+    assert report['stages']['materials']['jobs'] == 20
+    assert report['llm']['calls'] == report['stub_llm_requests'] == 40
+    assert report['llm']['calls_per_job'] == 2.0
+    assert report['llm']['tokens_per_job'] > 0
+    assert compare(report, report) == []
+
+    baseline = copy.deepcopy(report)
+    baseline['llm']['calls_per_job'] = 1.0
+    assert compare(report, baseline) == ["LLM calls_per_job: 2.0 vs 1.0"]
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock
+from selenium.common.exceptions import WebDriverException
+from browser_pool import BrowserPool, reset_session
+
+def make_driver():
+    driver = MagicMock()
+    driver.window_handles = ["main"]
+    driver.execute_script.return_value = 1
+    return driver
+
+@patch("browser_pool.ensure_logged_in")
+@patch("browser_pool.create_driver")
+def test_session_is_reused_across_jobs(mock_create, mock_login):
+    mock_create.side_effect = lambda headless: make_driver()
+    pool = BrowserPool(size=1)
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    assert first is second
+    assert mock_create.call_count == 1
+    assert mock_login.call_count == 1
+    first.get.assert_called_with("about:blank")
+
+@patch("browser_pool.ensure_logged_in")
+@patch("browser_pool.create_driver")
+def test_stale_session_is_recycled(mock_create, mock_login):
+    mock_create.side_effect = lambda headless: make_driver()
+    pool = BrowserPool(size=1)
+    stale = pool.acquire()
+    pool.release(stale)
+    stale.execute_script.side_effect = WebDriverException("chrome not reachable")
+    fresh = pool.acquire()
+    assert fresh is not stale
+    stale.quit.assert_called_once()
+    assert mock_login.call_count == 2
+
+@patch("browser_pool.ensure_logged_in")
+@patch("browser_pool.create_driver")
+def test_session_is_recycled_after_max_jobs(mock_create, mock_login):
+    mock_create.side_effect = lambda headless: make_driver()
+    pool = BrowserPool(size=1, max_jobs_per_session=2)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    pool.release(driver)
+    driver.quit.assert_called_once()
+    assert pool.acquire() is not driver
+
+@patch("browser_pool.ensure_logged_in", side_effect=ValueError("no credentials"))
+@patch("browser_pool.create_driver")
+def test_failed_login_quits_browser(mock_create, mock_login):
+    driver = make_driver()
+    mock_create.return_value = driver
+    pool = BrowserPool(size=1)
+    with pytest.raises(ValueError):
+        pool.acquire()
+    driver.quit.assert_called_once()
+
+@patch("browser_pool.ensure_logged_in")
+@patch("browser_pool.create_driver")
+def test_waiter_gets_a_new_session_when_the_busy_one_is_discarded(mock_create, mock_login):
+    mock_create.side_effect = lambda headless: make_driver()
+    pool = BrowserPool(size=1)
+    busy = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.1)
+    pool.release(busy, healthy=False)
+    waiter.join(timeout=5)
+    assert acquired and acquired[0] is not busy
+    assert mock_create.call_count == 2
+
+def test_reset_session_closes_extra_tabs():
+    driver = make_driver()
+    driver.window_handles = ["main", "popup"]
+    reset_session(driver)
+    driver.close.assert_called_once()
+    driver.switch_to.window.assert_called_with("main")
+    driver.get.assert_called_with("about:blank")
@@ -0,0 +1,50 @@
+import random
+
+import pandas as pd
+
+from dedupe import NearDuplicateIndex, choose_bands, find_near_duplicates
+from filter import drop_near_duplicates
+
+random.seed(3)
+WORDS = [f"word{i}" for i in range(2000)]
+
+def posting(seed_words, chrome="Corecom Consulting\nShare\nOver 100 applicants"):
+    return f"{chrome}\nAbout the job\n{' '.join(seed_words)}"
+
+def test_reposts_cluster_under_the_first_posting():
+    body = random.choices(WORDS, k=300)
+    edited = list(body)
+    edited[150] = "changed"
+    other = random.choices(WORDS, k=300)
+
+    index = NearDuplicateIndex(threshold=0.8)
+    duplicates = find_near_duplicates([
+        ("1", posting(body)),
+        ("2", posting(other)),
+        ("3", posting(edited, chrome="Agency X\nShare\n3 applicants")),  # same role, different poster
+        ("4", posting(body)),
+    ], index)
+    assert duplicates == {"3": "1", "4": "1"}
+    assert index.clusters() == {"1": ["1", "3", "4"]}
+
+def test_band_choice_stays_below_threshold():
+    bands, rows = choose_bands(128, 0.8)
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+def test_drop_near_duplicates_only_considers_kept_jobs():
+    body = posting(random.choices(WORDS, k=200))
+    df = pd.DataFrame({"job_id": ["1", "2", "3"], "description": [body, body, body]})
+    decisions = pd.DataFrame({"kept": [False, True, True], "matched_keywords": ["senior", "", ""], "reason": ["excluded", None, None]})
+    assert drop_near_duplicates(df, decisions, NearDuplicateIndex()) == 1
+    assert decisions["kept"].tolist() == [False, True, False]
+    assert decisions["reason"][2] == "Near-duplicate of job 2"
+
+def test_empty_and_short_postings_are_never_duplicates():
+    index = NearDuplicateIndex(shingle_size=5)
+    duplicates = find_near_duplicates([
+        ("1", ""), ("2", ""), ("3", None), ("4", "Python developer"), ("5", "Python developer"),
+        ("6", posting(["Apply", "now"])), ("7", posting(["Apply", "now"])),
+    ], index)
+    assert duplicates == {}
+    assert index.clusters() == {}
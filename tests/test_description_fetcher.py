@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import WebDriverException
+from description_fetcher import fetch_description, fetch_descriptions
+
+CONFIG = {"waits": {"description": 0.05}, "scraper": {"description_workers": 2, "description_retries": 1}}
+
+def make_driver(text="We are hiring"):
+    driver = MagicMock()
+    driver.current_url = "https://www.linkedin.com/jobs/view/1/"
+    driver.window_handles = ["main"]
+    pane = MagicMock(text=text)
+    driver.find_elements.return_value = [pane]
+    return driver
+
+def test_fetch_description_retries_after_error():
+    driver = make_driver()
+    driver.get.side_effect = [WebDriverException("net::ERR"), None]
+    assert fetch_description(driver, CONFIG, "1", retries=1) == "We are hiring"
+    assert driver.get.call_count == 2
+
+@patch("description_fetcher.ensure_logged_in")
+@patch("description_fetcher.is_logged_out", side_effect=[True, False])
+def test_fetch_description_logs_in_through_the_shared_store(mock_logged_out, mock_login):
+    driver = make_driver()
+    store = MagicMock()
+    assert fetch_description(driver, CONFIG, "1", retries=0, session_store=store) == "We are hiring"
+    mock_login.assert_called_once_with(driver, store)
+
+def test_fetch_description_gives_up():
+    driver = make_driver(text="")
+    assert fetch_description(driver, CONFIG, "1", retries=1) is None
+
+@patch("browser_pool.ensure_logged_in")
+@patch("browser_pool.create_driver")
+def test_fetch_descriptions_keeps_order_and_drops_failures(mock_create, mock_login):
+    mock_create.side_effect = lambda headless: make_driver()
+    jobs = [{"job_id": str(i), "title": f"Job {i}", "is_easy_apply": "Yes"} for i in range(6)]
+    with patch("description_fetcher.fetch_description", side_effect=lambda d, c, job_id, r, session_store: None if job_id == "3" else f"desc {job_id}"):
+        results = fetch_descriptions(jobs, CONFIG)
+    assert [job["job_id"] for job in results] == ["0", "1", "2", "4", "5"]
+    assert results[0]["description"] == "desc 0"
+    assert mock_create.call_count <= 2
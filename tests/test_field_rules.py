@@ -0,0 +1,99 @@
+import pytest
+
+from ai_agent import simplify_html, describe_element
+from field_rules import FieldRule, get_rules, next_rule_action, PhoneRule
+
+CONTEXT = {
+    "phone": "555-123-4567",
+    "email": "john.doe@email.com",
+    "phone_country_code": "United States (+1)",
+    "resume_path": "/tmp/resume.pdf",
+}
+
+def contact_step(phone_value="", email_value="Select an option", code_value="Select an option", extra=""):
+    return f"""
+    <div class="jobs-easy-apply-modal">
+      <label for="email"><span>Email address</span></label>
+      <select id="email" required agent-id="agent-1" data-agent-value="{email_value}">
+        <option value="Select an option">Select an option</option>
+        <option value="john.doe@email.com">john.doe@email.com</option>
+      </select>
+      <label for="code"><span>Phone country code</span></label>
+      <select id="code" required agent-id="agent-2" data-agent-value="{code_value}">
+        <option value="Select an option">Select an option</option>
+        <option value="urn:li:country:gb">United Kingdom (+44)</option>
+        <option value="urn:li:country:us">United States (+1)</option>
+      </select>
+      <label for="phone">Mobile phone number</label>
+      <input id="phone" type="text" required agent-id="agent-3" data-agent-value="{phone_value}">
+      {extra}
+      <button aria-label="Dismiss" agent-id="agent-4"></button>
+      <button aria-label="Continue to next step" agent-id="agent-5"><span>Next</span></button>
+    </div>
+    """
+
+def test_describe_element_reads_label_value_and_options():
+    soup = simplify_html(contact_step(code_value="urn:li:country:us"), for_application=True)
+    field = describe_element(soup.find(attrs={"agent-id": "agent-2"}), soup)
+    assert field["label"] == "Phone country code"
+    assert field["value"] == "United States (+1)"
+    assert field["required"] is True
+    assert "United Kingdom (+44)" in field["options"]
+
+def test_simplify_html_keeps_browser_agent_ids():
+    soup = simplify_html('<nav><a href="#">Home</a></nav><button agent-id="agent-7">Next</button><input>', for_application=True)
+    assert soup.find('button')['agent-id'] == "agent-7"
+    assert soup.find('input')['agent-id'] == "agent-0"
+
+def test_rules_fill_contact_step_then_click_next():
+    attempted = set()
+    soup = simplify_html(contact_step(), for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "SELECT agent-1 john.doe@email.com"
+
+    soup = simplify_html(contact_step(email_value="john.doe@email.com"), for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "SELECT agent-2 United States (+1)"
+
+    soup = simplify_html(contact_step(email_value="john.doe@email.com", code_value="urn:li:country:us"), for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "TYPE agent-3 555-123-4567"
+
+    soup = simplify_html(contact_step("555-123-4567", "john.doe@email.com", "urn:li:country:us"), for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "CLICK agent-5"
+
+def test_unknown_required_field_goes_to_llm():
+    extra = '<label for="q">Years of experience with Kubernetes</label><input id="q" type="text" required agent-id="agent-9">'
+    soup = simplify_html(contact_step("555-123-4567", "john.doe@email.com", "urn:li:country:us", extra), for_application=True)
+    assert next_rule_action(soup, CONTEXT, set()) is None
+
+def test_action_without_effect_is_not_repeated():
+    attempted = set()
+    soup = simplify_html(contact_step(email_value="john.doe@email.com", code_value="urn:li:country:us"), for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "TYPE agent-3 555-123-4567"
+    assert next_rule_action(soup, CONTEXT, attempted) is None
+
+def test_resume_upload_and_submit():
+    html = """
+    <div>
+      <label for="upload">Upload resume</label>
+      <input id="upload" type="file" accept=".pdf,.docx" agent-id="agent-1">
+      <button aria-label="Submit application" agent-id="agent-2">Submit application</button>
+    </div>
+    """
+    attempted = set()
+    soup = simplify_html(html, for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "UPLOAD agent-1 /tmp/resume.pdf"
+    soup = simplify_html(html.replace('agent-id="agent-1"', 'agent-id="agent-1" data-agent-value="C:\\\\fakepath\\\\resume.pdf"'), for_application=True)
+    assert next_rule_action(soup, CONTEXT, attempted) == "SUBMIT agent-2"
+
+def test_rules_count_avoided_llm_calls():
+    phone_rule = next(rule for rule in get_rules() if isinstance(rule, PhoneRule))
+    before = phone_rule.llm_calls_avoided
+    soup = simplify_html(contact_step(email_value="john.doe@email.com", code_value="urn:li:country:us"), for_application=True)
+    assert next_rule_action(soup, CONTEXT, set()) == "TYPE agent-3 555-123-4567"
+    assert phone_rule.llm_calls_avoided == before + 1
+
+def test_field_rule_subclasses_must_implement_action():
+    class Incomplete(FieldRule):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,97 @@
+import csv
+import json
+import random
+import tracemalloc
+
+from filter import filter_jobs, stream_filter
+from job_store import JobStore, get_job_store
+
+CONFIG = {"job_search_criteria": {"exclusion_keywords": ["senior"]}, "filter": {"chunk_size": 100}}
+
+WORDS = [f"word{i}" for i in range(5000)]
+
+def write_archive(path, rows, description_size=200, distinct_words=0):
+    """Writes `rows` jobs; with `distinct_words`, each description is that many random words."""
+    rng = random.Random(rows)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "company", "location", "url", "is_easy_apply", "description"])
+        for i in range(rows):
+            title = "Senior Engineer" if i % 4 == 0 else "Engineer"
+            description = " ".join(rng.choices(WORDS, k=distinct_words)) if distinct_words else "x" * description_size
+            writer.writerow([title, f"Acme {i}", "Remote", f"https://www.linkedin.com/jobs/view/{i}/", "Yes", description])
+
+def test_stream_filter_from_csv_archive(tmp_path):
+    archive, output, rejections = tmp_path / "archive.csv", tmp_path / "kept.csv", tmp_path / "rejected.jsonl"
+    write_archive(archive, 1000)
+    stats = stream_filter(CONFIG, str(archive), str(output), str(rejections))
+    assert stats == {"chunks": 10, "rows": 1000, "kept": 750, "rejected": 250, "duplicates": 0}
+
+    with open(output, newline='', encoding='utf-8') as f:
+        kept = list(csv.DictReader(f))
+    assert len(kept) == 750 and kept[0]["job_id"] == "1"
+    lines = [json.loads(line) for line in open(rejections, encoding='utf-8')]
+    assert len(lines) == 250
+    assert lines[0] == {"job_id": "0", "title": "Senior Engineer", "company": "Acme 0", "url": "https://www.linkedin.com/jobs/view/0/",
+                        "matched_keywords": ["senior"], "reason": "Contains excluded keyword: 'senior'"}
+
+def test_stream_filter_from_job_store_records_decisions(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.record_jobs([
+        {"job_id": str(i), "title": "Senior Engineer" if i % 2 else "Engineer", "company": "Acme", "location": "Remote",
+         "url": f"https://www.linkedin.com/jobs/view/{i}/", "is_easy_apply": "Yes", "description": "Python"}
+        for i in range(250)
+    ])
+    stats = stream_filter(CONFIG, output_path=str(tmp_path / "kept.csv"), rejections_path=str(tmp_path / "rejected.jsonl"), store=store)
+    assert stats["chunks"] == 3 and stats["kept"] == 125
+    assert len(store.kept_jobs()) == 125
+    assert store.filter_decision("1")["kept"] == 0
+
+def test_streaming_filter_jobs_loads_at_most_max_kept_jobs(tmp_path):
+    config = dict(CONFIG, job_store={"path": str(tmp_path / "jobs.db")}, filter=dict(
+        CONFIG["filter"], streaming=True, max_kept=50,
+        output=str(tmp_path / "kept.csv"), rejections_file=str(tmp_path / "rejected.jsonl"),
+    ))
+    store = get_job_store(config)
+    store.record_jobs([
+        {"job_id": str(i), "title": "Engineer", "company": "Acme", "location": "Remote",
+         "url": f"https://www.linkedin.com/jobs/view/{i}/", "is_easy_apply": "Yes", "description": "Python"}
+        for i in range(250)
+    ])
+    filtered = filter_jobs(config)
+    assert len(filtered) == 50
+    assert list(filtered['job_id']) == [job["job_id"] for job in store.kept_jobs()][-50:]
+    assert len(store.kept_jobs()) == 250
+
+def test_streaming_filter_jobs_imports_scraped_jobs_into_an_empty_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = dict(CONFIG, job_store={"path": str(tmp_path / "jobs.db")}, filter=dict(
+        CONFIG["filter"], streaming=True, output=str(tmp_path / "kept.csv"), rejections_file=str(tmp_path / "rejected.jsonl"),
+    ))
+    assert filter_jobs(config) is None
+
+    write_archive(tmp_path / "scraped_jobs.csv", 20)
+    filtered = filter_jobs(config)
+    assert len(filtered) == 15
+
+def _peak_memory(tmp_path, config, rows, **archive_options):
+    archive = tmp_path / f"archive_{rows}.csv"
+    write_archive(archive, rows, **archive_options)
+    tracemalloc.start()
+    stream_filter(config, str(archive), str(tmp_path / "kept.csv"), str(tmp_path / "rejected.jsonl"))
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak_bytes
+
+def test_stream_filter_memory_does_not_grow_with_input(tmp_path):
+    small = _peak_memory(tmp_path, CONFIG, 1000, description_size=2000)
+    large = _peak_memory(tmp_path, CONFIG, 8000, description_size=2000)
+    # 8x the input (16 MB of descriptions) should not need much more memory.
+    assert large < small * 1.5
+
+def test_stream_filter_memory_stays_flat_with_dedupe_on_distinct_descriptions(tmp_path):
+    config = dict(CONFIG, dedupe={"enabled": True})
+    small = _peak_memory(tmp_path, config, 250, distinct_words=300)
+    large = _peak_memory(tmp_path, config, 2000, distinct_words=300)
+    # The dedupe index of every kept job is on disk, not in memory.
+    assert large < small * 1.5
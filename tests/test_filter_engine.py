@@ -0,0 +1,79 @@
+import os
+import random
+import time
+
+import pandas as pd
+import pytest
+
+from filter_engine import FilterEngine, KeywordRule, find_rows, INCLUDE
+
+def jobs(*rows):
+    return pd.DataFrame([{"title": title, "description": description} for title, description in rows])
+
+def test_exclusions_report_matched_keywords_in_config_order():
+    engine = FilterEngine.from_config({"job_search_criteria": {"exclusion_keywords": ["senior", "Manager"]}})
+    result = engine.evaluate(jobs(
+        ("Backend Engineer", "Python and Django"),
+        ("Senior Engineer", "Work with the engineering manager"),
+        ("Engineer", None),
+    ))
+    assert result["kept"].tolist() == [True, False, True]
+    assert result["matched_keywords"].tolist() == ["", "senior, manager", ""]
+    assert result["reason"].tolist() == [None, "Contains excluded keyword: 'senior'", None]
+
+def test_word_boundary_and_field_rules():
+    engine = FilterEngine([
+        KeywordRule("lead", fields=("title",), word_boundary=True),
+        KeywordRule("c++", word_boundary=True),
+    ])
+    result = engine.evaluate(jobs(
+        ("Tech Lead", "Python"),
+        ("Engineer", "You will lead the team"),      # only titles are checked for "lead"
+        ("Leading Engineer", "Python"),              # not a whole word
+        ("Engineer", "Modern C++, Rust"),
+        ("Engineer", "abc++"),
+    ))
+    assert result["kept"].tolist() == [False, True, True, False, True]
+
+def test_inclusion_keywords():
+    engine = FilterEngine([KeywordRule("sr."), KeywordRule("python", kind=INCLUDE)])
+    result = engine.evaluate(jobs(("Engineer", "Python"), ("Engineer", "Java"), ("Sr. Engineer", "Python")))
+    assert result["kept"].tolist() == [True, False, False]
+    assert result["reason"][1] == "Contains none of the inclusion keywords"
+
+def test_find_rows_reports_each_row_once():
+    values = ["python python", "java", "", "python"]
+    text = "\n".join(values)
+    starts = [0, 14, 19, 20]
+    assert find_rows(text, starts, "python") == [0, 3]
+    assert find_rows(text, starts, "python java") == []
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordRule("lead", fields=("company",))
+
+def test_benchmark_filtering_large_scrape():
+    """
+    Filters a synthetic scrape (100k rows by default; set FILTER_BENCH_ROWS=1000000
+    for the full-size run) and checks it stays within a seconds-per-million budget.
+    """
+    rows = int(os.getenv("FILTER_BENCH_ROWS", "100000"))
+    random.seed(0)
+    words = "python backend api django flask aws docker kubernetes team remote hybrid engineer build scale data".split()
+    descriptions = [" ".join(random.choices(words, k=40)) for _ in range(1000)]
+    titles = ["Software Engineer", "Senior Backend Developer", "Tech Lead", "Python Developer", "Sr. Data Engineer"]
+    df = pd.DataFrame({
+        "title": [titles[i % len(titles)] for i in range(rows)],
+        "description": [descriptions[i % len(descriptions)] for i in range(rows)],
+    })
+    engine = FilterEngine.from_config({"job_search_criteria": {"exclusion_keywords": [
+        "senior", "sr.", "principal", "manager", "architect", {"keyword": "lead", "field": "title", "word_boundary": True},
+    ]}})
+
+    start = time.perf_counter()
+    result = engine.evaluate(df)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nFiltered {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+    assert result["kept"].sum() == sum(1 for i in range(rows) if i % 5 in (0, 3))
+    assert elapsed < 15 * rows / 1_000_000 + 1
@@ -0,0 +1,36 @@
+from form_diff import FormObserver
+
+def step(phone="", email="me@example.com", heading="Contact info"):
+    return (
+        f'<div class="jobs-easy-apply-modal"><h3>{heading}</h3><form>'
+        f'<label for="email">Email address</label><input id="email" agent-id="agent-a1" data-agent-value="{email}">'
+        f'<label for="phone">Mobile phone number</label><input id="phone" agent-id="agent-b2" data-agent-value="{phone}" required>'
+        '<label for="city">City</label><input id="city" agent-id="agent-c3" data-agent-value="London">'
+        '<button agent-id="agent-d4">Next</button></form></div>'
+    )
+
+def test_describe_sends_whole_step_first_then_only_changes():
+    observer = FormObserver()
+    first = observer.describe(observer.simplify(step()))
+    assert "Email address" in first and "City" in first and "Since your last action" not in first
+
+    second = observer.describe(observer.simplify(step(phone="555-0100")))
+    assert second.splitlines() == [
+        "Step: Contact info",
+        'Since your last action: 1 field(s) changed, 0 new, 0 gone. Changed: "Mobile phone number" = "555-0100". '
+        'Already filled, not shown: "Email address", "City".',
+        'agent-d4 button "Next"',
+    ]
+
+    # A field cleared by the site is unfilled again, so it is listed.
+    assert 'agent-a1 input "Email address" value=""' in observer.describe(observer.simplify(step(phone="555-0100", email="")))
+
+def test_simplify_reuses_unchanged_snapshots_and_new_steps_are_sent_in_full():
+    observer = FormObserver()
+    observer.describe(observer.simplify(step()))
+    assert observer.simplify(step()) is observer.simplify(step())
+    assert (observer.parses, observer.parses_skipped) == (1, 2)
+
+    next_step = '<form><h3>Resume</h3><input type="file" agent-id="agent-e5"><button agent-id="agent-d4">Review</button></form>'
+    text = observer.describe(observer.simplify(next_step))
+    assert text.splitlines() == ["Step: Resume", 'agent-e5 input[file] ""', 'agent-d4 button "Review"']
@@ -0,0 +1,64 @@
+from job_store import JobStore, job_id_for
+
+def card(job_id, title="Backend Engineer", company="Acme"):
+    return {"job_id": job_id, "title": title, "company": company, "location": "London (Remote)",
+            "url": f"https://www.linkedin.com/jobs/view/{job_id}/", "is_easy_apply": "Yes"}
+
+def test_only_new_or_changed_jobs_are_fetched(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    to_fetch, unchanged = store.plan_fetch([card("1"), card("2")])
+    assert len(to_fetch) == 2 and not unchanged
+    store.record_jobs([dict(job, description=f"desc {job['job_id']}") for job in to_fetch])
+
+    to_fetch, unchanged = store.plan_fetch([card("1"), card("2", title="Senior Backend Engineer"), card("3")])
+    assert [job["job_id"] for job in to_fetch] == ["2", "3"]
+    assert unchanged == [dict(card("1"), description="desc 1")]
+
+def test_changed_descriptions_and_stale_jobs(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.record_jobs([dict(card("1"), description="old"), dict(card("2"), description="same")])
+    assert store.record_jobs([dict(card("1"), description="new"), dict(card("2"), description="same")]) == 1
+
+    assert store.mark_stale({"1"}) == 1
+    assert [job["job_id"] for job in store.active_jobs()] == ["1"]
+    assert store.get_job("2")["stale"] == 1
+    # A job that shows up again is no longer stale.
+    store.record_jobs([card("2")], fetched=False)
+    assert store.get_job("2")["stale"] == 0
+
+def test_failed_fetch_is_retried_next_time(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.record_jobs([card("1")], fetched=False)
+    to_fetch, _ = store.plan_fetch([card("1")])
+    assert [job["job_id"] for job in to_fetch] == ["1"]
+
+def test_filter_decisions_materials_and_applications(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.record_jobs([dict(card("1"), description="a"), dict(card("2", company="Initech"), description="b")])
+    store.record_filter_decisions([("1", True, None), ("2", False, "Contains excluded keyword: 'senior'")])
+    assert [job["job_id"] for job in store.kept_jobs(easy_apply_only=True)] == ["1"]
+    assert store.filter_decision("2")["reason"] == "Contains excluded keyword: 'senior'"
+
+    resume, letter = tmp_path / "r.docx", tmp_path / "c.docx"
+    store.record_materials("1", str(resume), str(letter))
+    assert not store.has_materials("1")  # files don't exist yet
+    resume.write_text("r"); letter.write_text("c")
+    assert store.has_materials("1")
+
+    store.record_application(card("1"), "APPLICATION_FAILED")
+    assert not store.has_applied("1")
+    store.record_application(card("1"), "APPLIED_SUCCESSFULLY")
+    assert store.has_applied("1") and not store.has_applied("2")
+    assert [a["status"] for a in store.applications(job_id="1")] == ["APPLIED_SUCCESSFULLY", "APPLICATION_FAILED"]
+    assert store.status_counts() == {"APPLICATION_FAILED": 1, "APPLIED_SUCCESSFULLY": 1}
+
+def test_import_legacy_csv(tmp_path):
+    path = tmp_path / "scraped_jobs.csv"
+    path.write_text(
+        "title,company,location,url,is_easy_apply,description\n"
+        "Back End Developer,Corecom,Manchester,https://www.linkedin.com/jobs/view/4277386608/,Yes,Python\n"
+    )
+    store = JobStore(str(tmp_path / "jobs.db"))
+    assert store.import_csv(str(path)) == 1
+    assert store.get_job("4277386608")["description"] == "Python"
+    assert job_id_for({"url": "https://www.linkedin.com/jobs/view/42/"}) == "42"
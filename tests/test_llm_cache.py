@@ -0,0 +1,33 @@
+from llm_cache import LLMCache
+
+def test_get_returns_stored_value_and_counts_hits(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.db"))
+    key = LLMCache.make_key("tailor_resume", "model", "1", {"summary": "x"}, "job")
+    assert cache.get(key) is None
+    cache.set(key, {"tailored_summary": "y"})
+    assert cache.get(key) == {"tailored_summary": "y"}
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    LLMCache(path=path).set("k", "cover letter")
+    assert LLMCache(path=path).get("k") == "cover letter"
+
+def test_key_depends_on_every_part_but_not_dict_order():
+    base = LLMCache.make_key("tailor_resume", "model", "1", {"a": 1, "b": 2}, "job")
+    assert base == LLMCache.make_key("tailor_resume", "model", "1", {"b": 2, "a": 1}, "job")
+    assert base != LLMCache.make_key("tailor_resume", "model", "2", {"a": 1, "b": 2}, "job")
+    assert base != LLMCache.make_key("tailor_resume", "other-model", "1", {"a": 1, "b": 2}, "job")
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.db"), max_entries=2)
+    cache.set("old", 1)
+    cache.set("newer", 2)
+    cache.get("old")  # "newer" is now the least recently used
+    cache.set("newest", 3)
+    assert cache.get("newer") is None
+    assert cache.get("old") == 1
+    assert cache.get("newest") == 3
+
+def test_disabled_in_config():
+    assert LLMCache.from_config({"llm_cache": {"enabled": False}}) is None
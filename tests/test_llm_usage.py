@@ -0,0 +1,43 @@
+import json
+from unittest.mock import MagicMock
+
+from ai_agent import get_ai_answer_for_question
+from llm_usage import InstrumentedClient, UsageLog, job_context, percentile
+
+def mock_client(content, usage=None):
+    client = MagicMock()
+    response = client.chat.completions.create.return_value
+    response.choices = [MagicMock(message=MagicMock(content=content, tool_calls=None))]
+    response.usage = usage
+    return client
+
+def test_calls_are_logged_with_site_job_tokens_and_cost(tmp_path):
+    log = UsageLog(path=str(tmp_path / "calls.jsonl"))
+    client = InstrumentedClient(mock_client("An answer", usage=MagicMock(prompt_tokens=1000, completion_tokens=100)), log)
+    with job_context("42"):
+        assert get_ai_answer_for_question(client, "Why us?", []) == "An answer"
+    # Without usage in the response the tokens are estimated locally.
+    get_ai_answer_for_question(InstrumentedClient(mock_client("Short"), log), "Why?", [])
+
+    first, second = [json.loads(line) for line in open(log.path)]
+    assert first["site"] == "ai_agent.get_ai_answer_for_question"
+    assert (first["job_id"], first["model"], first["prompt_tokens"], first["completion_tokens"]) == ("42", "gpt-4-turbo-preview", 1000, 100)
+    assert first["cost_usd"] == 0.013 and first["estimated"] is False
+    assert second["job_id"] is None and second["estimated"] is True
+    assert second["prompt_tokens"] > 0 and second["completion_tokens"] == 1
+
+def test_failed_calls_are_logged_and_summarised(tmp_path):
+    log = UsageLog(path=str(tmp_path / "calls.jsonl"))
+    client = MagicMock()
+    client.chat.completions.create.side_effect = TimeoutError()
+    instrumented = InstrumentedClient(client, log)
+    with job_context("7"):
+        try:
+            instrumented.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+        except TimeoutError:
+            pass
+    summary = log.summary()
+    assert summary["calls"] == summary["errors"] == summary["jobs"] == 1
+    assert summary["calls_per_job"] == 1.0
+    assert percentile([0.1, 0.2, 0.3, 0.4, 5.0], 0.5) == 0.3
+    assert percentile([0.1, 0.2, 0.3, 0.4, 5.0], 0.95) == 5.0
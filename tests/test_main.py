@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock, call, patch
+
+import pandas as pd
+
+from main import process_jobs_interactively, process_jobs_pipelined
+from run_journal import FAILED, MATERIALS_READY
+
+JOBS = pd.DataFrame([{"job_id": "1", "title": "Backend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/1/"}])
+CONFIG = {"resume_path": "resume.pdf", "waits": {"between_jobs_seconds": 0}}
+
+def _store():
+    store = MagicMock()
+    store.has_applied.return_value = False
+    store.has_materials.return_value = False
+    return store
+
+def _run(process):
+    store, journal = _store(), MagicMock()
+    with patch("main.input", return_value="y"), \
+         patch("main.generate_materials", return_value=({"summary": "x"}, "Dear...", None)), \
+         patch("main.save_job_materials", return_value=(None, None)), \
+         patch("main.apply_to_job_agent") as apply:
+        process(CONFIG, MagicMock(), MagicMock(size=1), JOBS, store, journal)
+    return store, journal, apply
+
+def test_interactive_run_fails_the_job_when_materials_cannot_be_saved():
+    store, journal, apply = _run(process_jobs_interactively)
+    assert call("1", FAILED, reason="MATERIALS_SAVE_FAILED") in journal.record.call_args_list
+    assert call("1", MATERIALS_READY) not in journal.record.call_args_list
+    store.record_materials.assert_not_called()
+    apply.assert_not_called()
+
+def test_pipelined_run_fails_the_job_when_materials_cannot_be_saved():
+    store, journal, apply = _run(process_jobs_pipelined)
+    assert call("1", FAILED, reason="MATERIALS_SAVE_FAILED") in journal.record.call_args_list
+    assert call("1", MATERIALS_READY) not in journal.record.call_args_list
+    store.record_application.assert_called_once()
+    apply.assert_not_called()
@@ -0,0 +1,94 @@
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+from job_store import JobStore
+from file_generator import save_job_materials
+from materials import prepare_materials, generate_materials
+
+CONFIG = {
+    "personal_info": {"first_name": "Jane", "last_name": "Doe"},
+    "resume_data": {"summary": "old"},
+    "pipeline": {"prepare_workers": 4},
+    "llm_cache": {"enabled": False},
+}
+
+def make_jobs(n):
+    return pd.DataFrame([
+        {"job_id": str(i), "title": f"Engineer {i}", "company": f"Acme{i}", "url": f"https://example.com/jobs/{i}", "description": "Python"}
+        for i in range(n)
+    ])
+
+@patch("materials.generate_cover_letter", return_value="Dear team")
+@patch("materials.tailor_resume_for_job", return_value={"tailored_summary": "s", "tailored_work_experience": []})
+def test_generate_materials_success(mock_tailor, mock_cover):
+    job = make_jobs(1).iloc[0]
+    assert generate_materials(None, CONFIG, job) == ({"tailored_summary": "s", "tailored_work_experience": []}, "Dear team", None)
+    assert mock_cover.call_args[0][-1] == "Jane Doe"
+
+@patch("materials.tailor_resume_for_job", return_value=None)
+def test_generate_materials_reports_failure(mock_tailor):
+    assert generate_materials(None, CONFIG, make_jobs(1).iloc[0]) == (None, None, "AI_RESUME_FAILED")
+
+@patch("materials.generate_cover_letter", return_value="Dear team")
+@patch("materials.tailor_resume_for_job", return_value={"tailored_summary": "s", "tailored_work_experience": []})
+def test_prepare_materials_records_ready_jobs_and_skips_them_next_time(mock_tailor, mock_cover, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    jobs = make_jobs(5)
+
+    assert prepare_materials(CONFIG, None, jobs, store) == 5
+    assert all(store.has_materials(job_id) for job_id in jobs['job_id'])
+    assert mock_tailor.call_count == 5
+
+    assert prepare_materials(CONFIG, None, jobs, store) == 0
+    assert mock_tailor.call_count == 5
+
+@patch("materials.close_async_ai_clients", new_callable=AsyncMock)
+@patch("materials.get_async_ai_client")
+@patch("materials.generate_cover_letter_async", new_callable=AsyncMock, return_value="Dear team")
+@patch("materials.tailor_resume_for_job_async", new_callable=AsyncMock, return_value={"tailored_summary": "s", "tailored_work_experience": []})
+def test_prepare_materials_async_prepares_every_job_on_one_loop(mock_tailor, mock_cover, mock_client, mock_close, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    jobs = make_jobs(5)
+    config = dict(CONFIG, pipeline={"async_prepare": True, "async_concurrency": 2})
+
+    assert prepare_materials(config, None, jobs, store) == 5
+    assert all(store.has_materials(job_id) for job_id in jobs['job_id'])
+    assert mock_tailor.await_count == mock_cover.await_count == 5
+    mock_client.assert_called_once_with(config)
+    mock_close.assert_awaited_once()
+
+@patch("materials.close_async_ai_clients", new_callable=AsyncMock)
+@patch("materials.get_async_ai_client")
+@patch("materials.generate_cover_letter_async", new_callable=AsyncMock, return_value="Dear team")
+@patch("materials.tailor_resume_for_job_async", new_callable=AsyncMock, return_value={"tailored_summary": "s", "tailored_work_experience": []})
+def test_prepare_materials_async_survives_one_job_failing(mock_tailor, mock_cover, mock_client, mock_close, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    jobs = make_jobs(5)
+    config = dict(CONFIG, pipeline={"async_prepare": True, "async_concurrency": 2})
+
+    def save(title, company, *args, **kwargs):
+        if kwargs.get('job_id') == "2":
+            raise OSError("disk full")
+        return save_job_materials(title, company, *args, **kwargs)
+
+    with patch("materials.save_job_materials", side_effect=save):
+        assert prepare_materials(config, None, jobs, store) == 4
+    assert [store.has_materials(job_id) for job_id in jobs['job_id']] == [True, True, False, True, True]
+    mock_close.assert_awaited_once()
+
+@patch("materials.generate_cover_letter", side_effect=lambda client, resume, title, company, name, cache=None: f"Letter for {title}")
+@patch("materials.tailor_resume_for_job", return_value={"tailored_summary": "s", "tailored_work_experience": []})
+def test_jobs_with_the_same_company_and_title_word_keep_separate_files(mock_tailor, mock_cover, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    jobs = pd.DataFrame([
+        {"job_id": "1", "title": "Senior Backend Engineer", "company": "Acme", "url": "https://example.com/jobs/1", "description": "Python"},
+        {"job_id": "2", "title": "Senior Data Engineer", "company": "Acme", "url": "https://example.com/jobs/2", "description": "SQL"},
+    ])
+
+    assert prepare_materials(CONFIG, None, jobs, store) == 2
+    letters = [store.get_materials(job_id)['cover_letter_file'] for job_id in ("1", "2")]
+    assert letters[0] != letters[1]
+    assert [open(path).read() for path in letters] == ["Letter for Senior Backend Engineer", "Letter for Senior Data Engineer"]
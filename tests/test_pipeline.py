@@ -0,0 +1,54 @@
+import threading
+import time
+import pytest
+from pipeline import Pipeline, Stage
+
+def test_items_flow_through_every_stage_in_order():
+    results = []
+    pipeline = Pipeline([
+        Stage("double", lambda x: x * 2),
+        Stage("collect", lambda x: results.append(x) or x),
+    ])
+    stats = pipeline.run(range(5))
+    assert results == [0, 2, 4, 6, 8]
+    assert stats["items"] == 5
+    assert stats["stages"]["collect"]["processed"] == 5
+
+def test_none_and_exceptions_drop_the_item():
+    results = []
+
+    def flaky(x):
+        if x == 1:
+            return None
+        if x == 2:
+            raise RuntimeError("boom")
+        return x
+
+    stats = Pipeline([Stage("flaky", flaky), Stage("collect", results.append)]).run(range(4))
+    assert results == [0, 3]
+    assert stats["stages"]["flaky"]["dropped"] == 2
+
+def test_stages_overlap_and_respect_worker_limits():
+    active = {"slow": 0}
+    peak = {"slow": 0}
+    lock = threading.Lock()
+
+    def slow(x):
+        with lock:
+            active["slow"] += 1
+            peak["slow"] = max(peak["slow"], active["slow"])
+        time.sleep(0.05)
+        with lock:
+            active["slow"] -= 1
+        return x
+
+    pipeline = Pipeline([
+        Stage("prepare", lambda x: (time.sleep(0.05), x)[1], workers=4),
+        Stage("slow", slow, workers=2),
+    ], queue_size=2)
+    pipeline.run(range(8))
+    assert peak["slow"] == 2
+
+def test_pipeline_requires_a_stage():
+    with pytest.raises(ValueError):
+        Pipeline([])
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from ranking import RankingIndex, build_query, rank_jobs, tokenize
+
+CONFIG = {
+    "resume_data": {"summary": "Backend engineer building Python APIs", "skills": {"languages": ["Python", "SQL"], "frameworks": ["Django"]}},
+    "job_search_criteria": {"keywords": "Backend Developer"},
+}
+
+def make_jobs():
+    return pd.DataFrame([
+        {"job_id": "1", "title": "Frontend Developer", "company": "A", "description": "React, CSS and TypeScript for our web app."},
+        {"job_id": "2", "title": "Backend Developer", "company": "B", "description": "Python, Django and SQL. Build backend APIs."},
+        {"job_id": "3", "title": "Data Analyst", "company": "C", "description": "SQL reporting and dashboards."},
+    ])
+
+def test_tokenize_keeps_tech_terms():
+    assert tokenize("We use C++, C# and Node.js.") == ["use", "c++", "c#", "node.js"]
+
+def test_skills_and_keywords_are_emphasised():
+    query = build_query(CONFIG["resume_data"], CONFIG["job_search_criteria"]["keywords"])
+    assert query["python"] == 3 and query["developer"] == 2 and query["apis"] == 1
+
+def test_rank_jobs_orders_by_relevance_and_applies_cutoffs(tmp_path):
+    index = RankingIndex(str(tmp_path / "ranking.db"))
+    ranked = rank_jobs(CONFIG, make_jobs(), index)
+    assert ranked["job_id"].tolist() == ["2", "3", "1"]
+    assert ranked["relevance_score"].is_monotonic_decreasing
+
+    config = dict(CONFIG, ranking={"top_k": 1})
+    assert rank_jobs(config, make_jobs(), index)["job_id"].tolist() == ["2"]
+
+def test_index_only_tokenizes_new_or_changed_descriptions(tmp_path):
+    index = RankingIndex(str(tmp_path / "ranking.db"))
+    jobs = make_jobs().to_dict("records")
+    assert index.index(jobs) == 3
+    assert index.index(jobs) == 0
+    jobs[0]["description"] = "Now a Python role"
+    assert index.index(jobs) == 1
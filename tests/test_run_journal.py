@@ -0,0 +1,35 @@
+from run_journal import RunJournal, QUEUED, MATERIALS_READY, APPLYING, APPLIED, FAILED
+
+def test_resume_returns_latest_state_of_the_last_run(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    old = RunJournal(path)
+    old.start()
+    old.record("1", APPLIED)
+    old.close()
+
+    journal = RunJournal(path)
+    journal.start()
+    for job_id in ("1", "2", "3"):
+        journal.record(job_id, QUEUED)
+    journal.record("1", MATERIALS_READY)
+    journal.record("1", APPLYING)
+    journal.record("2", FAILED, reason="AI_RESUME_FAILED")
+    journal.close()
+    # Simulate a crash halfway through writing a line.
+    with open(path, "a") as f:
+        f.write('{"run_id": "x", "job_')
+
+    resumed = RunJournal(path)
+    states = resumed.start(resume=True)
+    assert {job_id: entry["state"] for job_id, entry in states.items()} == {"1": APPLYING, "2": FAILED, "3": QUEUED}
+    assert resumed.is_done("2") and not resumed.is_done("1")
+    resumed.record("1", APPLIED)
+    resumed.close()
+
+    assert RunJournal(path).start(resume=True)["1"]["state"] == APPLIED
+
+def test_resume_without_a_journal_starts_a_new_run(tmp_path):
+    journal = RunJournal(str(tmp_path / "journal.jsonl"))
+    assert journal.start(resume=True) == {}
+    assert journal.run_id
+    journal.close()
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+from scraper import linkedin_scraper, parse_card_text, scroll_until_converged
+
+CONFIG = {"waits": {"scroll": 0.05, "scroll_step": 0.01}}
+
+def test_parse_card_text():
+    text = "Back End Developer\nCorecom Consulting\nManchester Area, United Kingdom (Remote)\nEasy Apply"
+    parsed = parse_card_text(text)
+    assert parsed["title"] == "Back End Developer"
+    assert parsed["company"] == "Corecom Consulting"
+    assert parsed["location"] == "Manchester Area, United Kingdom (Remote)"
+
+def test_scroll_stops_once_card_count_is_stable_at_the_bottom():
+    driver = MagicMock()
+    counts = iter([7, 7, 14, 14, 25] + [25] * 50)
+    driver.find_elements.side_effect = lambda *args: [None] * next(counts)
+    # Not at the bottom for the first two scrolls, then at the bottom.
+    driver.execute_script.side_effect = [False, False] + [True] * 50
+    assert scroll_until_converged(driver, CONFIG, stable_attempts=2) == 25
+    assert driver.execute_script.call_count <= 6
+
+def test_scroll_is_bounded():
+    driver = MagicMock()
+    driver.find_elements.return_value = []
+    driver.execute_script.return_value = False
+    assert scroll_until_converged(driver, CONFIG, max_scrolls=5) == 0
+    assert driver.execute_script.call_count == 5
+
+def _run_scraper(monkeypatch, pages_with_cards, max_pages=40):
+    """Runs linkedin_scraper against mocks; returns the mocked job store."""
+    monkeypatch.setenv("LINKEDIN_EMAIL", "me@example.com")
+    monkeypatch.setenv("LINKEDIN_PASSWORD", "secret")
+    config = dict(CONFIG, job_search_criteria={"keywords": "python", "location": "Remote"}, scraper={"max_pages": max_pages})
+    store = MagicMock()
+    store.plan_fetch.return_value = ([], [])
+    store.active_jobs.return_value = []
+    driver = MagicMock(current_url="https://www.linkedin.com/jobs/search/")
+    driver.execute_script.return_value = "complete"
+    loads = iter(pages_with_cards)
+    with patch("scraper.create_driver", return_value=driver), \
+         patch("scraper.ensure_logged_in"), patch("scraper.SessionStore"), \
+         patch("scraper.get_job_store", return_value=store), \
+         patch("scraper.wait_for", side_effect=lambda *args: next(loads, False)), \
+         patch("scraper.scroll_until_converged", return_value=25), \
+         patch("scraper.collect_cards_from_page", return_value=[{"job_id": "1"}]), \
+         patch("scraper.fetch_descriptions", return_value=[]):
+        linkedin_scraper(config)
+    return store
+
+def test_jobs_are_not_marked_stale_when_the_first_page_times_out(monkeypatch):
+    store = _run_scraper(monkeypatch, [False])
+    store.mark_stale.assert_not_called()
+
+def test_jobs_are_not_marked_stale_when_max_pages_cuts_the_search_short(monkeypatch):
+    store = _run_scraper(monkeypatch, [True, True], max_pages=2)
+    store.mark_stale.assert_not_called()
+
+def test_jobs_are_marked_stale_after_an_empty_page_ends_the_results(monkeypatch):
+    store = _run_scraper(monkeypatch, [True, False])
+    store.mark_stale.assert_called_once()
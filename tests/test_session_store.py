@@ -0,0 +1,63 @@
+import json
+import time
+import threading
+from unittest.mock import patch, MagicMock
+from session_store import SessionStore, ensure_logged_in
+
+def make_driver(cookies=None):
+    driver = MagicMock()
+    driver.get_cookies.return_value = cookies or [{"name": "li_at", "value": "token", "expiry": int(time.time()) + 3600}]
+    driver.execute_script.return_value = {"voyager": "state"}
+    return driver
+
+def test_save_and_restore_round_trip(tmp_path):
+    path = tmp_path / "session.json"
+    store = SessionStore(path=str(path), account="me@example.com")
+    store.save(make_driver())
+    assert json.loads(path.read_text())["account"] == "me@example.com"
+
+    fresh_store = SessionStore(path=str(path), account="me@example.com")
+    driver = MagicMock()
+    assert fresh_store.restore(driver) is True
+    driver.add_cookie.assert_called_once()
+    assert driver.execute_script.call_args[0][1] == {"voyager": "state"}
+
+def test_expired_or_foreign_session_is_ignored(tmp_path):
+    path = tmp_path / "session.json"
+    expired = [{"name": "li_at", "value": "token", "expiry": int(time.time()) - 10}]
+    SessionStore(path=str(path), account="me@example.com").save(make_driver(expired))
+    assert SessionStore(path=str(path), account="me@example.com").load() is None
+
+    SessionStore(path=str(path), account="me@example.com").save(make_driver())
+    assert SessionStore(path=str(path), account="someone@else.com").load() is None
+
+@patch("session_store.linkedin_login")
+@patch("session_store.probe_session", return_value=True)
+def test_ensure_logged_in_skips_login_when_probe_passes(mock_probe, mock_login, tmp_path):
+    store = SessionStore(path=str(tmp_path / "session.json"), account="me@example.com")
+    store.save(make_driver())
+    assert ensure_logged_in(MagicMock(), store) is True
+    mock_login.assert_not_called()
+
+@patch("session_store.linkedin_login")
+@patch("session_store.probe_session", return_value=False)
+def test_ensure_logged_in_falls_back_to_login_and_saves(mock_probe, mock_login, tmp_path):
+    path = tmp_path / "session.json"
+    store = SessionStore(path=str(path), account="me@example.com")
+    store.save(make_driver())
+    driver = make_driver()
+    assert ensure_logged_in(driver, store) is False
+    mock_login.assert_called_once_with(driver, base_url="https://www.linkedin.com")
+    assert path.exists()
+
+@patch("session_store.linkedin_login")
+@patch("session_store.probe_session", return_value=True)
+def test_concurrent_drivers_share_one_login(mock_probe, mock_login, tmp_path):
+    store = SessionStore(path=str(tmp_path / "session.json"), account="me@example.com")
+    mock_login.side_effect = lambda driver, base_url: time.sleep(0.05)
+    threads = [threading.Thread(target=ensure_logged_in, args=(make_driver(), store)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    mock_login.assert_called_once()
@@ -0,0 +1,148 @@
+import glob
+import json
+import os
+import time
+
+import pytest
+from bs4 import BeautifulSoup
+
+from ai_agent import INTERACTIVE_TAGS, clean_html, simplify_html
+
+ICON = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" width="24" height="24" aria-hidden="true" '
+    'role="none" data-supported-dps="24x24"><use href="#{0}-medium" width="24" height="24"></use></svg>'
+)
+
+def linkedin_page(cards=60, rendered=25):
+    """
+    A saved-page stand-in with the make-up of a LinkedIn job search page
+    source: head assets, inline scripts, hidden <code> data islands, Ember
+    <!----> comments and indentation between tags, nested wrapper divs,
+    icon SVGs, hidden tracking markup, cards past the viewport left as
+    empty placeholders, a job details pane and an open Easy Apply modal.
+    """
+    parts = ['<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Jobs | LinkedIn</title>']
+    parts += [f'<link rel="stylesheet" href="https://static.licdn.com/sc/h/{i}.css">' for i in range(30)]
+    parts.append('<style>' + ''.join(f'.artdeco-button--{i}{{margin:{i}px}}' for i in range(2000)) + '</style>')
+    parts += ['<script>window.__data_%d = %s;</script>' % (i, json.dumps({"k": ["v" * 50] * 200})) for i in range(20)]
+    parts.append('</head><body class="render-mode-BIGPIPE">')
+    parts.append('<header class="global-nav"><nav>' + ''.join(
+        f'<a href="/nav/{i}" class="global-nav__primary-link">{ICON.format("home")}<span>Nav {i}</span></a>' for i in range(10)
+    ) + '</nav></header>')
+    for i in range(40):
+        data = json.dumps({"data": {"elements": [{"urn": f"urn:li:fs_job:{j}", "text": "y" * 80} for j in range(60)]}})
+        parts.append(f'<code style="display: none" id="bpr-guid-{i}">{data.replace(chr(34), "&quot;")}</code>')
+    parts.append('<main class="scaffold-layout__main"><div class="jobs-search-results-list"><ul>')
+    for i in range(cards):
+        job_id = 4000000000 + i
+        if i >= rendered:
+            # Cards scrolled out of view are left as empty placeholders.
+            parts.append(f'<li class="jobs-search-results__list-item occludable-update ember-view" data-occludable-job-id="{job_id}"></li>')
+            continue
+        parts.append(
+            f'<li class="jobs-search-results__list-item occludable-update" data-occludable-job-id="{job_id}">'
+            + '<div class="ember-view"><div><div class="full-width">' +
+            f'<div data-job-id="{job_id}" class="job-card-container relative job-card-list">'
+            f'<div class="artdeco-entity-lockup"><div class="artdeco-entity-lockup__image"><div class="ivm-image-view-model">'
+            f'<img src="https://media.licdn.com/{i}.png" alt="" width="56" height="56"></div></div>'
+            f'<div class="artdeco-entity-lockup__content"><div class="full-width artdeco-entity-lockup__title">'
+            f'<a class="job-card-container__link" href="/jobs/view/{job_id}/">'
+            f'<span aria-hidden="true"><strong>Backend Engineer {i}</strong></span>'
+            f'<span class="visually-hidden">Backend Engineer {i}</span></a></div>'
+            f'<div class="artdeco-entity-lockup__subtitle"><div><span>Company {i}</span></div></div>'
+            f'<div class="artdeco-entity-lockup__caption"><ul class="job-card-container__metadata-wrapper">'
+            f'<li><span>London, England, United Kingdom (Remote)</span></li></ul></div>'
+            f'<ul class="job-card-list__footer-wrapper"><li>{ICON.format("linkedin-bug")}<span>Easy Apply</span></li>'
+            f'<li><time datetime="2025-07-01">1 day ago</time></li></ul></div>'
+            f'<div class="job-card-list__actions"><button aria-label="Dismiss Backend Engineer {i} job" class="artdeco-button">'
+            f'{ICON.format("close")}</button></div></div></div>'
+            f'<div class="job-card-container__footer-item" aria-hidden="true"><div class="tvm__text"><span></span><span></span></div></div>'
+            f'<div hidden>{"<span>impression</span>" * 10}</div></div></div></div></li>'
+        )
+    parts.append('</ul></div><div class="jobs-search__job-details"><div class="jobs-details__main-content"><div id="job-details">'
+                 '<h2>About the job</h2>' + '<p>We are hiring a backend engineer to build our platform.</p>' * 30 + '</div></div></div>')
+    parts.append('</main>')
+    parts.append(
+        '<div class="artdeco-modal jobs-easy-apply-modal" role="dialog"><form>'
+        '<label for="phone">Mobile phone number</label><input id="phone" type="text" required>'
+        '<div style="display:none"><input type="file" name="resume" accept=".pdf"></div>'
+        '<select id="cc"><option>Select an option</option><option>United Kingdom (+44)</option></select>'
+        f'<button aria-label="Continue to next step" class="artdeco-button">{ICON.format("arrow")}<span>Next</span></button>'
+        '</form></div>'
+    )
+    parts.append('<footer>' + ''.join(f'<a href="/f/{i}">Footer {i}</a>' for i in range(40)) + '</footer></body></html>')
+    # Ember renders an empty comment and a newline with indentation between most tags.
+    return "".join(parts).replace("><", ">\n        <!----><")
+
+def bs4_simplify(html_content, for_application=False):
+    """The BeautifulSoup-only cleaner that simplify_html replaced, kept as the baseline."""
+    soup = BeautifulSoup(html_content, 'lxml')
+    for tag in soup.find_all(['script', 'style', 'meta', 'link', 'header', 'footer', 'nav']):
+        tag.decompose()
+    if for_application:
+        interactive_tags = soup.find_all(INTERACTIVE_TAGS)
+        used_ids = {tag['agent-id'] for tag in interactive_tags if tag.has_attr('agent-id')}
+        i = 0
+        for tag in interactive_tags:
+            if tag.has_attr('agent-id'):
+                continue
+            while f"agent-{i}" in used_ids:
+                i += 1
+            tag['agent-id'] = f"agent-{i}"
+            i += 1
+    return soup
+
+def load_pages():
+    """Saved dumps (e.g. debug_page_for_ai.html) matched by SIMPLIFY_BENCH_PAGES, or the synthetic page."""
+    pattern = os.getenv("SIMPLIFY_BENCH_PAGES")
+    paths = sorted(glob.glob(pattern)) if pattern else []
+    if paths:
+        return [open(path, encoding='utf-8').read() for path in paths]
+    return [linkedin_page()]
+
+def timed(function, pages, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            # Callers prompt with the prettified HTML or its text.
+            function(page, True).prettify()
+    return time.perf_counter() - start
+
+def test_clean_html_keeps_what_the_agent_needs():
+    soup = simplify_html(linkedin_page(cards=2), for_application=True)
+    assert soup.find('script') is None and soup.find('svg') is None and soup.find('code') is None
+    assert "impression" not in soup.get_text()
+    assert [a['href'] for a in soup.find_all('a')] == ["/jobs/view/4000000000/", "/jobs/view/4000000001/"]
+    # Hidden styled file inputs survive; every interactive element has an id.
+    assert soup.find('input', type='file') is not None
+    assert all(tag.get('agent-id') for tag in soup.find_all(INTERACTIVE_TAGS))
+    assert soup.find('button', attrs={'aria-label': 'Continue to next step'}).get_text(strip=True) == "Next"
+    assert "Backend Engineer 1" in soup.get_text(" ", strip=True)
+
+def test_clean_html_preserves_existing_ids_and_text_after_removed_elements():
+    html = '<div><button agent-id="agent-0">A</button><span hidden>x</span> after <input></div>'
+    cleaned = clean_html(html, for_application=True)
+    assert 'agent-id="agent-0"' in cleaned and 'agent-id="agent-1"' in cleaned
+    assert " after " in cleaned and ">x<" not in cleaned
+
+def test_clean_html_keeps_a_root_with_a_single_child():
+    modal = (
+        '<div class="jobs-easy-apply-modal"><div class="content"><h3>Contact</h3>'
+        '<label for="p">Phone</label><input id="p" name="p"><button>Next</button></div></div>'
+    )
+    cleaned = clean_html(modal, for_application=True)
+    assert cleaned.startswith('<div class="jobs-easy-apply-modal"><div class="content"><h3>Contact</h3>')
+    assert 'agent-id="agent-0"' in cleaned and ">Next</button>" in cleaned
+    assert clean_html('<div><input></div>') == '<div><input></div>'
+
+def test_clean_html_of_only_comments_is_empty():
+    assert clean_html('<!-- x -->') == ""
+
+@pytest.mark.skipif(not os.getenv("SIMPLIFY_BENCH"), reason="wall-clock benchmark; set SIMPLIFY_BENCH=1 to run it")
+def test_benchmark_simplify_html_against_bs4_baseline():
+    pages = load_pages()
+    timed(simplify_html, pages, repeat=1)  # warm up
+    baseline = timed(bs4_simplify, pages)
+    fast = timed(simplify_html, pages)
+    print(f"\nbs4 cleaner: {baseline:.3f}s, lxml cleaner: {fast:.3f}s, speedup {baseline / fast:.1f}x")
+    assert baseline / fast >= 5
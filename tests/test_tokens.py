@@ -0,0 +1,7 @@
+import tokens
+
+def test_count_tokens_estimate_without_tiktoken(monkeypatch):
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    assert tokens.count_tokens("") == 0
+    assert tokens.count_tokens('agent-1 input "Phone"') == 7
+    assert tokens.count_tokens("internationalization") == 4
@@ -0,0 +1,41 @@
+import json
+
+import tracing
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        return {"value": None}
+
+def test_spans_and_driver_commands_are_saved_as_chrome_trace(tmp_path):
+    tracer = tracing.start_tracing({"tracing": {"enabled": True, "path": str(tmp_path / "trace.json")}})
+    driver = tracing.trace_driver(FakeDriver())
+    try:
+        with tracing.span("run", "run"):
+            with tracing.span("apply", "job", job_id="42"):
+                driver.execute("findElement", {"using": "css selector", "value": "div"})
+                driver.execute("executeScript", {"script": "return 1;", "args": []})
+    finally:
+        tracing.finish_tracing()
+
+    assert driver.commands == ["findElement", "executeScript"]
+    events = json.load(open(tracer.path))["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert set(spans) == {"run", "apply", "findElement", "executeScript"}
+    assert spans["apply"]["args"] == {"job_id": "42"}
+    assert spans["executeScript"]["args"] == {"script": "return 1;"}
+    # Children lie within their parents on the same thread.
+    run, command = spans["run"], spans["findElement"]
+    assert run["ts"] <= command["ts"] and command["ts"] + command["dur"] <= run["ts"] + run["dur"]
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in events)
+
+def test_tracing_is_a_no_op_when_disabled():
+    assert tracing.start_tracing({}) is None
+    driver = FakeDriver()
+    assert tracing.trace_driver(driver) is driver and "execute" not in vars(driver)
+    with tracing.span("filter"):
+        pass
+    tracing.finish_tracing()
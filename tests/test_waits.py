@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+from waits import wait_for, wait_timeout, card_count_changed, network_idle, value_changed, wait_stats
+
+def test_wait_returns_as_soon_as_condition_holds():
+    driver = MagicMock()
+    driver.find_elements.side_effect = [[1] * 25, [1] * 25, [1] * 50]
+    wait_stats.reset()
+    assert wait_for(driver, card_count_changed(25), timeout=2, label="scroll", poll=0.01) == 50
+    stats = wait_stats.snapshot()["scroll"]
+    assert stats["count"] == 1 and stats["timeouts"] == 0
+    assert stats["total"] < 1
+
+def test_wait_times_out_without_raising():
+    driver = MagicMock()
+    driver.find_elements.return_value = [1] * 25
+    wait_stats.reset()
+    assert wait_for(driver, card_count_changed(25), timeout=0.05, label="scroll", poll=0.01) is None
+    assert wait_stats.snapshot()["scroll"]["timeouts"] == 1
+
+def test_network_idle_needs_a_quiet_period():
+    driver = MagicMock()
+    driver.execute_script.side_effect = [["loading", 3], ["complete", 5]] + [["complete", 5]] * 100
+    assert wait_for(driver, network_idle(0.05), timeout=2, label="settle", poll=0.01) is True
+
+def test_value_changed():
+    driver = MagicMock()
+    reads = iter(["step-1", "step-1", "step-2"])
+    assert wait_for(driver, value_changed(lambda d: next(reads), "step-1"), timeout=2, label="form_step", poll=0.01) is True
+
+def test_wait_timeout_uses_config_override():
+    assert wait_timeout({"waits": {"scroll": 12}}, "scroll") == 12
+    assert wait_timeout({}, "scroll") == 5
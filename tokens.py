@@ -0,0 +1,30 @@
+# tokens.py
+
+import re
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # listed in requirements.txt; fall back to an estimate without it
+    tiktoken = None
+
+DEFAULT_ENCODING = "cl100k_base"
+# Words, numbers and single punctuation marks, roughly how BPE tokenizers
+# split English text and markup.
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+@lru_cache(maxsize=None)
+def _encoding(name: str):
+    return tiktoken.get_encoding(name)
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """
+    Counts the tokens in `text` with tiktoken when it is installed. Without
+    it, each word counts one token per six characters and each punctuation
+    mark counts one, which is close enough to pack prompts to a budget.
+    """
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoding(encoding).encode(text))
+    return sum((len(piece) + 5) // 6 for piece in _PIECE_RE.findall(text))
@@ -0,0 +1,140 @@
+# tracing.py
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+class Tracer:
+    """
+    Collects nested timing spans (run, phase, job, agent cycle, LLM call,
+    WebDriver command) and saves them as Chrome trace-event JSON, which
+    chrome://tracing, Perfetto or speedscope show as a flame chart.
+
+    Spans are "complete" events; the viewer nests them by time on each
+    thread, so pipeline workers show up as separate tracks.
+    """
+
+    def __init__(self, path: str = "trace.json", driver_commands: bool = True):
+        self.path = path
+        self.driver_commands = driver_commands
+        self.events: List[Dict[str, Any]] = []
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["Tracer"]:
+        """Builds a tracer from the `tracing` section of profile.yml, or None if disabled."""
+        tracing_config = config.get('tracing') or {}
+        if not tracing_config.get('enabled', False):
+            return None
+        return cls(path=tracing_config.get('path', "trace.json"), driver_commands=tracing_config.get('driver_commands', True))
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        started = self._now_us()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name, "cat": category, "ph": "X", "ts": round(started, 1),
+                "dur": round(self._now_us() - started, 1), "pid": self._pid, "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            self._append(event)
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if event["tid"] not in self._threads:
+                self._threads.add(event["tid"])
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": self._pid, "tid": event["tid"],
+                    "args": {"name": threading.current_thread().name},
+                })
+            self.events.append(event)
+
+    def trace_driver(self, driver: WebDriver) -> WebDriver:
+        """
+        Records every WebDriver command as a span. find_element, get_attribute,
+        .text, execute_script and the rest all go through `driver.execute`
+        (elements call their parent driver's), so wrapping it catches each
+        round-trip to chromedriver.
+        """
+        execute = driver.execute
+
+        def traced_execute(driver_command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+            args = {"script": params["script"][:80]} if params and driver_command.startswith("execute") and "script" in params else {}
+            with self.span(driver_command, "driver", **args):
+                return execute(driver_command, params)
+
+        driver.execute = traced_execute
+        return driver
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Count and total milliseconds per span name, by category."""
+        totals: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(lambda: defaultdict(lambda: {"count": 0, "total_ms": 0.0}))
+        with self._lock:
+            for event in self.events:
+                if event["ph"] == "X":
+                    entry = totals[event["cat"]][event["name"]]
+                    entry["count"] += 1
+                    entry["total_ms"] += event["dur"] / 1000
+        return {category: dict(names) for category, names in totals.items()}
+
+    def save(self) -> None:
+        with self._lock:
+            trace = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+
+# The tracer for this run, if tracing is enabled.
+_tracer: Optional[Tracer] = None
+
+def start_tracing(config: Dict[str, Any]) -> Optional[Tracer]:
+    """Starts tracing this run if the `tracing` section of profile.yml enables it."""
+    global _tracer
+    _tracer = Tracer.from_config(config)
+    return _tracer
+
+@contextmanager
+def span(name: str, category: str = "phase", **args: Any) -> Iterator[None]:
+    """Times the block as a span of the current trace; does nothing when tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category, **args):
+        yield
+
+def trace_driver(driver: WebDriver) -> WebDriver:
+    """Traces the driver's commands when tracing (of driver commands) is on. Returns the driver."""
+    tracer = _tracer
+    if tracer is not None and tracer.driver_commands:
+        tracer.trace_driver(driver)
+    return driver
+
+def finish_tracing() -> None:
+    """Saves the trace and prints where the time went, then stops tracing."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    tracer.save()
+    summary = tracer.summary()
+    print(f"\n🔬 Trace saved to {tracer.path} ({len(tracer.events)} events). Open it in chrome://tracing or https://ui.perfetto.dev")
+    for category in ("phase", "llm", "driver"):
+        names = summary.get(category) or {}
+        top = sorted(names.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:5]
+        if top:
+            print(f"  -> {category}: " + ", ".join(f"{name} {entry['count']:.0f}x {entry['total_ms'] / 1000:.1f}s" for name, entry in top))
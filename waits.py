@@ -0,0 +1,140 @@
+# waits.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Upper bounds (seconds) for each kind of wait. Override any of them in the
+# `waits` section of profile.yml.
+DEFAULT_TIMEOUTS = {
+    "search_results": 10,
+    "scroll": 5,
+    "scroll_step": 0.5,
+    "description": 5,
+    "form_step": 5,
+    "form_settle": 2,
+}
+DEFAULT_POLL_SECONDS = 0.1
+
+class WaitStats:
+    """Thread-safe record of how long each kind of wait actually took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, label: str, elapsed: float, timed_out: bool) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(label, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["total"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+            entry["timeouts"] += int(timed_out)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {label: dict(entry) for label, entry in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+wait_stats = WaitStats()
+
+def wait_timeout(config: Optional[Dict[str, Any]], name: str) -> float:
+    """Returns the configured upper bound for a named wait."""
+    waits_config = (config or {}).get('waits') or {}
+    return waits_config.get(name, DEFAULT_TIMEOUTS[name])
+
+def wait_for(
+    driver: WebDriver,
+    condition: Callable[[WebDriver], Any],
+    timeout: float,
+    label: str,
+    poll: float = DEFAULT_POLL_SECONDS
+) -> Any:
+    """
+    Polls `condition(driver)` until it returns something truthy or `timeout`
+    seconds pass. Returns the condition's value, or None on timeout. The
+    time spent is recorded under `label` either way.
+    """
+    start = time.perf_counter()
+    result = None
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except TimeoutException:
+        pass
+    wait_stats.record(label, time.perf_counter() - start, timed_out=result is None)
+    return result
+
+def pause(seconds: float, label: str) -> None:
+    """A deliberate fixed pause (e.g. pacing between applications), recorded like a wait."""
+    if seconds <= 0:
+        return
+    time.sleep(seconds)
+    wait_stats.record(label, seconds, timed_out=False)
+
+# --- Conditions ---------------------------------------------------------
+
+def card_count(driver: WebDriver) -> int:
+    return len(driver.find_elements(By.CSS_SELECTOR, "div[data-job-id]"))
+
+def cards_present(driver: WebDriver) -> Any:
+    """Search results have rendered at least one job card."""
+    return card_count(driver) or None
+
+def card_count_changed(previous: int) -> Callable[[WebDriver], Any]:
+    """More job cards were loaded than the `previous` count."""
+    def condition(driver):
+        count = card_count(driver)
+        return count if count != previous else None
+    return condition
+
+def job_view_description(driver: WebDriver) -> Any:
+    """A /jobs/view/<id>/ page has rendered its description."""
+    panes = driver.find_elements(By.CSS_SELECTOR, ".jobs-description-content, .jobs-description__content, #job-details")
+    return panes[0] if panes and panes[0].text.strip() else None
+
+def value_changed(read: Callable[[WebDriver], Any], previous: Any) -> Callable[[WebDriver], Any]:
+    """`read(driver)` returns something other than `previous`."""
+    def condition(driver):
+        try:
+            return read(driver) != previous or None
+        except WebDriverException:
+            return None
+    return condition
+
+NETWORK_ACTIVITY_JS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+def network_idle(idle_seconds: float = 0.5) -> Callable[[WebDriver], Any]:
+    """
+    The document has loaded and no new resource requests have started for
+    `idle_seconds`.
+    """
+    state = {"count": None, "since": time.perf_counter()}
+
+    def condition(driver):
+        ready_state, count = driver.execute_script(NETWORK_ACTIVITY_JS)
+        now = time.perf_counter()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return None
+        return ready_state == "complete" and now - state["since"] >= idle_seconds or None
+    return condition
+
+def print_wait_report() -> None:
+    """Prints how long each kind of wait took in this run."""
+    stats = wait_stats.snapshot()
+    if not stats:
+        return
+    print("\n--- Wait Report ---")
+    for label, entry in sorted(stats.items()):
+        print(
+            f"  -> {label}: {int(entry['count'])} wait(s), {entry['total']:.1f}s total, "
+            f"{entry['total'] / entry['count']:.2f}s avg, {entry['max']:.2f}s max, {int(entry['timeouts'])} timeout(s)"
+        )